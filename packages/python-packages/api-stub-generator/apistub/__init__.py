@@ -1,10 +1,13 @@
-import os
+import sys
 from ._version import VERSION
+from ._profiler import get_profiler
+from ._cache import ResultCache
 from ._stub_generator import StubGenerator
 from ._token import Token
 from ._token_kind import TokenKind
 from ._apiview import ApiView, Navigation, NavigationTag, Kind
 from ._diagnostic import Diagnostic
+from ._token_file import load_apiview, write_token_file
 
 __version__ = VERSION
 
@@ -17,20 +20,84 @@ __all__ = [
     "NavigationTag",
     "Kind",
     "Diagnostic",
+    "ResultCache",
+    "load_apiview",
 ]
 
 
 def console_entry_point():
     stub_generator = StubGenerator()
-    apiview = stub_generator.generate_tokens()
-    json_tokens = stub_generator.serialize(apiview)
-    # Write to JSON file
-    out_file_path = stub_generator.out_path
-    # Generate JSON file name if outpath doesn't have json file name
-    if not out_file_path.endswith(".json"):
-        out_file_path = os.path.join(
-            stub_generator.out_path, "{0}_python.json".format(apiview.Name)
-        )
-    with open(out_file_path, "w") as json_file:
-        json_file.write(json_tokens)
+    if stub_generator.batch:
+        from ._batch import generate_token_files
 
+        summary = generate_token_files(stub_generator)
+        if summary["Failed"]:
+            sys.exit(1)
+        return
+    if stub_generator.lint_only:
+        _, report = lint_package(stub_generator)
+        if report["Diagnostics"]:
+            sys.exit(1)
+        return
+    generate_token_file(stub_generator)
+
+
+def lint_package(stub_generator):
+    """Runs lint rules on a package without generating tokens. Returns path of lint report and lint report
+    """
+    report = stub_generator.lint()
+    out_file_path = stub_generator.get_out_file_path(report["Name"])
+    report_path = stub_generator.save_lint_report(out_file_path, report)
+    stub_generator.save_profile(out_file_path)
+    return report_path, report
+
+
+def generate_token_file(stub_generator):
+    """Generates token file for a package and returns path of token file and serialized tokens. Serialized tokens
+    are None if tokens are written into token file in stream mode. Path of lint report is returned in lint only mode
+    """
+    if stub_generator.lint_only:
+        return lint_package(stub_generator)[0], None
+
+    json_tokens = None
+    result_cache = None
+    # Token file of wheel or sdist package can be served from cache. Cache is not used if manifest is required
+    # since manifest is not cached
+    if stub_generator.cache_dir and stub_generator.is_package_file() and not stub_generator.write_manifest:
+        result_cache = ResultCache(stub_generator.cache_dir, stub_generator.cache_size)
+        cache_key = result_cache.get_key(stub_generator.pkg_path, stub_generator.get_options())
+        json_tokens = result_cache.get(cache_key)
+
+    if json_tokens is None:
+        apiview = stub_generator.generate_tokens()
+        out_file_path = stub_generator.get_out_file_path(apiview.Name)
+        if stub_generator.stream:
+            # Token file is already written while generating tokens
+            stub_generator.save_manifest(out_file_path)
+            stub_generator.save_profile(out_file_path)
+            if result_cache:
+                result_cache.put_file(cache_key, out_file_path)
+            return out_file_path, None
+
+        json_tokens = stub_generator.serialize(apiview)
+        if result_cache:
+            result_cache.put(cache_key, json_tokens)
+    else:
+        out_file_path = stub_generator.get_out_file_path(stub_generator.get_package_name())
+
+    # Write to token file
+    with get_profiler().measure("serialize"):
+        write_token_file(out_file_path, json_tokens, stub_generator.out_format)
+    stub_generator.save_manifest(out_file_path)
+    stub_generator.save_profile(out_file_path)
+    return out_file_path, json_tokens
+
+
+def worker_entry_point():
+    from ._worker import main
+    main()
+
+
+def diff_entry_point():
+    from ._diff import main
+    main()
@@ -1,3 +1,4 @@
+import functools
 import json
 from json import JSONEncoder
 import logging
@@ -5,20 +6,21 @@ import re
 import importlib
 import inspect
 
-from ._token import Token
+from ._token import Token, TokenStore
 from ._token_kind import TokenKind
 from ._version import VERSION
 from ._diagnostic import Diagnostic
 
 JSON_FIELDS = ["Name", "Version", "VersionString", "Navigation", "Tokens", "Diagnostics", "PackageName"]
+# Fields written before and after tokens by TokenStreamWriter
+STREAM_HEADER_FIELDS = ["Name", "Version", "VersionString", "PackageName"]
+STREAM_FOOTER_FIELDS = ["Navigation", "Diagnostics"]
 
 HEADER_TEXT = "# Package is parsed using api-stub-generator(version:{})".format(VERSION)
 TYPE_NAME_REGEX = re.compile("(~?[a-zA-Z\d._]+)")
 TYPE_OR_SEPERATOR = " or "
-
-# Lint warnings
-SOURCE_LINK_NOT_AVAILABLE = "Source definition link is not available for [{0}]. Please check and ensure type is fully qualified name in docstring"
-RETURN_TYPE_MISMATCH = "Return type in type hint is not matching return type in docstring"
+# Maximum number of distinct type strings to keep tokenized
+TYPE_TOKEN_CACHE_SIZE = 4096
 
 
 class ApiView:
@@ -27,20 +29,25 @@ class ApiView:
     :param str: pkg_name
     :param str: pkg_version
     :param str: ver_string
+    :param TokenStreamWriter: token_writer
+        Optional writer to write tokens into a file as they are added instead of keeping them in memory
     """
 
-    def __init__(self, nodeindex, pkg_name="", pkg_version="", namespace = ""):
+    def __init__(self, nodeindex, pkg_name="", pkg_version="", namespace = "", token_writer=None):
         self.Name = pkg_name
         self.Version = 0
         self.VersionString = ""
         self.Language = "Python"
-        self.Tokens = []
+        self.Tokens = TokenStore()
         self.Navigation = []
         self.Diagnostics = []
         self.indent = 0    
         self.namespace = namespace
         self.nodeindex = nodeindex
         self.PackageName = pkg_name
+        if token_writer is not None:
+            token_writer.begin(self)
+            self.Tokens = token_writer
         self.add_literal(HEADER_TEXT)
         self.add_new_line(2)
 
@@ -114,7 +121,7 @@ class ApiView:
         self._add_type_token(type_name, line_id)
 
 
-    def _add_token_for_type_name(self, type_name, line_id = None):
+    def _add_token_for_type_name(self, type_name):
         logging.debug("Generating tokens for type name {}".format(type_name))
         token = Token(type_name, TokenKind.TypeName)
         type_full_name = type_name[1:] if type_name.startswith("~") else type_name
@@ -122,37 +129,18 @@ class ApiView:
         navigate_to_id = self.nodeindex.get_id(type_full_name)
         if navigate_to_id:
             token.NavigateToId = navigate_to_id
-        elif type_name.startswith("~") and line_id:
-            # Check if type name is importable. If type name is incorrect in docstring then it wont be importable
-            # If type name is importable then it's a valid type name. Source link wont be available if type is from 
-            # different package
-            if not is_valid_type_name(type_full_name):
-                # Navigation ID is missing for internal type, add diagnostic error
-                self.add_diagnostic(SOURCE_LINK_NOT_AVAILABLE.format(token.Value), line_id)            
         self.add_token(token)
 
 
     def _add_type_token(self, type_name, line_id = None):
-        # parse to get individual type name
+        # parse to get individual type names and punctuations between them
         logging.debug("Generating tokens for type {}".format(type_name))
-        types = re.search(TYPE_NAME_REGEX, type_name)
-        if types:
-            # Generate token for the prefix before internal type
-            # process internal type
-            # process post fix of internal type recursively to find replace more internal types
-            parsed_type = types.groups()[0]
-            index = type_name.find(parsed_type)
-            prefix = type_name[:index]
-            if prefix:
-                self.add_punctuation(prefix)
-            # process parsed type name. internal or built in
-            self._add_token_for_type_name(parsed_type)
-            postfix = type_name[index + len(parsed_type):]
-            # process remaining string in type recursively
-            self._add_type_token(postfix, line_id)
-        else:
-            # This is required group ending punctuations
-            self.add_punctuation(type_name)        
+        for kind, value in tokenize_type_name(type_name):
+            if kind == TokenKind.TypeName:
+                # process parsed type name. internal or built in
+                self._add_token_for_type_name(value)
+            else:
+                self.add_punctuation(value)
 
 
     def add_diagnostic(self, text, line_id):
@@ -181,6 +169,18 @@ class APIViewEncoder(JSONEncoder):
     """Encoder to generate json for APIview object
     """
 
+    def encode(self, obj):
+        # Tokens in token store are encoded using it's own encoder which is faster than encoding token objects
+        if isinstance(obj, TokenStore):
+            return obj.encode()
+        if isinstance(obj, ApiView) and isinstance(obj.Tokens, TokenStore):
+            fields = []
+            for key in JSON_FIELDS:
+                if key in obj.__dict__:
+                    fields.append('"{0}": {1}'.format(key, self.encode(obj.__dict__[key])))
+            return "{" + ", ".join(fields) + "}"
+        return super().encode(obj)
+
     def default(self, obj):
         obj_dict = {}
         if (
@@ -196,20 +196,19 @@ class APIViewEncoder(JSONEncoder):
                     if key in obj.__dict__:
                         obj_dict[key] = obj.__dict__[key]
             elif isinstance(obj, Token):
-                obj_dict = obj.__dict__
                 # Remove properties from serialization to reduce size if property is not set
-                if not obj.DefinitionId:
-                    del obj_dict["DefinitionId"]
-                if not obj.NavigateToId:
-                    del obj_dict["NavigateToId"]
+                obj_dict = obj.to_dict()
             elif isinstance(obj, Diagnostic):
-                obj_dict = obj.__dict__
+                # Copy is modified so diagnostic can be serialized again
+                obj_dict = dict(obj.__dict__)
                 if not obj.HelpLinkUri:
                     del obj_dict["HelpLinkUri"]
             else:
                 obj_dict = obj.__dict__
 
             return obj_dict
+        elif isinstance(obj, TokenStore):
+            return list(obj)
         elif isinstance(obj, TokenKind) or isinstance(obj, Kind):
             return obj.value  # {"__enum__": obj.value}
         else:
@@ -220,6 +219,44 @@ class APIViewEncoder(JSONEncoder):
                 return obj_dict
 
 
+class TokenStreamWriter:
+    """Token list that writes tokens into JSON token file as they are added to API view. This keeps memory usage
+    flat regardless of package size. Navigation and diagnostics are written after all tokens are added.
+    :param file: stream
+        Text stream to write JSON token file
+    """
+
+    def __init__(self, stream, encoder=APIViewEncoder):
+        self.stream = stream
+        self.encoder = encoder()
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def begin(self, apiview):
+        """Write API view fields that are available before tokens are generated and start tokens list
+        """
+        self.stream.write("{")
+        for key in STREAM_HEADER_FIELDS:
+            self.stream.write('"{0}": {1}, '.format(key, self.encoder.encode(getattr(apiview, key))))
+        self.stream.write('"Tokens": [')
+
+    def append(self, token):
+        if self.count:
+            self.stream.write(", ")
+        self.stream.write(self.encoder.encode(token))
+        self.count += 1
+
+    def end(self, apiview):
+        """End tokens list and write navigation and diagnostics
+        """
+        self.stream.write("]")
+        for key in STREAM_FOOTER_FIELDS:
+            self.stream.write(', "{0}": {1}'.format(key, self.encoder.encode(getattr(apiview, key))))
+        self.stream.write("}")
+
+
 class NavigationTag:
     def __init__(self, kind):
         self.TypeKind = kind
@@ -249,14 +286,58 @@ class Navigation:
         self.ChildItems.append(child)
 
 
-def is_valid_type_name(type_name):
+@functools.lru_cache(maxsize=TYPE_TOKEN_CACHE_SIZE)
+def tokenize_type_name(type_name):
+    """Splits a type string into a tuple of (TokenKind, value) pairs of type names and punctuations between them.
+    Same type strings are repeated many times in a package so tokens are cached by type string.
+    A punctuation is always added at the end even if it's empty to close the type.
+    """
+    tokens = []
+    position = 0
+    for match in TYPE_NAME_REGEX.finditer(type_name):
+        # Generate token for the prefix before type name
+        prefix = type_name[position:match.start()]
+        if prefix:
+            tokens.append((TokenKind.Punctuation, prefix))
+        tokens.append((TokenKind.TypeName, match.group()))
+        position = match.end()
+    # This is required group ending punctuations
+    tokens.append((TokenKind.Punctuation, type_name[position:]))
+    return tuple(tokens)
+
+
+# Member names of modules checked by is_valid_type_name. Value is None if module failed to import
+_module_members = {}
+
+
+def get_module_members(module_name):
+    """Returns frozenset of member names of a module or None if module cannot be imported.
+    Each module is imported and scanned only once in a process.
+    """
+    if module_name in _module_members:
+        return _module_members[module_name]
     try:
-        module_end_index = type_name.rfind(".")
-        if module_end_index > 0:
-            module_name = type_name[:module_end_index]
-            class_name = type_name[module_end_index+1:]
-            mod = importlib.import_module(module_name)
-            return class_name in [x[0] for x in inspect.getmembers(mod)]
+        mod = importlib.import_module(module_name)
+        members = frozenset(x[0] for x in inspect.getmembers(mod))
     except:
-        logging.error("Failed to import {}".format(type_name))    
+        logging.error("Failed to import {}".format(module_name))
+        members = None
+    _module_members[module_name] = members
+    return members
+
+
+def clear_module_members(module_names):
+    """Remove cached member names of modules. Members are scanned again if a module is imported again from a
+    different version of package
+    """
+    for module_name in module_names:
+        _module_members.pop(module_name, None)
+
+
+def is_valid_type_name(type_name):
+    module_end_index = type_name.rfind(".")
+    if module_end_index > 0:
+        members = get_module_members(type_name[:module_end_index])
+        if members is not None:
+            return type_name[module_end_index+1:] in members
     return False
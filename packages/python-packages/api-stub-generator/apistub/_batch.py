@@ -0,0 +1,76 @@
+import functools
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+from ._version import VERSION
+from ._worker import StubWorker, JOB_STATUS_FAILED
+
+# Summary of batch is written into out path alongside token files
+BATCH_SUMMARY_FILE = "apistub_summary.json"
+
+
+def generate_token_files(stub_generator):
+    """Generates token file of each package in batch and writes summary of batch into out path. Packages are processed
+    in same process so caches and imported dependencies are shared unless package jobs is more than 1. Returns summary
+    """
+    start = time.perf_counter()
+    if not os.path.exists(stub_generator.out_path):
+        os.makedirs(stub_generator.out_path)
+    stub_generator.install_packages()
+
+    pkg_paths = stub_generator.pkg_paths
+    if stub_generator.package_jobs > 1 and len(pkg_paths) > 1:
+        responses = _generate_in_parallel(stub_generator)
+    else:
+        worker = StubWorker()
+        responses = [worker.run(x, functools.partial(stub_generator.for_package, x))[0] for x in pkg_paths]
+
+    packages = []
+    for response in responses:
+        response["PkgPath"] = response.pop("Id")
+        packages.append(response)
+    failed = [x for x in packages if x["Status"] == JOB_STATUS_FAILED]
+    summary = {
+        "Version": VERSION,
+        "Succeeded": len(packages) - len(failed),
+        "Failed": len(failed),
+        "Seconds": time.perf_counter() - start,
+        "Packages": packages,
+    }
+    summary_path = os.path.join(stub_generator.out_path, BATCH_SUMMARY_FILE)
+    with io.open(summary_path, "w", encoding="utf-8") as summary_file:
+        json.dump(summary, summary_file, indent=1)
+
+    print("Generated token files of {0} of {1} packages in {2:.1f} seconds".format(
+        summary["Succeeded"], len(packages), summary["Seconds"]
+    ))
+    for package in failed:
+        print("Failed to generate token file of {0}: {1}".format(package["PkgPath"], package["Error"]))
+    return summary
+
+
+def _generate_in_parallel(stub_generator):
+    jobs = min(stub_generator.package_jobs, len(stub_generator.pkg_paths))
+    logging.debug("Generating token files of {0} packages using {1} worker processes".format(
+        len(stub_generator.pkg_paths), jobs
+    ))
+    # Each package is processed in a new process so modules imported for a package are not seen by others
+    pool = multiprocessing.Pool(jobs, maxtasksperchild=1)
+    try:
+        return pool.map(
+            functools.partial(_generate_in_worker, stub_generator), stub_generator.pkg_paths, chunksize=1
+        )
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _generate_in_worker(stub_generator, pkg_path):
+    # Worker processes of packages can not start their own worker processes to inspect modules
+    stub_generator.jobs = 1
+    response, _ = StubWorker().run(pkg_path, functools.partial(stub_generator.for_package, pkg_path))
+    return response
@@ -0,0 +1,108 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from ._version import VERSION
+
+CACHE_FILE_EXTENSION = ".json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ResultCache:
+    """On disk cache of serialized token files. Entries are keyed by content hash of package file,
+    version of api stub generator and options used to generate tokens. Least recently used entries
+    are removed when cache size exceeds the limit
+    :param str: cache_dir
+        Directory to store cached token files
+    :param int: max_size
+        Maximum size of cache directory in bytes
+    """
+
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def get_key(self, pkg_path, options=None):
+        """Returns cache key for a package file
+        :param str: pkg_path
+            Path to wheel or sdist package
+        :param dict: options
+            Options that change generated tokens
+        """
+        key_hash = hashlib.sha256()
+        with io.open(pkg_path, "rb") as pkg_file:
+            for chunk in iter(lambda: pkg_file.read(HASH_CHUNK_SIZE), b""):
+                key_hash.update(chunk)
+        key_hash.update(VERSION.encode("utf-8"))
+        key_hash.update(json.dumps(options or {}, sort_keys=True).encode("utf-8"))
+        return key_hash.hexdigest()
+
+    def get(self, key):
+        """Returns cached token file content or None if key is not present in cache
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            with io.open(entry_path, "r", encoding="utf-8") as entry_file:
+                content = entry_file.read()
+        except (IOError, OSError):
+            logging.debug("Cache miss for key {}".format(key))
+            return None
+        # Update modified time to track recently used entries. Entry may be evicted by another process after it's read
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            logging.debug("Cache entry for key {} is removed after it's read".format(key))
+        logging.info("Cache hit for key {}".format(key))
+        return content
+
+    def put(self, key, content):
+        """Add token file content to cache and remove least recently used entries if cache is full
+        """
+        # Write to a temp file and move it so concurrent readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with io.open(fd, "w", encoding="utf-8") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, self._get_entry_path(key))
+        self._evict()
+
+    def put_file(self, key, file_path):
+        """Add an existing token file to cache without reading it into memory
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(file_path, temp_path)
+        os.replace(temp_path, self._get_entry_path(key))
+        self._evict()
+
+    def _get_entry_path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_FILE_EXTENSION)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_FILE_EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        cache_size = sum(x[1] for x in entries)
+        # Remove least recently used entries first
+        for _, size, path in sorted(entries):
+            if cache_size <= self.max_size:
+                break
+            logging.debug("Removing cache entry {}".format(path))
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            cache_size -= size
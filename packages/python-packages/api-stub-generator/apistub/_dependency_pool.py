@@ -0,0 +1,77 @@
+import email.parser
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from subprocess import check_call
+
+WHEEL_METADATA_FILE = "METADATA"
+
+
+def get_wheel_requirements(wheel_extract_path):
+    """Returns list of requirements of a wheel from METADATA file in it's dist-info directory
+    :param str: wheel_extract_path
+        Directory where wheel is extracted
+    """
+    files = glob.glob(os.path.join(wheel_extract_path, "*.dist-info", WHEEL_METADATA_FILE))
+    if not files:
+        logging.warning("File {0} is not found in {1}".format(WHEEL_METADATA_FILE, wheel_extract_path))
+        return []
+    with io.open(files[0], "r", encoding="utf-8") as metadata_file:
+        metadata = email.parser.Parser().parse(metadata_file, headersonly=True)
+    return metadata.get_all("Requires-Dist") or []
+
+
+class DependencyPool:
+    """Directories with dependencies of packages installed using pip install --target. Dependencies are installed
+    once for a set of requirements and reused by all runs that need same set of requirements. Package to parse is not
+    installed. Both extracted package and dependency directory are added to sys.path instead, so concurrent runs don't
+    change packages installed in current environment.
+    :param str: pool_dir
+        Directory to keep installed dependencies
+    """
+
+    def __init__(self, pool_dir):
+        self.pool_dir = pool_dir
+        if not os.path.exists(self.pool_dir):
+            os.makedirs(self.pool_dir)
+
+    def get_key(self, requirements):
+        """Returns key of a set of requirements. Markers in requirements are evaluated by pip for current
+        python version and platform so they are part of the key
+        """
+        key_hash = hashlib.sha256()
+        key_hash.update(json.dumps(sorted(set(requirements))).encode("utf-8"))
+        key_hash.update("{0}.{1} {2}".format(sys.version_info[0], sys.version_info[1], sys.platform).encode("utf-8"))
+        return key_hash.hexdigest()
+
+    def get_dependency_path(self, requirements):
+        """Returns directory where requirements are installed. Requirements are installed if they are not already
+        available in pool
+        """
+        dependency_path = os.path.join(self.pool_dir, self.get_key(requirements))
+        if os.path.isdir(dependency_path):
+            logging.info("Reusing dependencies installed in {}".format(dependency_path))
+            return dependency_path
+
+        # Install into a temp directory and move it so concurrent runs never see partially installed dependencies
+        temp_path = tempfile.mkdtemp(dir=self.pool_dir, suffix=".tmp")
+        try:
+            if requirements:
+                logging.info("Installing dependencies {0} into {1}".format(requirements, dependency_path))
+                commands = [sys.executable, "-m", "pip", "install", "--target", temp_path, "-q"]
+                check_call(commands + list(requirements))
+            os.rename(temp_path, dependency_path)
+        except OSError:
+            # Another run installed same dependencies at the same time
+            if not os.path.isdir(dependency_path):
+                raise
+        finally:
+            if os.path.exists(temp_path):
+                shutil.rmtree(temp_path, ignore_errors=True)
+        return dependency_path
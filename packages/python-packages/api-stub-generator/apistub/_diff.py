@@ -0,0 +1,121 @@
+import argparse
+import difflib
+import io
+import json
+import logging
+import sys
+
+from ._token_file import read_token_file
+from ._token_kind import TokenKind
+from ._version import VERSION
+
+CHANGE_ADDED = "Added"
+CHANGE_REMOVED = "Removed"
+CHANGE_CHANGED = "Changed"
+
+
+def get_definition_spans(tokens):
+    """Splits tokens into lines and groups lines into spans of definitions. A span starts at a line with a line ID
+    marker and ends before next line with a marker. Returns an ordered dictionary of definition ID to lines of span.
+    Lines before first marker are in span with ID None
+    :param list: tokens
+        Tokens of token file as dictionaries
+    """
+    spans = {}
+    lines = spans.setdefault(None, [])
+    line = []
+    for token in tokens:
+        kind = token["Kind"]
+        if kind == TokenKind.Newline.value:
+            lines.append("".join(line))
+            line = []
+        elif kind == TokenKind.LineIdMarker.value:
+            lines = []
+            definition_id = token.get("DefinitionId")
+            key = definition_id
+            # Definition IDs are unique within a token file. Ordinal keeps repeated IDs apart in older token files
+            ordinal = 1
+            while key in spans:
+                ordinal += 1
+                key = "{0}#{1}".format(definition_id, ordinal)
+            spans[key] = lines
+        else:
+            line.append(token["Value"])
+    if line:
+        lines.append("".join(line))
+    return spans
+
+
+def diff_lines(old_lines, new_lines):
+    """Returns removed and added lines of a span prefixed by - and +
+    """
+    changed_lines = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        changed_lines.extend("-" + x for x in old_lines[old_start:old_end])
+        changed_lines.extend("+" + x for x in new_lines[new_start:new_end])
+    return changed_lines
+
+
+def diff_apiviews(old_apiview, new_apiview):
+    """Returns change set between two token files. Tokens are compared line by line within span of each definition
+    instead of comparing whole token streams, so only spans that are changed are diffed
+    :param dict: old_apiview
+    :param dict: new_apiview
+        Token files loaded as dictionaries
+    """
+    old_spans = get_definition_spans(old_apiview["Tokens"])
+    new_spans = get_definition_spans(new_apiview["Tokens"])
+    changes = []
+    for definition_id, new_lines in new_spans.items():
+        old_lines = old_spans.get(definition_id)
+        if old_lines is None:
+            if new_lines:
+                changes.append(_create_change(definition_id, CHANGE_ADDED, ["+" + x for x in new_lines]))
+        elif old_lines != new_lines:
+            changes.append(_create_change(definition_id, CHANGE_CHANGED, diff_lines(old_lines, new_lines)))
+    for definition_id, old_lines in old_spans.items():
+        if definition_id not in new_spans and old_lines:
+            changes.append(_create_change(definition_id, CHANGE_REMOVED, ["-" + x for x in old_lines]))
+
+    return {
+        "Version": VERSION,
+        "Old": old_apiview.get("Name"),
+        "New": new_apiview.get("Name"),
+        "Added": sum(1 for x in changes if x["Change"] == CHANGE_ADDED),
+        "Removed": sum(1 for x in changes if x["Change"] == CHANGE_REMOVED),
+        "Changed": sum(1 for x in changes if x["Change"] == CHANGE_CHANGED),
+        "Changes": changes,
+    }
+
+
+def _create_change(definition_id, change, lines):
+    return {"DefinitionId": definition_id, "Change": change, "Lines": lines}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Compare two token files generated by api stub generator and list added, removed and changed APIs"
+    )
+    parser.add_argument("old", help=("Token file of previous version in any format"))
+    parser.add_argument("new", help=("Token file of new version"))
+    parser.add_argument(
+        "--out-path", help=("Path to write change set json. Change set is written into stdout if it is not given"),
+    )
+    args = parser.parse_args(args)
+
+    change_set = diff_apiviews(read_token_file(args.old), read_token_file(args.new))
+    logging.info(
+        "{0} added, {1} removed and {2} changed definitions".format(
+            change_set["Added"], change_set["Removed"], change_set["Changed"]
+        )
+    )
+    if args.out_path:
+        with io.open(args.out_path, "w", encoding="utf-8") as out_file:
+            json.dump(change_set, out_file, indent=1)
+    else:
+        json.dump(change_set, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+    return change_set
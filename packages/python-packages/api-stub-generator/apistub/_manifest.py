@@ -0,0 +1,245 @@
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+
+import astroid
+
+from ._diagnostic import Diagnostic
+from ._token import Token
+from ._token_file import read_token_file, strip_token_file_extension
+from ._token_kind import TokenKind
+from ._version import VERSION
+
+# Manifest of azure-core_python.json is written as azure-core_python.manifest.json
+MANIFEST_FILE_SUFFIX = ".manifest.json"
+
+
+def get_manifest_path(token_file_path):
+    """Returns path of manifest file that is written alongside a token file
+    """
+    return strip_token_file_extension(token_file_path) + MANIFEST_FILE_SUFFIX
+
+
+def get_source_file(obj):
+    """Returns path of source file where an inspected object or a parsed node is defined
+    """
+    if isinstance(obj, astroid.nodes.NodeNG):
+        return getattr(obj.root(), "file", None)
+    if isinstance(obj, property):
+        obj = obj.fget
+    try:
+        return inspect.getsourcefile(inspect.unwrap(obj))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_source_files(node):
+    """Returns set of source files of all objects within a node and it's children. Source files of base classes
+    are included since inherited members are part of the class node.
+    """
+    objects = [node.obj]
+    if inspect.isclass(node.obj):
+        objects.extend(node.obj.__mro__[1:])
+    elif isinstance(node.obj, astroid.nodes.ClassDef):
+        try:
+            objects.extend(node.obj.ancestors())
+        except astroid.InferenceError:
+            logging.debug("Failed to find base classes of {}".format(node.name))
+
+    source_files = set()
+    for obj in objects:
+        if obj is None:
+            continue
+        source_file = get_source_file(obj)
+        if source_file:
+            source_files.add(os.path.abspath(source_file))
+    for child in node.child_nodes:
+        source_files.update(get_source_files(child))
+    return source_files
+
+
+def get_files_hash(pkg_root_path, files):
+    """Returns hash of content of source files or None if any of the files is missing
+    :param str: pkg_root_path
+        Package root path. Relative paths in files are relative to package root path
+    :param list: files
+    """
+    files_hash = hashlib.sha256()
+    for file_path in sorted(files):
+        files_hash.update(file_path.encode("utf-8") + b"\0")
+        try:
+            with io.open(os.path.join(pkg_root_path, file_path), "rb") as source_file:
+                files_hash.update(source_file.read())
+        except (IOError, OSError):
+            return None
+    return files_hash.hexdigest()
+
+
+class IndexEntry:
+    """Node index entry of a module that is not inspected. Only navigation ID of the node is available
+    """
+
+    def __init__(self, namespace_id):
+        self.namespace_id = namespace_id
+
+
+class Manifest:
+    """Records source files, token range, diagnostics and navigation of each module in a token file.
+    Manifest of previous token file is used to find modules that are not changed and to reuse their tokens.
+    :param dict: options
+        Options used to generate tokens
+    """
+
+    def __init__(self, options=None):
+        self.Version = VERSION
+        self.Options = options or {}
+        self.TokenCount = 0
+        self.Modules = {}
+
+    @classmethod
+    def load(cls, manifest_path):
+        with io.open(manifest_path, "r", encoding="utf-8") as manifest_file:
+            manifest_dict = json.load(manifest_file)
+        manifest = cls(manifest_dict["Options"])
+        manifest.Version = manifest_dict["Version"]
+        manifest.TokenCount = manifest_dict["TokenCount"]
+        manifest.Modules = manifest_dict["Modules"]
+        return manifest
+
+    def save(self, manifest_path):
+        with io.open(manifest_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(self.__dict__, manifest_file, indent=1)
+
+    def add_module(
+        self, module_name, pkg_root_path, source_files, index, token_range, diagnostic_range, navigation_index,
+        aliases=None
+    ):
+        """Add details of a module after it's tokens are generated
+        :param str: module_name
+        :param str: pkg_root_path
+        :param list: source_files
+            Absolute paths of source files used by module
+        :param dict: index
+            Node index entries of module as node key to navigation ID
+        :param tuple: token_range
+            Start and end of module tokens in token file
+        :param tuple: diagnostic_range
+            Start and end of module diagnostics in token file
+        :param int: navigation_index
+            Index of module navigation in package navigation or None if module doesn't have navigation
+        :param dict: aliases
+            Node index aliases of module as name of module where node is defined to node key
+        """
+        files = []
+        for source_file in source_files:
+            relative_path = os.path.relpath(source_file, pkg_root_path)
+            # Files outside package root like base classes from other packages are recorded using absolute path
+            files.append(source_file if relative_path.startswith(os.pardir) else relative_path)
+        self.Modules[module_name] = {
+            "Files": sorted(files),
+            "Hash": get_files_hash(pkg_root_path, files),
+            "Index": index,
+            "Tokens": list(token_range),
+            "Diagnostics": list(diagnostic_range),
+            "Navigation": navigation_index,
+            "Aliases": aliases or {},
+        }
+
+
+class Baseline:
+    """Token file and manifest of a previous run. Tokens, diagnostics and navigation of modules whose source
+    files are not changed are copied from baseline instead of inspecting the modules again.
+    :param str: token_file_path
+    """
+
+    def __init__(self, token_file_path):
+        self.token_file_path = token_file_path
+        self.manifest = Manifest.load(get_manifest_path(token_file_path))
+        self.apiview = read_token_file(token_file_path)
+
+    def is_valid(self, pkg_name, options):
+        """Returns True if baseline was generated for same package using same version and options
+        """
+        if self.manifest.Version != VERSION:
+            logging.info("Baseline is generated using different version {}".format(self.manifest.Version))
+            return False
+        if self.manifest.Options != options:
+            logging.info("Baseline is generated using different options {}".format(self.manifest.Options))
+            return False
+        if self.apiview["Name"] != pkg_name:
+            logging.info("Baseline is generated for different package {}".format(self.apiview["Name"]))
+            return False
+        if len(self.apiview["Tokens"]) != self.manifest.TokenCount:
+            logging.warning("Baseline token file {} doesn't match it's manifest".format(self.token_file_path))
+            return False
+        return True
+
+    def get_unchanged_modules(self, pkg_root_path, modules):
+        """Returns list of modules whose source files are not changed since baseline
+        """
+        unchanged_modules = []
+        for module_name in modules:
+            module_manifest = self.manifest.Modules.get(module_name)
+            if module_manifest and module_manifest["Hash"]:
+                if get_files_hash(pkg_root_path, module_manifest["Files"]) == module_manifest["Hash"]:
+                    unchanged_modules.append(module_name)
+        return unchanged_modules
+
+    def is_index_changed(self, modules, module_index, module_aliases=None):
+        """Returns True if public entities are added, removed or moved to another module in any module compared to
+        baseline. Tokens of unchanged modules can have stale navigation links in that case
+        :param list: modules
+            All modules to generate tokens
+        :param dict: module_index
+            Node index entries of each inspected module
+        :param dict: module_aliases
+            Node index aliases of each inspected module
+        """
+        removed_modules = set(self.manifest.Modules.keys()).difference(modules)
+        if any(self.manifest.Modules[m]["Index"] for m in removed_modules):
+            return True
+        for module_name, index in module_index.items():
+            module_manifest = self.manifest.Modules.get(module_name)
+            baseline_index = module_manifest["Index"] if module_manifest else {}
+            if index != baseline_index:
+                logging.info("Public entities are changed in module {}".format(module_name))
+                return True
+        for module_name, aliases in (module_aliases or {}).items():
+            module_manifest = self.manifest.Modules.get(module_name)
+            baseline_aliases = module_manifest.get("Aliases", {}) if module_manifest else {}
+            if aliases != baseline_aliases:
+                logging.info("Public entities are moved in module {}".format(module_name))
+                return True
+        return False
+
+    def add_index_entries(self, nodeindex, module_name):
+        """Add node index entries of a module that is not inspected
+        """
+        for key, namespace_id in self.manifest.Modules[module_name]["Index"].items():
+            nodeindex.add(key, IndexEntry(namespace_id))
+        for alias, key in self.manifest.Modules[module_name].get("Aliases", {}).items():
+            nodeindex.add_alias(alias, key)
+
+    def add_module(self, apiview, navigation, module_name):
+        """Add tokens, diagnostics and navigation of a module from baseline
+        """
+        module_manifest = self.manifest.Modules[module_name]
+        start, end = module_manifest["Tokens"]
+        for token_dict in self.apiview["Tokens"][start:end]:
+            token = Token(token_dict["Value"], TokenKind(token_dict["Kind"]))
+            token.DefinitionId = token_dict.get("DefinitionId")
+            token.NavigateToId = token_dict.get("NavigateToId")
+            apiview.add_token(token)
+
+        start, end = module_manifest["Diagnostics"]
+        for diagnostic_dict in self.apiview["Diagnostics"][start:end]:
+            diagnostic = Diagnostic(diagnostic_dict["TargetId"], diagnostic_dict["Text"])
+            diagnostic.set_helplink(diagnostic_dict.get("HelpLinkUri", ""))
+            apiview.Diagnostics.append(diagnostic)
+
+        navigation_index = module_manifest["Navigation"]
+        if navigation_index is not None:
+            navigation.add_child(self.apiview["Navigation"][0]["ChildItems"][navigation_index])
@@ -0,0 +1,117 @@
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import sys
+import time
+
+from ._version import VERSION
+
+# Profile of azure-core_python.json is written as azure-core_python.profile.json and azure-core_python.pstats
+PROFILE_FILE_SUFFIX = ".profile.json"
+PSTATS_FILE_SUFFIX = ".pstats"
+
+
+class Profiler:
+    """Records wall time, CPU time and change in number of allocated memory blocks of each phase of token generation.
+    Phases are measured for whole package and for each module and class. Nothing is recorded unless profiler is enabled
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._cprofile = None
+
+    def enable(self, cprofile=False):
+        """Start recording phases. Python functions are also profiled using cProfile if cprofile is set
+        """
+        self.enabled = True
+        if cprofile and not self._cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def reset(self):
+        """Stop recording and clear records. Forked worker process inherits state of profiler from main process and
+        a long running worker runs many jobs in same process
+        """
+        self.enabled = False
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile = None
+        self.records = []
+
+    @contextlib.contextmanager
+    def measure(self, phase, target=None, target_type=None):
+        """Measure a phase for whole package or for a target module or class
+        :param str: phase
+            Name of phase. For e.g. extract, install, import, inspect, tokenize, serialize
+        :param str: target
+            Name of module or class. Phase is measured for whole package if target is not given
+        :param str: target_type
+            Type of target. module or class
+        """
+        if not self.enabled:
+            yield
+            return
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        blocks_start = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            self.records.append({
+                "Phase": phase,
+                "Target": target,
+                "TargetType": target_type,
+                "Wall": time.perf_counter() - wall_start,
+                "Cpu": time.process_time() - cpu_start,
+                "AllocatedBlocks": sys.getallocatedblocks() - blocks_start,
+            })
+
+    def pop_records(self):
+        """Returns recorded phases and clear them. This is used to send records from worker process to main process
+        """
+        records = self.records
+        self.records = []
+        return records
+
+    def add_records(self, records):
+        self.records.extend(records)
+
+    def get_report(self):
+        """Returns report with total of each phase for package and records of each module and class
+        """
+        phases = {}
+        for record in self.records:
+            if record["Target"] is None:
+                total = phases.setdefault(record["Phase"], {"Wall": 0.0, "Cpu": 0.0, "AllocatedBlocks": 0})
+                for key in total:
+                    total[key] += record[key]
+        return {
+            "Version": VERSION,
+            "Phases": phases,
+            "Modules": [x for x in self.records if x["TargetType"] == "module"],
+            "Classes": [x for x in self.records if x["TargetType"] == "class"],
+        }
+
+    def save(self, report_path, pstats_path=None):
+        """Write profile report as json and cProfile stats if cProfile is enabled
+        """
+        logging.debug("Writing profile report into {}".format(report_path))
+        with io.open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(self.get_report(), report_file, indent=1)
+        if self._cprofile and pstats_path:
+            self._cprofile.disable()
+            logging.debug("Writing cProfile stats into {}".format(pstats_path))
+            self._cprofile.dump_stats(pstats_path)
+
+
+_profiler = Profiler()
+
+
+def get_profiler():
+    """Returns profiler of current process
+    """
+    return _profiler
@@ -0,0 +1,453 @@
+import ast
+import io
+import json
+import logging
+import operator
+import os
+import re
+import sys
+from subprocess import check_output
+
+SETUP_PY_FILE = "setup.py"
+
+# Runs setup.py in a separate process with setup function replaced, so setup.py can not change working directory,
+# sys.path or imported modules of current process
+SETUP_PY_RUNNER = """
+import json
+import sys
+
+setup_calls = []
+
+
+def setup(*args, **kwargs):
+    setup_calls.append(kwargs)
+
+
+try:
+    import setuptools
+    setuptools.setup = setup
+except ImportError:
+    pass
+try:
+    import distutils.core
+    distutils.core.setup = setup
+except ImportError:
+    pass
+
+setup_filename = sys.argv[1]
+sys.argv = [setup_filename]
+stdout = sys.stdout
+sys.stdout = sys.stderr
+with open(setup_filename, "rb") as setup_file:
+    code = compile(setup_file.read(), setup_filename, "exec")
+exec(code, {"__name__": "__main__", "__file__": setup_filename})
+kwargs = setup_calls[0]
+stdout.write(json.dumps({"name": kwargs.get("name"), "version": kwargs.get("version"), "packages": kwargs.get("packages")}))
+"""
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Mod: operator.mod,
+    ast.Mult: operator.mul,
+}
+
+# Augmented assignment updates mutable values in place, for e.g. += extends a list with any iterable
+_AUGMENTED_OPERATORS = {
+    ast.Add: operator.iadd,
+    ast.Mod: operator.imod,
+    ast.Mult: operator.imul,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.In: lambda x, y: x in y,
+    ast.NotIn: lambda x, y: x not in y,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+# Literals are parsed as Str, Num, Bytes and NameConstant nodes before python 3.8
+if sys.version_info < (3, 8):
+    _LITERAL_NODES = (ast.Str, ast.Num, ast.Bytes, ast.NameConstant)
+else:
+    _LITERAL_NODES = (ast.Constant,)
+
+_STR_METHODS = frozenset([
+    "decode", "encode", "endswith", "format", "join", "lower", "lstrip", "replace", "rsplit", "rstrip", "split",
+    "splitlines", "startswith", "strip", "upper",
+])
+
+_OBJECT_METHODS = {
+    type(re.compile("")): frozenset(["findall", "match", "search"]),
+    type(re.match("", "")): frozenset(["group", "groupdict", "groups"]),
+    dict: frozenset(["get", "items", "keys", "values"]),
+}
+
+
+class _Unresolved(Exception):
+    """Raised when a value in setup.py can not be evaluated without running it
+    """
+
+
+class _Module:
+
+    def __init__(self, name, members=None):
+        self.name = name
+        self.members = members or {}
+
+
+class _File:
+    """Content of a file opened by setup.py. File is read when it's opened
+    """
+
+    def __init__(self, content):
+        self.content = content
+
+    def read(self):
+        return self.content
+
+    def readlines(self):
+        return self.content.splitlines(True)
+
+
+class _SetupCall:
+    pass
+
+
+class SetupPyEvaluator:
+    """Finds arguments of setup call in setup.py by evaluating simple statements in setup.py without running it.
+    Only assignments, imports, with and if statements are evaluated. Calls are limited to string methods, os.path,
+    re, open and find_packages. Relative paths are resolved from directory of setup.py without changing working
+    directory, so multiple setup.py files can be parsed concurrently.
+    :param str: setup_filename
+        Path of setup.py
+    """
+
+    def __init__(self, setup_filename):
+        self.setup_filename = os.path.abspath(setup_filename)
+        self.setup_dir = os.path.dirname(self.setup_filename)
+        self.setup_kwargs = None
+        path_module = _Module("os.path", {
+            "abspath": lambda x: os.path.abspath(self._get_path(x)),
+            "basename": os.path.basename,
+            "dirname": os.path.dirname,
+            "exists": lambda x: os.path.exists(self._get_path(x)),
+            "isdir": lambda x: os.path.isdir(self._get_path(x)),
+            "isfile": lambda x: os.path.isfile(self._get_path(x)),
+            "join": os.path.join,
+            "normpath": os.path.normpath,
+            "realpath": lambda x: os.path.realpath(self._get_path(x)),
+            "sep": os.path.sep,
+            "split": os.path.split,
+            "splitext": os.path.splitext,
+        })
+        self.modules = {
+            "codecs": _Module("codecs", {"open": self._open}),
+            "io": _Module("io", {"open": self._open}),
+            "os": _Module("os", {"path": path_module, "sep": os.sep, "getcwd": lambda: self.setup_dir}),
+            "os.path": path_module,
+            "re": _Module("re", dict(
+                [(x, getattr(re, x)) for x in ("compile", "findall", "match", "search", "sub")]
+                + [(x, getattr(re, x)) for x in ("DOTALL", "I", "IGNORECASE", "M", "MULTILINE", "S", "VERBOSE", "X")]
+            )),
+            "setuptools": _Module("setuptools", {
+                "find_namespace_packages": self._find_namespace_packages,
+                "find_packages": self._find_packages,
+                "setup": _SetupCall(),
+            }),
+            "distutils.core": _Module("distutils.core", {"setup": _SetupCall()}),
+        }
+        self.names = {
+            "__file__": self.setup_filename,
+            "__name__": "__main__",
+            "bool": bool,
+            "dict": dict,
+            "int": int,
+            "len": len,
+            "list": list,
+            "open": self._open,
+            "set": set,
+            "sorted": sorted,
+            "str": str,
+            "tuple": tuple,
+        }
+
+    def evaluate(self):
+        """Returns keyword arguments of setup call. Raises _Unresolved if setup call is not found or it's arguments
+        can not be evaluated
+        """
+        with io.open(self.setup_filename, "r", encoding="utf-8-sig") as setup_file:
+            tree = ast.parse(setup_file.read(), filename=self.setup_filename)
+        self._run_block(tree.body)
+        if self.setup_kwargs is None:
+            raise _Unresolved("setup call is not found")
+        return self.setup_kwargs
+
+    def _get_path(self, path):
+        return os.path.join(self.setup_dir, path)
+
+    def _open(self, file, mode="r", *args, **kwargs):
+        if "b" in mode:
+            with io.open(self._get_path(file), "rb") as binary_file:
+                return _File(binary_file.read())
+        encoding = kwargs.get("encoding") or (args[1] if len(args) > 1 else None) or "utf-8"
+        with io.open(self._get_path(file), "r", encoding=encoding) as text_file:
+            return _File(text_file.read())
+
+    def _find_packages(self, where=".", exclude=(), include=("*",)):
+        from setuptools import find_packages
+
+        return find_packages(self._get_path(where), exclude, include)
+
+    def _find_namespace_packages(self, where=".", exclude=(), include=("*",)):
+        from setuptools import find_namespace_packages
+
+        return find_namespace_packages(self._get_path(where), exclude, include)
+
+    def _run_block(self, statements):
+        for statement in statements:
+            if self.setup_kwargs is not None:
+                return
+            self._run_statement(statement)
+
+    def _run_statement(self, node):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    self.names[alias.asname] = self.modules.get(alias.name, _Module(alias.name))
+                else:
+                    root_name = alias.name.split(".")[0]
+                    self.names[root_name] = self.modules.get(root_name, _Module(root_name))
+        elif isinstance(node, ast.ImportFrom):
+            module = self.modules.get(node.module, _Module(node.module))
+            for alias in node.names:
+                name = alias.asname or alias.name
+                if alias.name in module.members:
+                    self.names[name] = module.members[alias.name]
+                else:
+                    self.names[name] = self.modules.get("{0}.{1}".format(node.module, alias.name), _Unresolved)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            self._run_assign(node)
+        elif isinstance(node, ast.With):
+            for item in node.items:
+                value = self._evaluate(item.context_expr)
+                if item.optional_vars is not None:
+                    self._assign(item.optional_vars, value)
+            self._run_block(node.body)
+        elif isinstance(node, ast.If):
+            try:
+                test = self._evaluate(node.test)
+            except _Unresolved:
+                self._forget_branches(node.body, node.orelse)
+            else:
+                self._run_block(node.body if test else node.orelse)
+        elif isinstance(node, ast.Try):
+            # Handler is run instead of the rest of try block if a statement can not be evaluated. For e.g. import
+            # of a module that is not available
+            try:
+                self._run_block(node.body)
+            except _Unresolved:
+                if node.handlers:
+                    self._run_block(node.handlers[0].body)
+                self._forget_branches(*[x.body for x in node.handlers[1:]])
+            else:
+                self._run_block(node.orelse)
+            self._run_block(node.finalbody)
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            try:
+                func = self._evaluate(node.value.func)
+            except _Unresolved:
+                return
+            if isinstance(func, _SetupCall):
+                self.setup_kwargs = self._evaluate_setup_kwargs(node.value)
+        elif isinstance(node, ast.Raise):
+            raise _Unresolved("setup.py raises an exception at line {}".format(node.lineno))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            self.names[node.name] = _Unresolved
+        elif isinstance(node, (ast.For, ast.While)):
+            self._forget_branches(node.body, node.orelse)
+
+    def _run_assign(self, node):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        try:
+            if node.value is None:
+                return
+            value = self._evaluate(node.value)
+            if isinstance(node, ast.AugAssign):
+                value = self._call(_AUGMENTED_OPERATORS[type(node.op)], [self._evaluate(node.target), value])
+        except (_Unresolved, KeyError):
+            value = _Unresolved
+        for target in targets:
+            self._assign(target, value)
+
+    def _assign(self, target, value):
+        if isinstance(target, ast.Name):
+            self.names[target.id] = value
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            try:
+                if value is _Unresolved:
+                    raise _Unresolved("Value is not known")
+                values = self._call(list, [value])
+            except _Unresolved:
+                values = [_Unresolved] * len(target.elts)
+            for element, element_value in zip(target.elts, values):
+                self._assign(element, element_value)
+
+    def _forget_branches(self, *branches):
+        # Names assigned in a branch that may or may not run can not be evaluated
+        for statements in branches:
+            for statement in statements:
+                for node in ast.walk(statement):
+                    if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                        self.names[node.id] = _Unresolved
+                    elif isinstance(node, ast.Call):
+                        try:
+                            func = self._evaluate(node.func)
+                        except _Unresolved:
+                            continue
+                        if isinstance(func, _SetupCall):
+                            raise _Unresolved("setup is called conditionally at line {}".format(node.lineno))
+
+    def _evaluate_setup_kwargs(self, node):
+        kwargs = {}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                self._call(kwargs.update, [self._evaluate(keyword.value)])
+            elif keyword.arg in ("name", "version", "packages"):
+                kwargs[keyword.arg] = self._evaluate(keyword.value)
+        return kwargs
+
+    def _evaluate(self, node):
+        if isinstance(node, _LITERAL_NODES):
+            return ast.literal_eval(node)
+        if isinstance(node, ast.Name):
+            value = self.names.get(node.id, _Unresolved)
+            if value is _Unresolved:
+                raise _Unresolved("Value of {} is not known".format(node.id))
+            return value
+        if isinstance(node, ast.Attribute):
+            return self._get_attribute(self._evaluate(node.value), node.attr)
+        if isinstance(node, ast.Call):
+            func = self._evaluate(node.func)
+            if not callable(func):
+                raise _Unresolved("Call at line {} can not be evaluated".format(node.lineno))
+            args = []
+            for arg in node.args:
+                if isinstance(arg, ast.Starred):
+                    self._call(args.extend, [self._evaluate(arg.value)])
+                else:
+                    args.append(self._evaluate(arg))
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    self._call(kwargs.update, [self._evaluate(keyword.value)])
+                else:
+                    kwargs[keyword.arg] = self._evaluate(keyword.value)
+            return self._call(func, args, kwargs)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            return self._call(_BINARY_OPERATORS[type(node.op)], [self._evaluate(node.left), self._evaluate(node.right)])
+        if isinstance(node, ast.BoolOp):
+            value = None
+            for operand in node.values:
+                value = self._evaluate(operand)
+                if isinstance(node.op, ast.And) != bool(value):
+                    return value
+            return value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return not self._evaluate(node.operand)
+        if isinstance(node, ast.Compare) and all(type(x) in _COMPARE_OPERATORS for x in node.ops):
+            left = self._evaluate(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator)
+                if not self._call(_COMPARE_OPERATORS[type(op)], [left, right]):
+                    return False
+                left = right
+            return True
+        if isinstance(node, ast.IfExp):
+            return self._evaluate(node.body if self._evaluate(node.test) else node.orelse)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = []
+            for element in node.elts:
+                if isinstance(element, ast.Starred):
+                    self._call(values.extend, [self._evaluate(element.value)])
+                else:
+                    values.append(self._evaluate(element))
+            return {ast.List: list, ast.Tuple: tuple, ast.Set: set}[type(node)](values)
+        if isinstance(node, ast.Dict):
+            value = {}
+            for key, item in zip(node.keys, node.values):
+                if key is None:
+                    self._call(value.update, [self._evaluate(item)])
+                else:
+                    value[self._evaluate(key)] = self._evaluate(item)
+            return value
+        if isinstance(node, ast.Subscript):
+            return self._call(operator.getitem, [self._evaluate(node.value), self._evaluate(node.slice)])
+        if isinstance(node, ast.Slice):
+            return slice(*[self._evaluate(x) if x else None for x in (node.lower, node.upper, node.step)])
+        if isinstance(node, ast.JoinedStr):
+            return "".join(str(self._evaluate(x)) for x in node.values)
+        if isinstance(node, ast.FormattedValue):
+            value = self._evaluate(node.value)
+            format_spec = self._evaluate(node.format_spec) if node.format_spec else ""
+            return self._call(format, [value, format_spec])
+        raise _Unresolved("{0} at line {1} can not be evaluated".format(type(node).__name__, node.lineno))
+
+    def _get_attribute(self, value, name):
+        if isinstance(value, _Module):
+            if name in value.members:
+                return value.members[name]
+        elif isinstance(value, _File):
+            if name in ("read", "readlines"):
+                return getattr(value, name)
+            if name in ("__enter__", "close"):
+                return lambda: value
+        elif isinstance(value, (str, bytes)):
+            if name in _STR_METHODS:
+                return getattr(value, name)
+        elif name in _OBJECT_METHODS.get(type(value), ()):
+            return getattr(value, name)
+        raise _Unresolved("Attribute {} can not be evaluated".format(name))
+
+    def _call(self, func, args, kwargs=None):
+        try:
+            return func(*args, **(kwargs or {}))
+        except _Unresolved:
+            raise
+        except Exception as e:
+            raise _Unresolved(str(e))
+
+
+def run_setup_py(setup_filename):
+    """Runs setup.py in a separate process and returns name, version and packages passed to setup
+    """
+    output = check_output(
+        [sys.executable, "-c", SETUP_PY_RUNNER, os.path.abspath(setup_filename)],
+        cwd=os.path.dirname(os.path.abspath(setup_filename)),
+    )
+    return json.loads(output.decode("utf-8"))
+
+
+def parse_setup_py(setup_path):
+    """Parses setup.py and finds package name, version and namespace. setup.py is evaluated statically without
+    running it if possible. It's run in a separate process otherwise
+    """
+    setup_filename = os.path.join(setup_path, SETUP_PY_FILE)
+    try:
+        kwargs = SetupPyEvaluator(setup_filename).evaluate()
+        if "name" not in kwargs or "version" not in kwargs:
+            raise _Unresolved("Name or version is not found")
+    except Exception as e:
+        # Any failure of static evaluation including _Unresolved and RecursionError falls back to running setup.py
+        logging.debug("Running {0} since it can not be parsed statically: {1}".format(setup_filename, e))
+        kwargs = run_setup_py(setup_filename)
+
+    package_name = kwargs["name"]
+    name_space = package_name.replace('-', '.')
+    packages = kwargs.get("packages")
+    if packages:
+        name_space = packages[0]
+        logging.info("Namespaces found for package {0}: {1}".format(package_name, packages))
+
+    return package_name, kwargs["version"], name_space
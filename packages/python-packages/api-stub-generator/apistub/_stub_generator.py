@@ -5,42 +5,79 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import copy
+import fnmatch
 import glob
 import sys
 import os
 import argparse
+import builtins
 
 import inspect
 import io
 import importlib
 import json
 import logging
+import multiprocessing
 import pkgutil
 import shutil
-import ast
-import textwrap
 import re
 import typing
 import tempfile
 from subprocess import check_call
 import zipfile
 
+import astroid
 
-from apistub._apiview import ApiView, APIViewEncoder, Navigation, Kind, NavigationTag
+from apistub._apiview import (
+    ApiView,
+    APIViewEncoder,
+    Navigation,
+    Kind,
+    NavigationTag,
+    TokenStreamWriter,
+    clear_module_members,
+)
+from apistub._dependency_pool import DependencyPool, get_wheel_requirements
+from apistub._manifest import Baseline, Manifest, get_manifest_path, get_source_files
+from apistub._profiler import PROFILE_FILE_SUFFIX, PSTATS_FILE_SUFFIX, get_profiler
+from apistub._setup_parser import parse_setup_py
+from apistub._token_file import (
+    TOKEN_FILE_EXTENSIONS,
+    TOKEN_FILE_FORMAT_JSON,
+    TOKEN_FILE_FORMATS,
+    strip_token_file_extension,
+)
 
 INIT_PY_FILE = "__init__.py"
 TOP_LEVEL_WHEEL_FILE = "top_level.txt"
+# Lint report of azure-core_python.json is written as azure-core_python.lint.json
+LINT_REPORT_SUFFIX = ".lint.json"
 
 logging.getLogger().setLevel(logging.ERROR)
 
 
 class StubGenerator:
-    def __init__(self):
+    """Generates API view tokens for a package
+    :param list: args
+        Command line arguments. Arguments are read from sys.argv if it's not given
+    """
+
+    def __init__(self, args=None):
+        # Imported here to avoid circular dependency same as ModuleNode
+        from apistub.nodes._linter import LINT_RULE_NAMES, get_lint_rule_names
+
         parser = argparse.ArgumentParser(
             description="Parse a python package and generate json token file to be supplied to API review tool"
         )
         parser.add_argument(
-            "--pkg-path", required=True, help=("Package root path"),
+            "--pkg-path",
+            required=True,
+            nargs="+",
+            help=(
+                "Package root path. Multiple packages or directories with wheel and sdist packages can be given to"
+                " generate token file of each package"
+            ),
         )
         parser.add_argument(
             "--temp-path", 
@@ -70,36 +107,284 @@ class StubGenerator:
             "--filter-namespace",
             help=("Generate Api view only for a specific namespace"),
         )
-        
 
-        args = parser.parse_args()
-        if not os.path.exists(args.pkg_path):
-            logging.error("Package path [{}] is invalid".format(args.pkg_path))
-            exit(1)
+        parser.add_argument(
+            "--include",
+            nargs="+",
+            default=[],
+            help=(
+                "Glob patterns of module names to generate Api view for, for e.g. azure.mgmt.storage.v2021_01_01."
+                " Sub modules of a matching module are also included"
+            ),
+        )
+
+        parser.add_argument(
+            "--exclude",
+            nargs="+",
+            default=[],
+            help=(
+                "Glob patterns of module names to skip, for e.g. *.aio or *.v2019_*. Sub modules of a matching module"
+                " are also skipped"
+            ),
+        )
+
+        parser.add_argument(
+            "--async-delta",
+            help=(
+                "List only members of async classes that are different from their sync counterpart, for e.g."
+                " azure.storage.blob.aio.BlobClient and azure.storage.blob.BlobClient"
+            ),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--lint-only",
+            help=("Inspect package and write lint report of diagnostics without generating token file"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--enable-rules",
+            nargs="+",
+            choices=LINT_RULE_NAMES,
+            default=[],
+            help=("Lint rules to run in addition to default rules, for e.g. source-link"),
+        )
+
+        parser.add_argument(
+            "--disable-rules",
+            nargs="+",
+            choices=LINT_RULE_NAMES,
+            default=[],
+            help=("Lint rules to skip"),
+        )
+
+        parser.add_argument(
+            "--static",
+            help=("Parse package source without installing or importing the package"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help=("Number of worker processes to inspect modules in parallel"),
+        )
+
+        parser.add_argument(
+            "--package-jobs",
+            type=int,
+            default=1,
+            help=("Number of worker processes to generate token files of multiple packages in parallel"),
+        )
+
+        parser.add_argument(
+            "--stream",
+            help=("Write tokens into json file as they are generated instead of keeping all tokens in memory"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--out-format",
+            choices=TOKEN_FILE_FORMATS,
+            default=TOKEN_FILE_FORMAT_JSON,
+            help=(
+                "Format of token file. gzip writes compressed json and binary writes a string table with compact token"
+                " records"
+            ),
+        )
+
+        parser.add_argument(
+            "--cache-dir",
+            help=("Directory to cache generated token files for wheel and sdist packages"),
+        )
+
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=1024,
+            help=("Maximum size of token file cache in MB"),
+        )
+
+        parser.add_argument(
+            "--deps-dir",
+            help=(
+                "Directory to keep dependencies of wheel packages. Wheel is imported from extracted path and it's"
+                " dependencies are installed once into this directory instead of installing the wheel"
+            ),
+        )
+
+        parser.add_argument(
+            "--manifest",
+            help=("Write a manifest of source files and token range of each module alongside the json file"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--baseline",
+            help=(
+                "Previous json file generated with a manifest. Tokens of modules whose source files are not changed"
+                " are reused from this file"
+            ),
+        )
+
+        parser.add_argument(
+            "--profile",
+            help=(
+                "Record time and memory allocations of each phase, module and class and write the report alongside"
+                " the json file"
+            ),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--profile-stats",
+            help=("Profile python functions using cProfile and write pstats file alongside the json file"),
+            default=False,
+            action="store_true",
+        )
+
+        args = parser.parse_args(args)
+        invalid_paths = [x for x in args.pkg_path if not os.path.exists(x)]
+        pkg_paths = get_package_paths(args.pkg_path)
+        # Token file of each package is generated in batch mode if more than one package or a directory of packages
+        # is given
+        batch = len(pkg_paths) > 1 or pkg_paths != args.pkg_path
+        if invalid_paths:
+            logging.error("Package path [{}] is invalid".format(", ".join(invalid_paths)))
+            sys.exit(1)
+        elif not pkg_paths:
+            logging.error("No wheel or sdist package is found in [{}]".format(", ".join(args.pkg_path)))
+            sys.exit(1)
+        elif args.async_delta and args.baseline:
+            logging.error("Baseline can not be used with async delta")
+            sys.exit(1)
+        elif batch and args.baseline:
+            logging.error("Baseline can not be used with multiple packages")
+            sys.exit(1)
+        elif args.lint_only and (batch or args.baseline):
+            logging.error("Lint only mode can not be used with multiple packages or baseline")
+            sys.exit(1)
+        elif batch and is_token_file_path(args.out_path):
+            logging.error("Out path must be a directory to generate token files of multiple packages")
+            sys.exit(1)
+        elif args.stream and args.out_format != TOKEN_FILE_FORMAT_JSON:
+            logging.error("Tokens can be streamed only into a json token file")
+            sys.exit(1)
         elif not os.path.exists(args.temp_path):
             logging.error("Temp path [{0}] is invalid".format(args.temp_path))
-            exit(1)
+            sys.exit(1)
+        elif args.baseline and not os.path.exists(args.baseline):
+            logging.error("Baseline path [{0}] is invalid".format(args.baseline))
+            sys.exit(1)
 
 
-        self.pkg_path = args.pkg_path
+        self.pkg_path = pkg_paths[0]
+        self.pkg_paths = pkg_paths
+        self.batch = batch
+        self.package_jobs = max(args.package_jobs, 1)
+        # Packages of a batch are installed together before generating tokens
+        self.package_installed = False
         self.temp_path = args.temp_path
         self.out_path = args.out_path
         self.hide_report = args.hide_report
+        self.static = args.static
+        self.jobs = max(args.jobs, 1)
+        self.stream = args.stream
+        self.out_format = args.out_format
+        self.cache_dir = args.cache_dir
+        self.cache_size = args.cache_size * 1024 * 1024
+        self.deps_dir = args.deps_dir
+        # Paths added to sys.path to import package and it's dependencies without installing them
+        self.sys_paths = []
+        self.baseline_path = args.baseline
+        # Manifest is always required for the output of an incremental run so it can be used as next baseline
+        self.write_manifest = args.manifest or bool(args.baseline)
+        self.manifest = None
+        self.profile = args.profile or args.profile_stats
+        self.profile_stats = args.profile_stats
+        if self.profile:
+            get_profiler().enable(self.profile_stats)
+        self.verbose = args.verbose
         if args.verbose:
             logging.getLogger().setLevel(logging.DEBUG)
 
         self.filter_namespace = ''
         if args.filter_namespace:
             self.filter_namespace = args.filter_namespace
+        self.include = args.include
+        self.exclude = args.exclude
+        self.async_delta = args.async_delta
+        self.lint_only = args.lint_only
+        self.lint_rules = get_lint_rule_names(args.enable_rules, args.disable_rules)
+        self.linter = None
             
 
     def generate_tokens(self):
+        profiler = get_profiler()
+        pkg_root_path, pkg_name, version, namespace = self._prepare_package()
+
+        logging.debug("Generating tokens")
+        if self.stream:
+            # Tokens are written into token file while they are generated
+            out_file_path = self.get_out_file_path(pkg_name)
+            logging.debug("Writing tokens into {}".format(out_file_path))
+            with open(out_file_path, "w") as json_file:
+                token_writer = TokenStreamWriter(json_file)
+                apiview = self._generate_tokens(pkg_root_path, pkg_name, version, namespace, token_writer)
+                with profiler.measure("serialize"):
+                    token_writer.end(apiview)
+        else:
+            apiview = self._generate_tokens(pkg_root_path, pkg_name, version, namespace)
+        self._print_report(bool(apiview.Diagnostics))
+        return apiview
+
+    def lint(self):
+        """Inspect package and run lint rules without generating tokens. Returns lint report
+        """
+        pkg_root_path, pkg_name, _, namespace = self._prepare_package()
+        self.module_dict = {}
+        nodeindex = NodeIndex()
+        modules = self._get_modules(pkg_root_path, namespace)
+        with get_profiler().measure("inspect"):
+            module_nodes = self._inspect_modules(pkg_root_path, modules, namespace, nodeindex)
+        self._lint_modules(module_nodes, nodeindex)
+        report = self.linter.get_report(pkg_name, module_nodes)
+        for name, rule in report["Rules"].items():
+            logging.info("Lint rule {0} found {1} diagnostics in {2:.3f} seconds".format(
+                name, rule["Diagnostics"], rule["Seconds"])
+            )
+        self._print_report(bool(report["Diagnostics"]))
+        return report
+
+    def _print_report(self, has_diagnostics):
+        if has_diagnostics:
+            # Show error report in console
+            if not self.hide_report:
+                print("************************** Error Report **************************")
+                for m in self.module_dict.keys():
+                    self.module_dict[m].print_errors()
+            logging.info("*************** Completed parsing package with errors ***************")
+        else:
+            logging.info("*************** Completed parsing package and generating tokens ***************")
+
+    def _prepare_package(self):
+        """Extract and install package if required. Returns package root path, name, version and namespace
+        """
+        profiler = get_profiler()
         # Extract package to temp directory if it is wheel or sdist
-        if self.pkg_path.endswith(".whl") or self.pkg_path.endswith(".zip"):
+        if self.is_package_file():
             logging.info("Extracting package to temp path")
-            pkg_root_path = self._extract_wheel()
+            with profiler.measure("extract"):
+                pkg_root_path, namespace = self._extract_wheel()
             pkg_name, version = self._parse_pkg_name()
-            namespace = self.get_module_root_name(pkg_root_path)
         else:
             # package root is passed as arg to parse
             pkg_root_path = self.pkg_path
@@ -107,53 +392,153 @@ class StubGenerator:
 
         logging.debug("package name: {0}, version:{1}, namespace:{2}".format(pkg_name, version, namespace))
 
-        logging.debug("Installing package from {}".format(self.pkg_path))
-        self._install_package(pkg_name)
+        if self.static:
+            logging.info("Static mode is enabled. Package will be parsed from source without installing")
+        elif self.deps_dir and self.pkg_path.endswith(".whl"):
+            with profiler.measure("install"):
+                self._add_package_to_path(pkg_root_path)
+        elif self.package_installed:
+            logging.debug("Package {} is already installed".format(pkg_name))
+        else:
+            logging.debug("Installing package from {}".format(self.pkg_path))
+            with profiler.measure("install"):
+                self._install_package(pkg_name)
         
         if self.filter_namespace:
             logging.info("Namespace filter is passed. Filtering modules within namespace :{}".format(self.filter_namespace))
             namespace = self.filter_namespace
+        return pkg_root_path, pkg_name, version, namespace
 
-        logging.debug("Generating tokens")
-        apiview = self._generate_tokens(pkg_root_path, pkg_name, version, namespace)
-        if apiview.Diagnostics:
-            # Show error report in console
-            if not self.hide_report:
-                print("************************** Error Report **************************")
-                for m in self.module_dict.keys():
-                    self.module_dict[m].print_errors()
-            logging.info("*************** Completed parsing package with errors ***************")
-        else:
-            logging.info("*************** Completed parsing package and generating tokens ***************")
-        return apiview
 
+    def for_package(self, pkg_path):
+        """Returns stub generator with same options to generate token file of a package in batch
+        """
+        stub_generator = copy.copy(self)
+        stub_generator.pkg_path = pkg_path
+        stub_generator.pkg_paths = [pkg_path]
+        stub_generator.batch = False
+        stub_generator.sys_paths = []
+        stub_generator.manifest = None
+        # Profiler and logging level are reset before each package
+        if self.profile:
+            get_profiler().enable(self.profile_stats)
+        if self.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+        return stub_generator
+
+    def install_packages(self):
+        """Install all packages of batch using a single pip command so common dependencies are resolved and installed
+        once. Wheels imported from extracted path are not installed. Each package is installed separately if any
+        package fails to install
+        """
+        pkg_paths = [x for x in self.pkg_paths if not (self.deps_dir and x.endswith(".whl"))]
+        if self.static or not pkg_paths:
+            return
+        try:
+            pkg_names = [
+                self.for_package(x).get_package_name() if x.endswith((".whl", ".zip")) else parse_setup_py(x)[0]
+                for x in pkg_paths
+            ]
+            logging.info("Installing {} packages".format(len(pkg_paths)))
+            check_call([sys.executable, "-m", "pip", "uninstall", "--yes", "-q"] + pkg_names)
+            check_call([sys.executable, "-m", "pip", "install", "-q"] + pkg_paths)
+        except Exception as e:
+            logging.warning("Failed to install packages together. Each package will be installed separately: {}".format(e))
+            return
+        self.package_installed = True
+
+    def is_package_file(self):
+        """Returns True if package path is a wheel or sdist package instead of source root
+        """
+        return self.pkg_path.endswith(".whl") or self.pkg_path.endswith(".zip")
+
+    def get_package_name(self):
+        """Returns package name of wheel or sdist package without extracting it
+        """
+        pkg_name, _ = self._parse_pkg_name()
+        return pkg_name
+
+    def get_options(self):
+        """Returns options that change generated tokens. This is used to create key to cache token file
+        """
+        return {
+            "filter_namespace": self.filter_namespace,
+            "include": self.include,
+            "exclude": self.exclude,
+            "async_delta": self.async_delta,
+            "lint_rules": self.lint_rules,
+            "static": self.static,
+        }
+
+    def save_manifest(self, out_file_path):
+        """Write manifest of generated tokens alongside token file
+        """
+        if self.manifest:
+            manifest_path = get_manifest_path(out_file_path)
+            logging.debug("Writing manifest into {}".format(manifest_path))
+            self.manifest.save(manifest_path)
+
+    def save_profile(self, out_file_path):
+        """Write profile report and cProfile stats alongside token file if profiling is enabled
+        """
+        if self.profile:
+            file_path = strip_token_file_extension(out_file_path)
+            get_profiler().save(
+                file_path + PROFILE_FILE_SUFFIX, file_path + PSTATS_FILE_SUFFIX if self.profile_stats else None
+            )
+
+    def save_lint_report(self, out_file_path, report):
+        """Write lint report alongside token file path. Returns path of lint report
+        """
+        report_path = strip_token_file_extension(out_file_path) + LINT_REPORT_SUFFIX
+        logging.debug("Writing lint report into {}".format(report_path))
+        with io.open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=1)
+        return report_path
+
+    def get_out_file_path(self, pkg_name):
+        """Returns path of token file to generate for package
+        """
+        # Generate token file name if outpath doesn't have token file name
+        if is_token_file_path(self.out_path):
+            return self.out_path
+        return os.path.join(
+            self.out_path, "{0}_python{1}".format(pkg_name, TOKEN_FILE_EXTENSIONS[self.out_format])
+        )
 
     def serialize(self, apiview, encoder=APIViewEncoder):
         # Serialize tokens into JSON
         logging.debug("Serializing tokens into json")
-        json_apiview = encoder().encode(apiview)
+        with get_profiler().measure("serialize"):
+            json_apiview = encoder().encode(apiview)
         return json_apiview
 
 
-    def _find_modules(self, pkg_root_path):
-        """Find modules within the package to import and parse
+    def _find_modules(self, pkg_root_path, namespace=""):
+        """Find modules within the package to import and parse. Directories that can not have a module within
+        namespace or selected by include and exclude patterns are not walked
         :param str: pkg_root_path
             Package root path
+        :param str: namespace
+            Only modules starting with namespace are returned
         :rtype: list
         """
         modules = []
         for root, subdirs, files in os.walk(pkg_root_path):
+            module_name = os.path.relpath(root, pkg_root_path).replace(os.path.sep, ".")
             # Ignore any modules with name starts with "_"
             # For e.g. _generated, _shared etc
-            dirs_to_skip = [x for x in subdirs if x.startswith("_") or x.startswith(".")]
+            dirs_to_skip = [
+                x for x in subdirs
+                if x.startswith("_")
+                or x.startswith(".")
+                or not self._should_walk(x if module_name == os.curdir else "{0}.{1}".format(module_name, x), namespace)
+            ]
             for d in dirs_to_skip:
                 subdirs.remove(d)
 
             # Add current path as module name if _init.py is present
             if INIT_PY_FILE in files:
-                module_name = os.path.relpath(root, pkg_root_path).replace(
-                    os.path.sep, "."
-                )
                 modules.append(module_name)
                 # Add any public py file names as modules
                 sub_modules = [
@@ -163,53 +548,228 @@ class StubGenerator:
                 ]
                 modules.extend(["{0}.{1}".format(module_name, x) for x in sub_modules])
 
+        if self.include or self.exclude:
+            modules = [m for m in modules if is_module_selected(m, self.include, self.exclude)]
         logging.debug("Modules in package: {}".format(modules))
         return modules
 
+    def _should_walk(self, module_name, namespace):
+        """Returns False if directory of a module and all it's sub directories can be skipped
+        """
+        if namespace and not (module_name.startswith(namespace) or namespace.startswith(module_name + ".")):
+            logging.debug("Skipping directory of {0}. Module should start with {1}".format(module_name, namespace))
+            return False
+        if any(fnmatch.fnmatchcase(module_name, x) for x in self.exclude):
+            logging.debug("Skipping directory of excluded module {}".format(module_name))
+            return False
+        if self.include and not any(can_match_sub_module(module_name, x) for x in self.include):
+            logging.debug("Skipping directory of {}. No include pattern can match it's modules".format(module_name))
+            return False
+        return True
+
 
-    def _generate_tokens(self, pkg_root_path, package_name, version, namespace):
+    def _generate_tokens(self, pkg_root_path, package_name, version, namespace, token_writer=None):
         """This method returns a dictionary of namespace and all public classes in each namespace
         """
-        # Import ModuleNode.
-        # Importing it globally can cause circular dependency since it needs NodeIndex that is defined in this file
-        from apistub.nodes._module_node import ModuleNode
+        # Imported here to avoid circular dependency same as ModuleNode
+        from apistub.nodes._linter import get_module_diagnostics
 
         self.module_dict = {}
         nodeindex = NodeIndex()
+        profiler = get_profiler()
         # todo (Update the version number correctly)
-        apiview = ApiView(nodeindex, package_name, version, namespace)
-        modules = self._find_modules(pkg_root_path)
-        logging.debug("Modules to generate tokens: {}".format(modules))
+        apiview = ApiView(nodeindex, package_name, version, namespace, token_writer)
+        modules = self._get_modules(pkg_root_path, namespace)
 
-        # load all modules and parse them recursively
-        for m in modules:
-            if not m.startswith(namespace):
-                logging.debug("Skipping module {0}. Module should start with {1}".format(m, namespace))
-                continue
+        baseline = self._load_baseline(package_name)
+        unchanged_modules = []
+        if baseline:
+            unchanged_modules = baseline.get_unchanged_modules(pkg_root_path, modules)
+            logging.info("{0} of {1} modules are not changed since baseline".format(len(unchanged_modules), len(modules)))
+
+        with profiler.measure("inspect"):
+            module_nodes = self._inspect_modules(
+                pkg_root_path, [m for m in modules if m not in unchanged_modules], namespace, nodeindex
+            )
+        if baseline and unchanged_modules:
+            module_index = dict((n.namespace, get_module_index(n)) for n in module_nodes)
+            module_aliases = dict((n.namespace, get_module_aliases(n)) for n in module_nodes)
+            if baseline.is_index_changed(modules, module_index, module_aliases):
+                # Unchanged modules can refer to added or removed entities. Inspect them again to update links
+                logging.info("Public entities are changed since baseline. Inspecting all modules")
+                with profiler.measure("inspect"):
+                    module_nodes.extend(self._inspect_modules(pkg_root_path, unchanged_modules, namespace, nodeindex))
+                unchanged_modules = []
+            else:
+                for m in unchanged_modules:
+                    baseline.add_index_entries(nodeindex, m)
 
-            logging.debug("Importing module {}".format(m))
-            module_obj = importlib.import_module(m)
-            self.module_dict[m] = ModuleNode(m, module_obj, nodeindex, namespace)
+        self._lint_modules(module_nodes, nodeindex)
 
         # Create navigation info to navigate within APIreview tool
         navigation = Navigation(package_name, None)
         navigation.set_tag(NavigationTag(Kind.type_package))
         apiview.add_navigation(navigation)
 
-        # Generate tokens
-        modules = self.module_dict.keys()
-        for m in modules:
-            # Generate and add token to APIView
-            logging.debug("Generating tokens for module {}".format(m))
-            self.module_dict[m].generate_tokens(apiview)
-            # Add navigation info for this modules. navigation info is used to build tree panel in API tool
-            module_nav = self.module_dict[m].get_navigation()
-            if module_nav:
-                navigation.add_child(module_nav)
+        if self.write_manifest:
+            self.manifest = Manifest(self.get_options())
+
+        # Generate tokens in module order
+        with profiler.measure("tokenize"):
+            for m in modules:
+                token_start = len(apiview.Tokens)
+                diagnostic_start = len(apiview.Diagnostics)
+                navigation_index = len(navigation.ChildItems)
+                if m in unchanged_modules:
+                    logging.debug("Adding tokens for module {} from baseline".format(m))
+                    baseline.add_module(apiview, navigation, m)
+                    source_files = baseline.manifest.Modules[m]["Files"]
+                    index = baseline.manifest.Modules[m]["Index"]
+                    aliases = baseline.manifest.Modules[m].get("Aliases", {})
+                elif m in self.module_dict:
+                    # Generate and add token to APIView
+                    logging.debug("Generating tokens for module {}".format(m))
+                    module_node = self.module_dict[m]
+                    with profiler.measure("tokenize", m, "module"):
+                        module_node.generate_tokens(apiview)
+                        for _, target_id, message in get_module_diagnostics(module_node):
+                            apiview.add_diagnostic(message, target_id)
+                    # Add navigation info for this modules. navigation info is used to build tree panel in API tool
+                    module_nav = module_node.get_navigation()
+                    if module_nav:
+                        navigation.add_child(module_nav)
+                    source_files = getattr(module_node, "source_files", [])
+                    index = get_module_index(module_node)
+                    aliases = get_module_aliases(module_node)
+                else:
+                    continue
+
+                if self.manifest:
+                    self.manifest.add_module(
+                        m,
+                        pkg_root_path,
+                        [os.path.join(pkg_root_path, f) for f in source_files],
+                        index,
+                        (token_start, len(apiview.Tokens)),
+                        (diagnostic_start, len(apiview.Diagnostics)),
+                        navigation_index if len(navigation.ChildItems) > navigation_index else None,
+                        aliases,
+                    )
+        if self.manifest:
+            self.manifest.TokenCount = len(apiview.Tokens)
         return apiview
 
+    def _get_modules(self, pkg_root_path, namespace):
+        """Returns names of modules within namespace
+        """
+        modules = []
+        for m in self._find_modules(pkg_root_path, namespace):
+            if not m.startswith(namespace):
+                logging.debug("Skipping module {0}. Module should start with {1}".format(m, namespace))
+                continue
+            modules.append(m)
+        logging.debug("Modules to generate tokens: {}".format(modules))
+        return modules
+
+    def _lint_modules(self, module_nodes, nodeindex):
+        """Find sync counterpart of async classes and run lint rules on inspected modules. Rules that don't use node
+        index are already run in worker processes if modules are inspected in parallel
+        """
+        # Imported here to avoid circular dependency same as ModuleNode
+        from apistub.nodes._linter import Linter
+
+        for module_node in module_nodes:
+            self.module_dict[module_node.namespace] = module_node
+        if self.async_delta:
+            set_sync_twins(module_nodes, nodeindex)
+
+        self.linter = Linter(self.lint_rules)
+        with get_profiler().measure("lint"):
+            for module_node in module_nodes:
+                lint_seconds = module_node.__dict__.pop("lint_seconds", None)
+                if lint_seconds is None:
+                    self.linter.lint(module_node, nodeindex)
+                else:
+                    self.linter.add_seconds(lint_seconds)
+                    self.linter.lint(module_node, nodeindex, uses_index=True)
+
+    def _load_baseline(self, package_name):
+        """Returns baseline to reuse tokens of unchanged modules or None if baseline is not given or not valid
+        """
+        if not self.baseline_path:
+            return None
+        try:
+            baseline = Baseline(self.baseline_path)
+        except (IOError, OSError, ValueError, KeyError):
+            logging.warning("Failed to load baseline {}. All modules will be inspected".format(self.baseline_path))
+            return None
+        if not baseline.is_valid(package_name, self.get_options()):
+            logging.warning("Baseline {} can not be used. All modules will be inspected".format(self.baseline_path))
+            return None
+        return baseline
+
+    def _inspect_modules(self, pkg_root_path, modules, namespace, nodeindex):
+        """Import or parse modules and returns module nodes in same order as modules
+        """
+        if not modules:
+            return []
+
+        if self.static:
+            # astroid resolves absolute imports within package using sys.path
+            astroid.MANAGER.clear_cache()
+            sys.path.insert(0, pkg_root_path)
+        else:
+            # Modules of another version of package may be already imported by a previous run in same process
+            unload_modules(modules, self.sys_paths)
+
+        # load all modules and parse them recursively
+        try:
+            if self.jobs > 1 and len(modules) > 1:
+                return self._inspect_modules_in_parallel(pkg_root_path, modules, namespace, nodeindex)
+            return [
+                inspect_module(pkg_root_path, m, namespace, self.static, nodeindex, self.write_manifest)
+                for m in modules
+            ]
+        finally:
+            if self.static:
+                sys.path.remove(pkg_root_path)
+
+    def _inspect_modules_in_parallel(self, pkg_root_path, modules, namespace, nodeindex):
+        """Inspect modules in worker processes and merge module nodes into node index
+        """
+        logging.debug("Inspecting {0} modules using {1} worker processes".format(len(modules), self.jobs))
+        pool = multiprocessing.Pool(
+            min(self.jobs, len(modules)),
+            _init_worker,
+            (pkg_root_path, self.static, logging.getLogger().level, self.profile, self.sys_paths),
+        )
+        try:
+            module_nodes = pool.starmap(
+                _inspect_module_in_worker,
+                [
+                    (self.lint_rules, pkg_root_path, m, namespace, self.static, None, self.write_manifest)
+                    for m in modules
+                ],
+                chunksize=1,
+            )
+        finally:
+            pool.close()
+            pool.join()
+
+        # Merge index entries in module order so output is same as inspecting modules in this process
+        for module_node in module_nodes:
+            get_profiler().add_records(module_node.__dict__.pop("profile_records", []))
+            for key, node in module_node.nodeindex.index.items():
+                nodeindex.add(key, node)
+            for alias, key in module_node.aliases.items():
+                nodeindex.add_alias(alias, key)
+            module_node.nodeindex = nodeindex
+        return module_nodes
+
     def _extract_wheel(self):
-        """Extract the wheel into out dir and return root path to azure root directory in package
+        """Extract the wheel into temp dir and return extracted path and root module name of package. Only files within
+        root module and dist-info directory are extracted from a wheel. Only source files of root module are required
+        in static mode
         """
         file_name, _ = os.path.splitext(os.path.basename(self.pkg_path))
         temp_pkg_dir = os.path.join(self.temp_path, file_name)
@@ -223,21 +783,28 @@ class StubGenerator:
         logging.debug(
             "Extracting {0} to directory {1}".format(self.pkg_path, temp_pkg_dir)
         )
-        zip_file = zipfile.ZipFile(self.pkg_path)
-        zip_file.extractall(temp_pkg_dir)
+        with zipfile.ZipFile(self.pkg_path) as zip_file:
+            root_module_name = self.get_module_root_name(zip_file)
+            members = None
+            if root_module_name and self.pkg_path.endswith(".whl"):
+                members = get_wheel_members(zip_file.namelist(), root_module_name, self.static)
+                logging.debug("Extracting {0} of {1} files".format(len(members), len(zip_file.namelist())))
+            zip_file.extractall(temp_pkg_dir, members)
         logging.debug("Extracted package files into temp path")
-        return temp_pkg_dir
+        return temp_pkg_dir, root_module_name
 
 
-    def get_module_root_name(self, wheel_extract_path):
+    def get_module_root_name(self, zip_file):
         # APiStubgen finds namespace from setup.py when running against code repo
         # But we don't have setup.py to parse when wheel is uploaded into APIView tool
-        # Parse top_level.txt file in dist-info to find root module name
-        files = glob.glob(os.path.join(wheel_extract_path, "*", TOP_LEVEL_WHEEL_FILE))
+        # Parse top_level.txt file in dist-info to find root module name. It's read from package without extracting it
+        files = [
+            x for x in zip_file.namelist() if x.count("/") == 1 and x.endswith("/" + TOP_LEVEL_WHEEL_FILE)
+        ]
         if not files:
-            logging.warning("File {0} is not found in {1} to identify root module name. All mdoules in package will be parsed".format(TOP_LEVEL_WHEEL_FILE, wheel_extract_path))
+            logging.warning("File {0} is not found in {1} to identify root module name. All mdoules in package will be parsed".format(TOP_LEVEL_WHEEL_FILE, self.pkg_path))
             return ""
-        with io.open(files[0], "r") as top_lvl_file:
+        with io.TextIOWrapper(zip_file.open(files[0]), encoding="utf-8") as top_lvl_file:
             root_module_name = top_lvl_file.readline().strip()
             logging.info("Root module found in {0}: '{1}'".format(TOP_LEVEL_WHEEL_FILE, root_module_name))
             return root_module_name
@@ -256,6 +823,16 @@ class StubGenerator:
         version = filename_parts[1]
         return pkg_name, version
 
+    def _add_package_to_path(self, pkg_root_path):
+        # Import package from extracted wheel and it's dependencies from dependency pool
+        requirements = get_wheel_requirements(pkg_root_path)
+        dependency_path = DependencyPool(self.deps_dir).get_dependency_path(requirements)
+        self.sys_paths = [pkg_root_path, dependency_path]
+        for path in reversed(self.sys_paths):
+            logging.debug("Adding {} to sys.path".format(path))
+            sys.path.insert(0, path)
+        importlib.invalidate_caches()
+
     def _install_package(self, pkg_name):
         # Uninstall the package and reinstall it to parse so inspect can get members in package
         # We don't want to force reinstall to avoid reinstalling other dependent packages
@@ -266,64 +843,267 @@ class StubGenerator:
 
 
 class NodeIndex:
-    """Maintains name to navigation ID"""
+    """Maintains name to navigation ID. Nodes are added using the name of module where they are listed, for e.g.
+    azure.core.PipelineClient. Name of module where a node is defined, for e.g.
+    azure.core._pipeline_client.PipelineClient, is added as an alias. Nodes can also be found using any dotted suffix
+    of their name or alias, for e.g. PipelineClient or _pipeline_client.PipelineClient, if only one node has that suffix
+    """
     def __init__(self):
         self.index = {}
+        self.aliases = {}
+        # Suffix to name of node. Suffix shared by more than one node is mapped to None
+        self._suffixes = {}
 
     def add(self, name, node):
         if name in self.index:
             raise ValueError("Index already has {} node".format(name))
         self.index[name] = node
+        self._add_suffixes(name, name)
+
+    def add_alias(self, alias, name):
+        """Add another name of an indexed node. First node added using an alias is kept if a class or function is
+        listed in more than one module
+        """
+        if alias in self.index or alias in self.aliases:
+            return
+        self.aliases[alias] = name
+        self._add_suffixes(alias, name)
+
+    def _add_suffixes(self, full_name, name):
+        parts = full_name.split(".")
+        for i in range(1, len(parts)):
+            suffix = ".".join(parts[i:])
+            if self._suffixes.setdefault(suffix, name) != name:
+                self._suffixes[suffix] = None
+
+    def resolve(self, name):
+        """Returns indexed name of a node using it's name, alias or a unique suffix. Short names of builtins are
+        not resolved to nodes of package
+        """
+        if name in self.index:
+            return name
+        if name in self.aliases:
+            return self.aliases[name]
+        if "." not in name and hasattr(builtins, name):
+            return None
+        return self._suffixes.get(name)
 
     def get(self, name):
         return self.index.get(name, None)
 
     def get_id(self, name):
-        node = self.get(name)
+        node = self.index.get(name, None)
+        if node is None:
+            resolved_name = self.resolve(name)
+            node = self.index.get(resolved_name, None) if resolved_name else None
         if node and hasattr(node, "namespace_id"):
             return node.namespace_id
         return None
 
 
-def parse_setup_py(setup_path):
-    """Parses setup.py and finds package name and version"""
-    setup_filename = os.path.join(setup_path, "setup.py")
-    mock_setup = textwrap.dedent(
-        """\
-    def setup(*args, **kwargs):
-        __setup_calls__.append((args, kwargs))
+def is_module_selected(module_name, include, exclude):
+    """Returns True if module or any of it's parent modules matches an include pattern and none of them matches an
+    exclude pattern. All modules are included if there are no include patterns
     """
+    parts = module_name.split(".")
+    names = [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    if any(fnmatch.fnmatchcase(n, x) for n in names for x in exclude):
+        return False
+    return not include or any(fnmatch.fnmatchcase(n, x) for n in names for x in include)
+
+
+def can_match_sub_module(module_name, pattern):
+    """Returns True if pattern can match a module or any of it's sub modules. Names matching a pattern start with
+    the part of pattern before first wildcard
+    """
+    prefix = re.split(r"[*?\[]", pattern, 1)[0]
+    return module_name.startswith(prefix) or prefix.startswith(module_name + ".")
+
+
+def is_token_file_path(path):
+    """Returns True if path is a token file path in any format instead of a directory
+    """
+    return any(path.endswith(x) for x in TOKEN_FILE_EXTENSIONS.values())
+
+
+def get_package_paths(paths):
+    """Returns paths of packages to parse. A directory without setup.py is replaced with wheel and sdist packages in it
+    """
+    pkg_paths = []
+    for path in paths:
+        if os.path.isdir(path) and not os.path.exists(os.path.join(path, "setup.py")):
+            pkg_paths.extend(sorted(glob.glob(os.path.join(path, "*.whl")) + glob.glob(os.path.join(path, "*.zip"))))
+        else:
+            pkg_paths.append(path)
+    return pkg_paths
+
+
+def get_wheel_members(names, root_module_name, static):
+    """Returns names of files in wheel that are required to generate tokens. Files outside root module, for e.g.
+    bundled data or tests, are not required. Imported package may read data files within root module
+    """
+    root_prefix = root_module_name.replace(".", "/") + "/"
+    members = []
+    for name in names:
+        if name.startswith(root_prefix) or name == root_prefix[:-1] + ".py":
+            if not static or name.endswith(".py") or name.endswith(".pyi"):
+                members.append(name)
+        elif name.split("/", 1)[0].endswith(".dist-info"):
+            # Requirements are read from metadata when wheel is imported from extracted path
+            members.append(name)
+    return members
+
+
+def parse_module(pkg_root_path, module_name):
+    """Parse module source using astroid without importing the module
+    :param str: pkg_root_path
+        Package root path
+    :param str: module_name
+        Module name found by _find_modules
+    """
+    module_path = os.path.join(pkg_root_path, *module_name.split("."))
+    if os.path.isdir(module_path):
+        module_path = os.path.join(module_path, INIT_PY_FILE)
+    else:
+        module_path += ".py"
+    return astroid.MANAGER.ast_from_file(module_path, module_name, source=True)
+
+
+def inspect_module(pkg_root_path, module_name, namespace, static, nodeindex=None, track_files=False):
+    """Import or parse module and inspect it's members recursively.
+       Module node is created with a new node index if index is not given. This is used by worker processes
+       Source files used by module are stored in module node if track_files is set
+    """
+    # Import ModuleNode.
+    # Importing it globally can cause circular dependency since it needs NodeIndex that is defined in this file
+    from apistub.nodes._module_node import ModuleNode
+
+    profiler = get_profiler()
+    with profiler.measure("import", module_name, "module"):
+        if static:
+            logging.debug("Parsing module {}".format(module_name))
+            module_obj = parse_module(pkg_root_path, module_name)
+        else:
+            logging.debug("Importing module {}".format(module_name))
+            module_obj = importlib.import_module(module_name)
+    if nodeindex is None:
+        nodeindex = NodeIndex()
+    with profiler.measure("inspect", module_name, "module"):
+        module_node = ModuleNode(module_name, module_obj, nodeindex, namespace)
+    if track_files:
+        # Source files are found while inspected objects are available. Objects are dropped from pickled nodes
+        module_node.source_files = sorted(get_source_files(module_node))
+    return module_node
+
+
+def get_module_index(module_node):
+    """Returns node index entries added by a module node as node key to navigation ID
+    """
+    return dict(
+        ("{0}.{1}".format(module_node.namespace, c.name), c.namespace_id) for c in module_node.child_nodes
     )
-    parsed_mock_setup = ast.parse(mock_setup, filename=setup_filename)
-    with io.open(setup_filename, "r", encoding="utf-8-sig") as setup_file:
-        parsed = ast.parse(setup_file.read())
-        for index, node in enumerate(parsed.body[:]):
-            if (
-                not isinstance(node, ast.Expr)
-                or not isinstance(node.value, ast.Call)
-                or not hasattr(node.value.func, "id")
-                or node.value.func.id != "setup"
-            ):
+
+
+def get_module_aliases(module_node):
+    """Returns node index aliases added by a module node as name of module where node is defined to node key
+    """
+    return dict(module_node.aliases)
+
+
+def set_sync_twins(module_nodes, nodeindex):
+    """Set sync counterpart of each async class so only members that are different in async class are listed
+    """
+    # Imported here to avoid circular dependency same as ModuleNode
+    from apistub.nodes._class_node import ClassNode, get_sync_twin_keys
+
+    for module_node in module_nodes:
+        for class_node in module_node.child_nodes:
+            if not isinstance(class_node, ClassNode):
                 continue
-            parsed.body[index:index] = parsed_mock_setup.body
-            break
-
-    fixed = ast.fix_missing_locations(parsed)
-    codeobj = compile(fixed, setup_filename, "exec")
-    local_vars = {}
-    global_vars = {"__setup_calls__": []}
-    current_dir = os.getcwd()
-    working_dir = os.path.dirname(setup_filename)
-    os.chdir(working_dir)
-    exec(codeobj, global_vars, local_vars)
-    os.chdir(current_dir)
-    _, kwargs = global_vars["__setup_calls__"][0]
-    package_name = kwargs["name"]
-    name_space = package_name.replace('-', '.')
-    if "packages" in kwargs.keys():
-        packages = kwargs["packages"]
-        if packages:
-            name_space = packages[0]
-            logging.info("Namespaces found for package {0}: {1}".format(package_name, packages))
-
-    return package_name, kwargs["version"], name_space
+            for key in get_sync_twin_keys("{0}.{1}".format(module_node.namespace, class_node.name)):
+                sync_node = nodeindex.get(key)
+                if isinstance(sync_node, ClassNode):
+                    logging.debug("Async class {0} is listed as delta of {1}".format(class_node.name, key))
+                    class_node.set_sync_twin(sync_node)
+                    break
+
+
+def unload_modules(modules, paths=None):
+    """Remove imported modules of current package from sys.modules so they are imported again from current package.
+    Private modules are removed along with the module that contains them. Other packages within same namespace, for
+    e.g. azure.core while inspecting azure.storage.blob, are not removed so imported dependencies are reused unless
+    paths of current package have their own copy of the module
+    :param list: modules
+        Names of modules found in current package
+    :param list: paths
+        Paths added to sys.path for current package and it's dependencies
+    """
+    modules = set(modules)
+    shadowed = set()
+    if paths:
+        shadowed = set(m for m, module_obj in list(sys.modules.items()) if _is_module_shadowed(m, module_obj, paths))
+    shadowed_prefixes = tuple(x + "." for x in shadowed)
+    module_names = [
+        m for m in sys.modules
+        if _get_public_module_name(m) in modules or m in shadowed or m.startswith(shadowed_prefixes)
+    ]
+    if module_names:
+        logging.debug("Unloading {} modules of package".format(len(module_names)))
+    for module_name in module_names:
+        del sys.modules[module_name]
+    clear_module_members(module_names)
+    importlib.invalidate_caches()
+
+
+def _get_public_module_name(module_name):
+    # Returns name of public module that contains a private module, for e.g. azure.core for azure.core._generated.models
+    parts = module_name.split(".")
+    for index, part in enumerate(parts):
+        if part.startswith("_"):
+            return ".".join(parts[:index])
+    return module_name
+
+
+def _is_module_shadowed(module_name, module_obj, paths):
+    # Returns True if an imported module has a different copy in one of the paths, for e.g. azure.core imported
+    # from site-packages when dependency directory of current package has it's own version of azure.core
+    module_file = getattr(module_obj, "__file__", None)
+    if not isinstance(module_file, str):
+        return False
+    parts = module_name.split(".")
+    if not hasattr(module_obj, "__path__"):
+        parts = parts[:-1]
+    module_file = os.path.abspath(module_file)
+    for path in paths:
+        path_file = os.path.abspath(os.path.join(path, *(parts + [os.path.basename(module_file)])))
+        if path_file != module_file and os.path.exists(path_file):
+            return True
+    return False
+
+
+def _inspect_module_in_worker(lint_rules, *args):
+    # Imported here to avoid circular dependency same as ModuleNode
+    from apistub.nodes._linter import Linter
+
+    # Profile records and time of lint rules are sent to main process with the module node. Rules that use node index
+    # of all modules are run in main process
+    module_node = inspect_module(*args)
+    linter = Linter(lint_rules)
+    linter.lint(module_node, uses_index=False)
+    module_node.lint_seconds = linter.seconds
+    module_node.profile_records = get_profiler().pop_records()
+    return module_node
+
+
+def _init_worker(pkg_root_path, static, log_level, profile, sys_paths):
+    # Worker process may not inherit logging level, profiler and sys.path of parent process
+    logging.getLogger().setLevel(log_level)
+    for path in reversed(sys_paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    profiler = get_profiler()
+    profiler.reset()
+    if profile:
+        profiler.enable()
+    if static and pkg_root_path not in sys.path:
+        sys.path.insert(0, pkg_root_path)
@@ -1,10 +1,22 @@
+from json.encoder import encode_basestring_ascii
+import io
+import json
+
 from ._token_kind import TokenKind
 
+# JSON format of serialized token. Empty definition and navigation IDs are not serialized
+TOKEN_FORMAT = '{"Kind": %d, "Value": %s}'
+TOKEN_WITH_DEFINITION_ID_FORMAT = '{"Kind": %d, "DefinitionId": %s, "Value": %s}'
+TOKEN_WITH_NAVIGATE_ID_FORMAT = '{"Kind": %d, "NavigateToId": %s, "Value": %s}'
+TOKEN_WITH_IDS_FORMAT = '{"Kind": %d, "DefinitionId": %s, "NavigateToId": %s, "Value": %s}'
+
 
 class Token:
     """Entity class to hold individual token information
     """
 
+    __slots__ = ("Kind", "DefinitionId", "NavigateToId", "Value")
+
     def __init__(self, value="", kind=TokenKind.Text):
         self.Kind = kind
         self.DefinitionId = None
@@ -19,3 +31,88 @@ class Token:
 
     def set_value(self, value):
         self.Value = value
+
+    def to_dict(self):
+        """Returns token fields to serialize. Empty definition and navigation IDs are not serialized to reduce size
+        """
+        token_dict = {"Kind": self.Kind}
+        if self.DefinitionId:
+            token_dict["DefinitionId"] = self.DefinitionId
+        if self.NavigateToId:
+            token_dict["NavigateToId"] = self.NavigateToId
+        token_dict["Value"] = self.Value
+        return token_dict
+
+
+class TokenStore:
+    """Compact list of tokens. Token fields are stored in parallel lists and repeated strings like whitespace,
+    punctuation and IDs share a single string object. Token objects are created only when tokens are read.
+    """
+
+    def __init__(self):
+        self.kinds = []
+        self.values = []
+        self.definition_ids = []
+        self.navigate_ids = []
+        self._strings = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        token = Token(self.values[index], self.kinds[index])
+        token.DefinitionId = self.definition_ids[index]
+        token.NavigateToId = self.navigate_ids[index]
+        return token
+
+    def append(self, token):
+        self.kinds.append(token.Kind)
+        self.values.append(self._intern(token.Value))
+        self.definition_ids.append(self._intern(token.DefinitionId))
+        self.navigate_ids.append(self._intern(token.NavigateToId))
+
+    def _intern(self, value):
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def encode(self):
+        """Returns JSON array of tokens. Output is same as serializing Token objects using APIViewEncoder
+        """
+        encoded_strings = {}
+
+        def encode_string(value):
+            encoded = encoded_strings.get(value)
+            if encoded is None:
+                encoded = encode_basestring_ascii(value) if isinstance(value, str) else json.dumps(value)
+                encoded_strings[value] = encoded
+            return encoded
+
+        # Writing into string buffer uses less memory than joining a list of all encoded tokens
+        encoded_tokens = io.StringIO()
+        encoded_tokens.write("[")
+        separator = ""
+        for kind, value, definition_id, navigate_id in zip(
+            self.kinds, self.values, self.definition_ids, self.navigate_ids
+        ):
+            if definition_id and navigate_id:
+                encoded = TOKEN_WITH_IDS_FORMAT % (
+                    kind.value, encode_string(definition_id), encode_string(navigate_id), encode_string(value)
+                )
+            elif definition_id:
+                encoded = TOKEN_WITH_DEFINITION_ID_FORMAT % (kind.value, encode_string(definition_id), encode_string(value))
+            elif navigate_id:
+                encoded = TOKEN_WITH_NAVIGATE_ID_FORMAT % (kind.value, encode_string(navigate_id), encode_string(value))
+            else:
+                encoded = TOKEN_FORMAT % (kind.value, encode_string(value))
+            if separator:
+                encoded_tokens.write(separator)
+            encoded_tokens.write(encoded)
+            separator = ", "
+        encoded_tokens.write("]")
+        return encoded_tokens.getvalue()
+
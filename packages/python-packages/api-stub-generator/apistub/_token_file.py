@@ -0,0 +1,239 @@
+import gzip
+import io
+import json
+import zlib
+
+from ._apiview import ApiView, Navigation, NavigationTag, JSON_FIELDS
+from ._diagnostic import Diagnostic
+from ._token import Token, TokenStore
+from ._token_kind import TokenKind
+
+TOKEN_FILE_FORMAT_JSON = "json"
+TOKEN_FILE_FORMAT_GZIP = "gzip"
+TOKEN_FILE_FORMAT_BINARY = "binary"
+# Token file of azure-core is written as azure-core_python.json, azure-core_python.json.gz or azure-core_python.apistub
+TOKEN_FILE_EXTENSIONS = {
+    TOKEN_FILE_FORMAT_JSON: ".json",
+    TOKEN_FILE_FORMAT_GZIP: ".json.gz",
+    TOKEN_FILE_FORMAT_BINARY: ".apistub",
+}
+TOKEN_FILE_FORMATS = list(TOKEN_FILE_EXTENSIONS.keys())
+GZIP_MAGIC = b"\x1f\x8b"
+BINARY_MAGIC = b"APISTUB"
+BINARY_FORMAT_VERSION = 1
+# Flags stored with kind of a token in binary format
+DEFINITION_ID_FLAG = 0x10
+NAVIGATE_ID_FLAG = 0x20
+KIND_MASK = 0x0F
+BINARY_COMPRESSION_LEVEL = 9
+
+
+def get_token_file_format(token_file_path):
+    """Returns format of a token file using it's extension
+    """
+    for token_file_format, extension in TOKEN_FILE_EXTENSIONS.items():
+        if token_file_format != TOKEN_FILE_FORMAT_JSON and token_file_path.endswith(extension):
+            return token_file_format
+    return TOKEN_FILE_FORMAT_JSON
+
+
+def strip_token_file_extension(token_file_path):
+    """Returns token file path without extension. Manifest and profile report are written using this as prefix
+    """
+    extension = TOKEN_FILE_EXTENSIONS[get_token_file_format(token_file_path)]
+    if token_file_path.endswith(extension):
+        return token_file_path[:-len(extension)]
+    return token_file_path
+
+
+def encode_binary(apiview_dict):
+    """Encodes a token file loaded as dictionary into binary format. Strings are stored once in a string table.
+    Tokens are stored in columns, kind and flags of all tokens as bytes followed by varint string indexes of values
+    and then of definition and navigation IDs, so similar data is compressed together. Navigation and diagnostics
+    are stored as json. Content after magic and version is compressed using zlib
+    """
+    strings = {None: 0}
+    string_table = bytearray()
+    kinds = bytearray()
+    values = bytearray()
+    ids = bytearray()
+
+    def add_string(value):
+        index = strings.get(value)
+        if index is None:
+            index = len(strings)
+            strings[value] = index
+            _write_bytes(string_table, value.encode("utf-8"))
+        return index
+
+    tokens = apiview_dict["Tokens"]
+    for token in tokens:
+        kind = token["Kind"]
+        kind = kind.value if isinstance(kind, TokenKind) else kind
+        definition_id = token.get("DefinitionId")
+        navigate_id = token.get("NavigateToId")
+        if definition_id:
+            kind |= DEFINITION_ID_FLAG
+            _write_varint(ids, add_string(definition_id))
+        if navigate_id:
+            kind |= NAVIGATE_ID_FLAG
+            _write_varint(ids, add_string(navigate_id))
+        kinds.append(kind)
+        _write_varint(values, add_string(token["Value"]))
+
+    metadata = dict((k, v) for k, v in apiview_dict.items() if k != "Tokens")
+    body = bytearray()
+    _write_varint(body, len(strings) - 1)
+    body.extend(string_table)
+    _write_bytes(body, json.dumps(metadata).encode("utf-8"))
+    _write_bytes(body, kinds)
+    _write_bytes(body, values)
+    body.extend(ids)
+    return BINARY_MAGIC + bytes([BINARY_FORMAT_VERSION]) + zlib.compress(bytes(body), BINARY_COMPRESSION_LEVEL)
+
+
+def decode_binary(content):
+    """Decodes a token file in binary format into a dictionary that is same as loading json token file
+    """
+    if not content.startswith(BINARY_MAGIC):
+        raise ValueError("Content is not a token file in binary format")
+    version = content[len(BINARY_MAGIC)]
+    if version != BINARY_FORMAT_VERSION:
+        raise ValueError("Binary token file version {} is not supported".format(version))
+    body = zlib.decompress(content[len(BINARY_MAGIC) + 1:])
+
+    strings = [None]
+    string_count, position = _read_varint(body, 0)
+    for _ in range(string_count):
+        value, position = _read_bytes(body, position)
+        strings.append(value.decode("utf-8"))
+    metadata, position = _read_bytes(body, position)
+    metadata = json.loads(metadata.decode("utf-8"))
+    kinds, position = _read_bytes(body, position)
+    values_length, position = _read_varint(body, position)
+    # Values and IDs are read from their own columns
+    ids_position = position + values_length
+
+    tokens = []
+    for flags in kinds:
+        index, position = _read_varint(body, position)
+        token = {"Kind": flags & KIND_MASK}
+        if flags & DEFINITION_ID_FLAG:
+            id_index, ids_position = _read_varint(body, ids_position)
+            token["DefinitionId"] = strings[id_index]
+        if flags & NAVIGATE_ID_FLAG:
+            id_index, ids_position = _read_varint(body, ids_position)
+            token["NavigateToId"] = strings[id_index]
+        token["Value"] = strings[index]
+        tokens.append(token)
+
+    apiview_dict = {}
+    for key in JSON_FIELDS:
+        if key == "Tokens":
+            apiview_dict[key] = tokens
+        elif key in metadata:
+            apiview_dict[key] = metadata[key]
+    return apiview_dict
+
+
+def _read_varint(buffer, position):
+    value = 0
+    shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _read_bytes(buffer, position):
+    length, position = _read_varint(buffer, position)
+    return buffer[position:position + length], position + length
+
+
+def _write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_bytes(buffer, value):
+    _write_varint(buffer, len(value))
+    buffer.extend(value)
+
+
+def encode_token_file(json_tokens, token_file_format):
+    """Returns content of token file in given format from serialized json tokens
+    """
+    if token_file_format == TOKEN_FILE_FORMAT_GZIP:
+        # Modified time is not written so same tokens always create same file
+        return gzip.compress(json_tokens.encode("utf-8"), mtime=0)
+    if token_file_format == TOKEN_FILE_FORMAT_BINARY:
+        return encode_binary(json.loads(json_tokens))
+    return json_tokens.encode("utf-8")
+
+
+def decode_token_file(content):
+    """Returns content of token file in any format as a dictionary that is same as loading json token file
+    """
+    if content.startswith(BINARY_MAGIC):
+        return decode_binary(content)
+    if content.startswith(GZIP_MAGIC):
+        content = gzip.decompress(content)
+    return json.loads(content.decode("utf-8"))
+
+
+def write_token_file(token_file_path, json_tokens, token_file_format=TOKEN_FILE_FORMAT_JSON):
+    """Write serialized json tokens into token file in given format
+    """
+    if token_file_format == TOKEN_FILE_FORMAT_JSON:
+        with open(token_file_path, "w") as json_file:
+            json_file.write(json_tokens)
+        return
+    content = encode_token_file(json_tokens, token_file_format)
+    with io.open(token_file_path, "wb") as token_file:
+        token_file.write(content)
+
+
+def read_token_file(token_file_path):
+    """Returns token file in any format as a dictionary that is same as loading json token file. Format is detected
+    using content of the file
+    """
+    with io.open(token_file_path, "rb") as token_file:
+        return decode_token_file(token_file.read())
+
+
+def load_apiview(token_file_path):
+    """Loads a token file in any format into ApiView. Serializing returned ApiView creates same json token file
+    """
+    apiview_dict = read_token_file(token_file_path)
+    apiview = ApiView(None, apiview_dict.get("Name", ""))
+    # Header tokens added by ApiView are already in token file
+    apiview.Tokens = TokenStore()
+    for key in ("Version", "VersionString", "PackageName"):
+        if key in apiview_dict:
+            setattr(apiview, key, apiview_dict[key])
+    for token_dict in apiview_dict["Tokens"]:
+        token = Token(token_dict["Value"], TokenKind(token_dict["Kind"]))
+        token.DefinitionId = token_dict.get("DefinitionId")
+        token.NavigateToId = token_dict.get("NavigateToId")
+        apiview.add_token(token)
+    apiview.Navigation = [_load_navigation(x) for x in apiview_dict.get("Navigation", [])]
+    for diagnostic_dict in apiview_dict.get("Diagnostics", []):
+        diagnostic = Diagnostic(diagnostic_dict["TargetId"], diagnostic_dict["Text"])
+        diagnostic.DiagnosticId = diagnostic_dict["DiagnosticId"]
+        diagnostic.set_helplink(diagnostic_dict.get("HelpLinkUri", ""))
+        apiview.Diagnostics.append(diagnostic)
+    return apiview
+
+
+def _load_navigation(navigation_dict):
+    navigation = Navigation(navigation_dict["Text"], navigation_dict["NavigationId"])
+    if navigation_dict.get("Tags"):
+        navigation.set_tag(NavigationTag(navigation_dict["Tags"]["TypeKind"]))
+    for child in navigation_dict.get("ChildItems", []):
+        navigation.add_child(_load_navigation(child))
+    return navigation
@@ -0,0 +1,193 @@
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from ._apiview import clear_module_members
+from ._diagnostic import Diagnostic
+from ._profiler import get_profiler
+from ._stub_generator import StubGenerator
+from .nodes import get_source_index
+
+JOB_STATUS_SUCCEEDED = "Succeeded"
+JOB_STATUS_FAILED = "Failed"
+
+
+class StubWorker:
+    """Runs token generation jobs one at a time in a long running process. Job is a json object with command line
+    arguments of apistubgen, for e.g. {"Id": 1, "Args": ["--pkg-path", "azure_core-1.10.0-py2.py3-none-any.whl"]}.
+    Token json is returned in response if job has "ReturnTokens": true. Interpreter, astroid, imported dependencies,
+    members of modules used to validate type names and dependency directories are reused by all jobs.
+    """
+
+    def run_job(self, job):
+        """Runs a job and returns response as a json string
+        """
+        def create_stub_generator():
+            args = job.get("Args")
+            if not isinstance(args, list):
+                raise ValueError("Args of job must be a list of command line arguments")
+            return StubGenerator(args)
+
+        response, json_tokens = self.run(job.get("Id"), create_stub_generator, job.get("ReturnTokens"))
+        if not json_tokens:
+            return json.dumps(response)
+        # Token json is embedded as it is instead of parsing and serializing it again
+        # Line breaks are removed since each response is a single line in stdin mode
+        return "{0}, \"Tokens\": {1}}}".format(json.dumps(response)[:-1], json_tokens.replace("\n", ""))
+
+    def run(self, job_id, create_stub_generator, return_tokens=False):
+        """Generates token file using stub generator created for the job. State left by previous jobs is reset
+        before the job and sys.path is restored after it. Returns response and token json if return_tokens is set
+        :param function: create_stub_generator
+            Returns StubGenerator of the job
+        """
+        from apistub import generate_token_file
+
+        response = {"Id": job_id, "Status": JOB_STATUS_SUCCEEDED}
+        json_tokens = None
+        job_paths = []
+        start = time.perf_counter()
+        self._reset()
+        sys_path = list(sys.path)
+        try:
+            stub_generator = create_stub_generator()
+            job_paths.append(stub_generator.temp_path)
+            out_file_path, json_tokens = generate_token_file(stub_generator)
+            response["OutPath"] = out_file_path
+            if return_tokens and json_tokens is None:
+                # Tokens are written directly into token file in stream mode
+                with io.open(out_file_path, "r", encoding="utf-8") as json_file:
+                    json_tokens = json_file.read()
+        except SystemExit as e:
+            # argparse and validation of paths exit on invalid arguments after logging the error
+            response["Status"] = JOB_STATUS_FAILED
+            response["Error"] = "Invalid arguments. Exit code: {}".format(e.code)
+        except Exception as e:
+            logging.error(traceback.format_exc())
+            response["Status"] = JOB_STATUS_FAILED
+            response["Error"] = str(e) or type(e).__name__
+        finally:
+            self._restore_path(sys_path, job_paths)
+        response["Seconds"] = time.perf_counter() - start
+        logging.info("Job {0} {1} in {2:.2f} seconds".format(job_id, response["Status"], response["Seconds"]))
+        return response, json_tokens if return_tokens else None
+
+    def _reset(self):
+        # State left by previous job
+        Diagnostic.id_counter = 1
+        logging.getLogger().setLevel(logging.ERROR)
+        get_profiler().reset()
+
+    def _restore_path(self, sys_path, job_paths=None):
+        # Modules imported from extracted packages and dependency directories added by this job are removed
+        # so next job imports them again from it's own paths. Source files parsed from these paths and temp path of
+        # the job are removed from source index since each package is extracted into a different directory
+        added_paths = [os.path.abspath(p) for p in sys.path if p and p not in sys_path]
+        sys.path[:] = sys_path
+        get_source_index().clear(added_paths + (job_paths or []))
+        if not added_paths:
+            return
+        module_names = [
+            name for name, module in list(sys.modules.items()) if _is_module_in_paths(module, added_paths)
+        ]
+        logging.debug("Unloading {} modules imported by job".format(len(module_names)))
+        for module_name in module_names:
+            del sys.modules[module_name]
+        clear_module_members(module_names)
+
+    def serve_lines(self, input_file, output_file):
+        """Reads a job from each line of input and writes response of each job as a line into output
+        """
+        for line in input_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                response = json.dumps({"Id": None, "Status": JOB_STATUS_FAILED, "Error": str(e)})
+            else:
+                response = self.run_job(job)
+            output_file.write(response + "\n")
+            output_file.flush()
+
+    def serve_http(self, host, port):
+        """Accepts jobs as POST requests with job json in request body. Jobs are run one at a time
+        """
+        server = HTTPServer((host, port), _create_request_handler(self))
+        logging.info("Listening for jobs on http://{0}:{1}".format(*server.server_address[:2]))
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+def _is_module_in_paths(module, paths):
+    module_paths = list(getattr(module, "__path__", None) or [])
+    module_file = getattr(module, "__file__", None)
+    if module_file:
+        module_paths.append(module_file)
+    for module_path in module_paths:
+        if not isinstance(module_path, str):
+            continue
+        module_path = os.path.abspath(module_path)
+        if any(module_path.startswith(os.path.join(p, "")) for p in paths):
+            return True
+    return False
+
+
+def _create_request_handler(worker):
+    class JobRequestHandler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                job = json.loads(self.rfile.read(length).decode("utf-8"))
+            except ValueError as e:
+                self._send(400, json.dumps({"Id": None, "Status": JOB_STATUS_FAILED, "Error": str(e)}))
+                return
+            self._send(200, worker.run_job(job))
+
+        def _send(self, status, body):
+            body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.debug(format, *args)
+
+    return JobRequestHandler
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Run api stub generator jobs in a long running process. Jobs are read as json lines from stdin "
+        "unless a port is given"
+    )
+    parser.add_argument(
+        "--port", type=int, help=("Accept jobs as http POST requests on this port instead of stdin"),
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help=("Host to listen on when port is given"),
+    )
+    args = parser.parse_args(args)
+
+    worker = StubWorker()
+    if args.port is not None:
+        worker.serve_http(args.host, args.port)
+        return
+
+    # Responses are written into original stdout. Error report and output of pip are redirected to stderr
+    output_file = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    worker.serve_lines(sys.stdin, output_file)
@@ -8,6 +8,7 @@ from ._enum_node import EnumNode
 from ._function_node import FunctionNode
 from ._module_node import ModuleNode
 from ._property_node import PropertyNode
+from ._source_index import SourceIndex, get_source_index
 from ._variable_node import VariableNode
 
 
@@ -21,5 +22,7 @@ __all__ = [
     "FunctionNode",
     "ModuleNode",
     "PropertyNode",
+    "SourceIndex",
+    "get_source_index",
     "VariableNode",
 ]
@@ -3,9 +3,6 @@ import logging
 # Special default values that should not be treated as string literal
 SPECIAL_DEFAULT_VALUES = ["None", "..."]
 
-# Lint warnings
-TYPE_NOT_AVAILABLE = "Type is not available for {0}"
-
 TYPE_NOT_REQUIRED = ["**kwargs", "self", "cls", "*", ]
 
 class ArgType:
@@ -24,10 +21,17 @@ class ArgType:
 
     def set_function_node(self, func_node):
         # Function node which is parent node can set it's refernce once docstring parser creates Argtype objects
-        # This function node will be used to report any error found in arg while generating token.
         self.function_node = func_node
 
 
+    def get_id(self, function_id, add_line_marker):
+        """Returns ID of the line where arg is listed. Arg has it's own line ID if args are listed in individual lines
+        """
+        if add_line_marker:
+            return "{0}.param({1}".format(function_id, self.argname)
+        return function_id
+
+
     def generate_tokens(self, apiview, function_id, add_line_marker):
         """Generates token for the node and it's children recursively and add it to apiview
         :param ~ApiVersion apiview: The ApiView
@@ -35,9 +39,8 @@ class ArgType:
         :param bool include_default: Optional flag to indicate to include/exclude default value in tokens
         """
         # Add arg name
-        self.id = function_id
+        self.id = self.get_id(function_id, add_line_marker)
         if add_line_marker:
-            self.id = "{0}.param({1}".format(function_id, self.argname)
             apiview.add_line_marker(self.id)
 
         apiview.add_text(self.id, self.argname)
@@ -45,12 +48,6 @@ class ArgType:
         if self.argtype:
             apiview.add_punctuation(":", False, True)
             apiview.add_type(self.argtype, self.id)
-        elif self.argname not in (TYPE_NOT_REQUIRED):
-            # Type is not available. Add lint error in review
-            error_msg = TYPE_NOT_AVAILABLE.format(self.argname)
-            apiview.add_diagnostic(error_msg, self.id)
-            if self.function_node:
-                self.function_node.add_error(error_msg)
 
         # add arg default value
         if self.default:
@@ -1,5 +1,8 @@
+import linecache
 from inspect import Parameter
 
+import astroid
+
 class NodeEntityBase:
     """This is the base class for all node types
     :param str: namespace
@@ -17,10 +20,19 @@ class NodeEntityBase:
         self.name = ""
         if hasattr(obj, "__name__"):
             self.name = obj.__name__
+        elif is_ast_node(obj) and hasattr(obj, "name"):
+            self.name = obj.name
         self.display_name = self.name
         self.child_nodes = []
         self.errors = []
 
+    def __getstate__(self):
+        # Inspected object is not required after inspection to generate tokens. Dropping it makes node
+        # picklable so nodes can be returned from worker processes
+        state = self.__dict__.copy()
+        state["obj"] = None
+        return state
+
     def generate_id(self):
         """Generates ID for current object using parent object's ID and name
         """
@@ -29,6 +41,12 @@ class NodeEntityBase:
             namespace_id = "{0}.{1}".format(self.parent_node.namespace_id, self.name)
         return namespace_id
 
+    def get_signature(self):
+        """Returns a tuple that is same for members with same API and errors in sync and async counterpart of a class
+        or None if member can not be compared
+        """
+        return None
+
     def generate_tokens(self, apiview):
         """Generates token for the node and it's children recursively and add it to apiview
         :param ApiView: apiview
@@ -64,3 +82,66 @@ def get_qualified_name(obj, namespace):
         return "{0}.{1}".format(module_name, name)
 
     return name
+
+
+def is_ast_node(obj):
+    """Returns True if object is an astroid node parsed from source instead of an imported object
+    """
+    return isinstance(obj, astroid.nodes.NodeNG)
+
+
+def get_docstring(obj):
+    """Returns docstring of imported object or of astroid node parsed from source
+    """
+    if is_ast_node(obj):
+        doc_node = getattr(obj, "doc_node", None)
+        return doc_node.value if doc_node else None
+    return getattr(obj, "__doc__", None)
+
+
+def get_node_source(node):
+    """Returns source code of an astroid node including decorators
+    """
+    lines = linecache.getlines(node.root().file)
+    start = node.lineno
+    decorators = getattr(node, "decorators", None)
+    if decorators and decorators.nodes:
+        start = min(start, decorators.nodes[0].lineno)
+    return "".join(lines[start - 1 : node.tolineno])
+
+
+def get_static_qualified_name(node, namespace):
+    """Static counterpart of get_qualified_name for an annotation node parsed from source.
+       Only simple names are resolved. Any other expression is returned as written in source.
+    :param: node
+        astroid node of type annotation
+    """
+    if node is None:
+        return None
+
+    # Forward reference in quotes
+    if isinstance(node, astroid.nodes.Const) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, (astroid.nodes.Name, astroid.nodes.Attribute)):
+        try:
+            inferred = next(node.infer())
+        except (astroid.InferenceError, StopIteration):
+            inferred = None
+        if isinstance(inferred, astroid.nodes.ClassDef):
+            module_name = inferred.root().name
+            if module_name and module_name.startswith(namespace):
+                return "{0}.{1}".format(module_name, inferred.name)
+            return inferred.name
+    return node.as_string()
+
+
+def get_static_value(node):
+    """Returns literal value of a constant expression node parsed from source and None otherwise
+    """
+    try:
+        inferred = next(node.infer())
+    except (astroid.InferenceError, StopIteration):
+        return None
+    if isinstance(inferred, astroid.nodes.Const):
+        return inferred.value
+    return None
@@ -4,8 +4,11 @@ import enum
 from enum import Enum
 import types
 import operator
+import weakref
 
-from ._base_node import NodeEntityBase
+import astroid
+
+from ._base_node import NodeEntityBase, get_docstring, get_static_value, is_ast_node
 from ._function_node import FunctionNode
 from ._enum_node import EnumNode
 from ._property_node import PropertyNode
@@ -13,16 +16,43 @@ from ._docstring_parser import DocstringParser
 from ._variable_node import VariableNode
 
 
-find_props = lambda x: isinstance(x, PropertyNode)
-find_instancefunc = (
-    lambda x: isinstance(x, FunctionNode)
-    and not x.is_class_method
-    and not x.name.startswith("__")
-)
-find_enum = lambda x: isinstance(x, EnumNode)
-find_var = lambda x: isinstance(x, VariableNode)
-find_classfunc = lambda x: isinstance(x, FunctionNode) and x.is_class_method
-find_dunder_func = lambda x: isinstance(x, FunctionNode) and x.name.startswith("__")
+# Members of class are listed in following order of groups and sorted by name within each group
+(
+    PROPERTY_GROUP,
+    VARIABLE_GROUP,
+    ENUM_GROUP,
+    DUNDER_FUNCTION_GROUP,
+    CLASS_FUNCTION_GROUP,
+    INSTANCE_FUNCTION_GROUP,
+) = range(6)
+MEMBER_GROUP_COUNT = 6
+
+
+def get_member_groups(node):
+    """Returns groups of a class member. Dunder class method is listed in both dunder and class function groups
+    """
+    if isinstance(node, PropertyNode):
+        return (PROPERTY_GROUP,)
+    if isinstance(node, VariableNode):
+        return (VARIABLE_GROUP,)
+    if isinstance(node, EnumNode):
+        return (ENUM_GROUP,)
+    if isinstance(node, FunctionNode):
+        is_dunder = node.name.startswith("__")
+        if node.is_class_method:
+            return (DUNDER_FUNCTION_GROUP, CLASS_FUNCTION_GROUP) if is_dunder else (CLASS_FUNCTION_GROUP,)
+        return (DUNDER_FUNCTION_GROUP,) if is_dunder else (INSTANCE_FUNCTION_GROUP,)
+    return ()
+
+
+def is_property(func_node):
+    """Returns True if function node parsed from source is decorated as a property getter
+    """
+    decorators = func_node.decorators
+    return bool(decorators) and any(
+        isinstance(x, astroid.nodes.Name) and x.name == "property"
+        for x in decorators.nodes
+    )
 
 # This static dict will be used to identify if a class implements a specific ABC class
 # and tag class as implementing corresponding ABC class instead of showing these dunder methods
@@ -49,6 +79,97 @@ ABSTRACT_CLASS_METHODS = {
     "Awaitable": ["__await__"],
 }
 
+# Members of base classes in these modules are not inspected when class is parsed from source
+STATIC_SKIP_MODULES = ["builtins", "enum"]
+# Async counterpart of a sync class is in aio module or has Async prefix
+ASYNC_MODULE_NAME = "aio"
+ASYNC_CLASS_PREFIX = "Async"
+
+# Members defined in each class that are included in API. Base classes shared by many classes, for e.g. mixins and
+# msrest.serialization.Model, are inspected once in a run. Entries are removed when class is garbage collected
+_class_members = weakref.WeakKeyDictionary()
+_static_class_members = weakref.WeakKeyDictionary()
+
+
+def should_include_function(func_obj, namespace):
+    # Method or Function member should only be included if it is defined in same package.
+    # So this check will filter any methods defined in parent class if parent class is in non-azure package
+    # for e.g. as_dict method in msrest
+    if not (
+        inspect.ismethod(func_obj) or inspect.isfunction(func_obj)
+    ) or inspect.isbuiltin(func_obj):
+        return False
+    if hasattr(func_obj, "__module__"):
+        function_module = getattr(func_obj, "__module__")
+        return function_module and function_module.startswith(namespace)
+
+    return False
+
+
+def is_included_member(name, member_obj, namespace):
+    """Returns True if a member of class that is not an enum value is included in API
+    """
+    if inspect.isbuiltin(member_obj):
+        return False
+    if should_include_function(member_obj, namespace):
+        return not name.startswith("_") or name.startswith("__")
+    if isinstance(member_obj, property):
+        return not name.startswith("_")
+    return not name.startswith("_") and isinstance(member_obj, (str, int))
+
+
+def get_class_members(klass, namespace):
+    """Returns dict of names defined in a class and whether each member is included in API. Members are looked up
+    from the class so they are same as members found by inspect.getmembers
+    """
+    members_by_namespace = _class_members.get(klass)
+    if members_by_namespace is None:
+        members_by_namespace = {}
+        _class_members[klass] = members_by_namespace
+    members = members_by_namespace.get(namespace)
+    if members is None:
+        members = {}
+        for name in list(vars(klass)):
+            try:
+                members[name] = is_included_member(name, getattr(klass, name), namespace)
+            except Exception:
+                members[name] = False
+        members_by_namespace[namespace] = members
+    return members
+
+
+def get_static_class_members(klass):
+    """Returns dict of members defined in body of a class parsed from source
+    """
+    members = _static_class_members.get(klass)
+    if members is None:
+        members = {}
+        for name, nodes in klass.locals.items():
+            # Ignore members that are not defined in class body. For e.g. members added by astroid
+            nodes = [x for x in nodes if x.parent and x.parent.scope() is klass]
+            if nodes:
+                # Property getter is the member if class has both getter and setter
+                properties = [x for x in nodes if isinstance(x, astroid.nodes.FunctionDef) and is_property(x)]
+                members[name] = properties[0] if properties else nodes[-1]
+        _static_class_members[klass] = members
+    return members
+
+
+def get_sync_twin_keys(key):
+    """Returns possible node index keys of sync counterpart of an async class. Async class is either in aio module
+    with same name, for e.g. azure.storage.blob.aio.BlobClient, or has Async prefix, for e.g.
+    azure.core.AsyncPipelineClient
+    """
+    module_name, _, class_name = key.rpartition(".")
+    sync_module_name = ".".join(x for x in module_name.split(".") if x != ASYNC_MODULE_NAME)
+    class_names = []
+    if sync_module_name != module_name:
+        class_names.append(class_name)
+    sync_class_name = class_name[len(ASYNC_CLASS_PREFIX):]
+    if class_name.startswith(ASYNC_CLASS_PREFIX) and sync_class_name[:1].isupper():
+        class_names.append(sync_class_name)
+    return ["{0}.{1}".format(sync_module_name, x) for x in class_names]
+
 
 class ClassNode(NodeEntityBase):
     """Class node to represent parsed class node and children
@@ -61,6 +182,14 @@ class ClassNode(NodeEntityBase):
         self.namespace_id = self.generate_id()
         self.full_name = self.namespace_id
         self.implements = []
+        # Class variables and ivars by name. Value of class variable is updated if it's also documented as ivar
+        self._variables = {}
+        # Number of properties, variables and enums. Functions are listed after them
+        self.member_count = 0
+        # Sync counterpart of async class and IDs of members that are same in both. Only members that are different
+        # from sync class are listed if it's set
+        self.sync_twin = None
+        self._same_as_sync = set()
         self._inspect()
         self._set_abc_implements()
         self._sort_elements()
@@ -73,7 +202,7 @@ class ClassNode(NodeEntityBase):
         instance_functions = [
             x for x in self.child_nodes if isinstance(x, FunctionNode)
         ]
-        instance_function_names = [x.name for x in instance_functions]
+        instance_function_names = set(x.name for x in instance_functions)
 
         is_implemented = lambda func: func in instance_function_names
         for c in ABSTRACT_CLASS_METHODS:
@@ -83,31 +212,40 @@ class ClassNode(NodeEntityBase):
                 self.implements.append(c)
 
         # Hide all methods for implemented ABC classes/ implements
-        methods_to_hide = []
+        methods_to_hide = set()
         for abc_class in self.implements:
-            methods_to_hide.extend(ABSTRACT_CLASS_METHODS[abc_class])
+            methods_to_hide.update(ABSTRACT_CLASS_METHODS[abc_class])
         # Hide abc methods for ABC implementations
         for method in instance_functions:
             if method.name in methods_to_hide:
                 method.hidden = True
 
     def _should_include_function(self, func_obj):
-        # Method or Function member should only be included if it is defined in same package.
-        # So this check will filter any methods defined in parent class if parent class is in non-azure package
-        # for e.g. as_dict method in msrest
-        if not (
-            inspect.ismethod(func_obj) or inspect.isfunction(func_obj)
-        ) or inspect.isbuiltin(func_obj):
-            return False
-        if hasattr(func_obj, "__module__"):
-            function_module = getattr(func_obj, "__module__")
-            return function_module and function_module.startswith(self.namespace)
+        return should_include_function(func_obj, self.namespace)
 
-        return False
+    def _get_members(self):
+        # Find members included in API in MRO order using cached members of each class. Member defined in a class
+        # takes precedence over the same member in it's base classes
+        included = {}
+        for klass in getattr(self.obj, "__mro__", [self.obj]):
+            for name, is_included in get_class_members(klass, self.namespace).items():
+                included.setdefault(name, is_included)
+
+        members = []
+        for name in sorted(x for x, is_included in included.items() if is_included):
+            try:
+                members.append((name, getattr(self.obj, name)))
+            except AttributeError:
+                continue
+        return members
 
     def _inspect(self):
         # Inspect current class and it's members recursively
         logging.debug("Inspecting class {}".format(self.full_name))
+        if is_ast_node(self.obj):
+            self._inspect_static()
+            return
+
         # get base classes
         self.base_class_names = self._get_base_classes()
         # Check if Enum is in Base class hierarchy
@@ -115,8 +253,9 @@ class ClassNode(NodeEntityBase):
         # Find any ivar from docstring
         self._parse_ivars()
 
-        # find members in node
-        for name, child_obj in inspect.getmembers(self.obj):
+        # find members in node. Values of enum are instances of the class itself so all members of enum are inspected
+        members = inspect.getmembers(self.obj) if self.is_enum else self._get_members()
+        for name, child_obj in members:
             if inspect.isbuiltin(child_obj):
                 continue
             elif self._should_include_function(child_obj):
@@ -139,45 +278,113 @@ class ClassNode(NodeEntityBase):
                 isinstance(child_obj, str) or isinstance(child_obj, int)
             ):
                 # Add any public class level variables
-                # if variable is already present  in parsed list then just update the value
-                var_nodes = [v for v in self.child_nodes if isinstance(v, VariableNode) and v.name == name]
-                if var_nodes:
-                    var_nodes[0].value = str(child_obj)
-                else:
-                    # Assumption here is that class level variables are either str or int constants
-                    self.child_nodes.append(
-                        (
-                            VariableNode(
-                                self.namespace, self, name, None, str(child_obj), False
-                            )
+                # Assumption here is that class level variables are either str or int constants
+                self._add_variable(name, str(child_obj))
+
+    def _inspect_static(self):
+        # Inspect class node parsed from source and it's members without importing the class
+        self.base_class_names = self._get_static_base_classes()
+        self.is_enum = any(c.qname() == "enum.Enum" for c in self.obj.ancestors())
+        self._parse_ivars()
+
+        if self.is_enum:
+            # Enum values are assignments in class body
+            for stmt in self.obj.body:
+                if isinstance(stmt, astroid.nodes.Assign):
+                    for target in stmt.targets:
+                        if isinstance(target, astroid.nodes.AssignName) and not target.name.startswith("_"):
+                            self.child_nodes.append(EnumNode(self.namespace, self, target))
+
+        for name, child_obj in self._get_static_members():
+            if isinstance(child_obj, astroid.nodes.FunctionDef):
+                if is_property(child_obj):
+                    if not name.startswith("_"):
+                        self.child_nodes.append(
+                            PropertyNode(self.namespace, self, name, child_obj)
                         )
-                    )
+                elif child_obj.root().name.startswith(self.namespace):
+                    # Include dunder and public methods defined in same package
+                    if not name.startswith("_") or name.startswith("__"):
+                        self.child_nodes.append(
+                            FunctionNode(self.namespace, self, child_obj)
+                        )
+            elif isinstance(child_obj, astroid.nodes.AssignName) and not name.startswith("_"):
+                if self.is_enum and child_obj.frame() is self.obj:
+                    continue
+                value = get_static_value(child_obj)
+                if not isinstance(value, (str, int)):
+                    continue
+                self._add_variable(name, str(value))
+
+    def _add_variable(self, name, value):
+        # if variable is already present in parsed list then just update the value
+        var_node = self._variables.get(name)
+        if var_node:
+            var_node.value = value
+        else:
+            var_node = VariableNode(self.namespace, self, name, None, value, False)
+            self._variables[name] = var_node
+            self.child_nodes.append(var_node)
+
+    def _get_static_members(self):
+        # Find members of class parsed from source in MRO order. Member defined in a class takes
+        # precedence over the same member in it's base classes
+        try:
+            mro = self.obj.mro()
+        except Exception:
+            mro = [self.obj] + list(self.obj.ancestors())
+
+        members = {}
+        for klass in mro:
+            # Members of builtin types like object and Enum are not part of package API
+            if klass.root().name in STATIC_SKIP_MODULES:
+                continue
+            for name, node in get_static_class_members(klass).items():
+                members.setdefault(name, node)
+        return sorted(members.items(), key=operator.itemgetter(0))
+
+    def _get_static_base_classes(self):
+        # Find base classes of class parsed from source
+        base_classes = []
+        for base in self.obj.bases:
+            try:
+                cl = next(base.infer())
+            except (astroid.InferenceError, StopIteration):
+                cl = None
+            if not isinstance(cl, astroid.nodes.ClassDef):
+                base_classes.append(base.as_string())
+            elif cl.qname() != "builtins.object":
+                module_name = cl.root().name
+                # Show module level name for internal types to show any generated internal types
+                if module_name.startswith("azure"):
+                    base_classes.append("{0}.{1}".format(module_name, cl.name))
+                else:
+                    base_classes.append(cl.name)
+        return base_classes
 
     def _parse_ivars(self):
         # This method will add instance variables by parsing docstring
-        if not hasattr(self.obj, "__doc__"):
-            return
-        docstring = getattr(self.obj, "__doc__")
+        docstring = get_docstring(self.obj)
         if docstring:
             docstring_parser = DocstringParser(docstring)
             for var in docstring_parser.find_args("ivar"):
                 ivar_node = VariableNode(
                     self.namespace, self, var.argname, var.argtype, None, True
                 )
+                self._variables.setdefault(var.argname, ivar_node)
                 self.child_nodes.append(ivar_node)
 
     def _sort_elements(self):
         # Sort elements in following order
         # properties, variables, Enums, dunder methods, class functions and instance methods
-        # sort all elements based on name firstand then group them
+        # sort all elements based on name first and then group them in a single pass
         self.child_nodes.sort(key=operator.attrgetter("name"))
-        sorted_children = list(filter(find_props, self.child_nodes))
-        sorted_children.extend(filter(find_var, self.child_nodes))
-        sorted_children.extend(filter(find_enum, self.child_nodes))
-        sorted_children.extend(filter(find_dunder_func, self.child_nodes))
-        sorted_children.extend(filter(find_classfunc, self.child_nodes))
-        sorted_children.extend(filter(find_instancefunc, self.child_nodes))
-        self.child_nodes = sorted_children
+        groups = [[] for _ in range(MEMBER_GROUP_COUNT)]
+        for child in self.child_nodes:
+            for group in get_member_groups(child):
+                groups[group].append(child)
+        self.member_count = len(groups[PROPERTY_GROUP]) + len(groups[VARIABLE_GROUP]) + len(groups[ENUM_GROUP])
+        self.child_nodes = [x for group in groups for x in group]
 
     def _get_base_classes(self):
         # Find base classes
@@ -219,20 +426,44 @@ class ClassNode(NodeEntityBase):
             self._generate_child_tokens(apiview)
 
 
+    def set_sync_twin(self, sync_node):
+        """List only members of this async class that are different from it's sync counterpart. Members are compared
+        using their signatures found while inspecting both classes
+        """
+        sync_signatures = set(x.get_signature() for x in sync_node.child_nodes)
+        sync_signatures.discard(None)
+        self.sync_twin = sync_node
+        self._same_as_sync = set(id(x) for x in self.child_nodes if x.get_signature() in sync_signatures)
+
+    def get_listed_members(self):
+        """Returns members and methods listed in API view and number of members that are same as sync counterpart
+        """
+        members = self.child_nodes[:self.member_count]
+        functions = [x for x in self.child_nodes[self.member_count:] if not x.hidden]
+        same_count = len(members) + len(functions)
+        if self._same_as_sync:
+            members = [x for x in members if id(x) not in self._same_as_sync]
+            functions = [x for x in functions if id(x) not in self._same_as_sync]
+        same_count -= len(members) + len(functions)
+        return members, functions, same_count
+
     def _generate_child_tokens(self, apiview):
         # Add members and methods
+        members, functions, same_count = self.get_listed_members()
+
         apiview.add_new_line()
         apiview.begin_group()
-        for e in [p for p in self.child_nodes if not isinstance(p, FunctionNode)]:
+        if self._same_as_sync:
+            apiview.add_whitespace()
+            apiview.add_literal("# {} members are same as ".format(same_count))
+            apiview.add_type(self.sync_twin.full_name)
+            apiview.add_new_line()
+        for e in members:
             apiview.add_whitespace()
             e.generate_tokens(apiview)
             apiview.add_new_line()
         apiview.add_new_line(1)
-        for func in [
-            x
-            for x in self.child_nodes
-            if isinstance(x, FunctionNode) and x.hidden == False
-        ]:
+        for func in functions:
             func.generate_tokens(apiview)
             apiview.add_new_line(1)
         apiview.end_group()
@@ -252,7 +483,7 @@ class ClassNode(NodeEntityBase):
         has_error = False
         # Check if atleast one error is present in child nodes
         for c in self.child_nodes:
-            if hasattr(c, "errors") and c.errors:
+            if c.errors or getattr(c, "diagnostics", None):
                 has_error = True
                 break
         if has_error:
@@ -1,7 +1,10 @@
+import functools
 import re
 import inspect
 import logging
 from ._argtype import ArgType
+from ._base_node import get_node_source, is_ast_node
+from ._source_index import get_source_index
 
 
 # REGEX to parse docstring
@@ -21,6 +24,112 @@ find_type_hint_ret_type = "(?<!#)\s->\s+([^\n:]*)"
 
 docstring_types = ["param", "type", "paramtype", "keyword", "rtype"]
 
+# Kinds of argument fields found by docstring scanner
+docstring_arg_kinds = ["param", "keyword", "ivar"]
+# Field kinds that give type of an argument
+arg_type_kinds = "(type|keywordtype|paramtype|vartype)"
+# Maximum number of scanned docstrings to cache. Same docstring is parsed for class and it's constructor
+DOCSTRING_CACHE_SIZE = 1024
+
+# Compiled regex used by docstring scanner. Each regex is matched at the start of a field
+find_docstring_field = re.compile("(?<!:):(?=param|keyword|ivar|type|vartype|rtype)")
+find_var_type_field = re.compile("(?<!:):" + arg_type_kinds + r"\s?(\w*):")
+find_var_name = re.compile(r"\w*")
+arg_and_type_regexes = dict((k, re.compile(find_arg_and_type_regex.format(k))) for k in docstring_arg_kinds)
+arg_regexes = dict((k, re.compile(find_arg_regex.format(k))) for k in docstring_arg_kinds)
+multi_type_value_regex = re.compile("([^:]+)(?!:)")
+union_type_value_regex = re.compile(r"[\s]*([\w.]*((\[[^\n]+\])|(\([^\n]+\))))(?!:)")
+single_type_value_regex = re.compile(r"[\s]*([\S]+)(?!:)")
+docstring_return_type_regex = re.compile(find_docstring_return_type)
+
+
+def _find_var_type(docstring, positions):
+    # Type of a variable from it's type fields. Multiple types are checked in all fields first and then union
+    # and single types in same order as DocstringParser.find_type
+    for pos in positions:
+        type_groups = multi_type_value_regex.match(docstring, pos)
+        if type_groups:
+            return type_groups.group(1).replace("\n", "").strip()
+    for pos in positions:
+        type_groups = union_type_value_regex.match(docstring, pos)
+        if type_groups:
+            return type_groups.group(1)
+    for pos in positions:
+        type_groups = single_type_value_regex.match(docstring, pos)
+        if type_groups:
+            return type_groups.group(1)
+    return None
+
+
+def _find_return_type(docstring, pos):
+    # Return type that is wrapped into next lines is read until it's brackets are closed
+    # for e.g. list[~azure.ai.textanalytics.DetectLanguageResult,\n ~azure.ai.textanalytics.DocumentError]
+    ret_type_groups = docstring_return_type_regex.match(docstring, pos)
+    if not ret_type_groups:
+        return None
+    ret_type = ret_type_groups.group(1)
+    end = ret_type_groups.end()
+    while ret_type.count("[") > ret_type.count("]") and end < len(docstring):
+        line_end = docstring.find("\n", end + 1)
+        if line_end < 0:
+            line_end = len(docstring)
+        line = docstring[end + 1:line_end].strip()
+        # Next field or an empty line ends the return type
+        if not line or line.startswith(":"):
+            break
+        ret_type = "{0} {1}".format(ret_type.rstrip(), line)
+        end = line_end
+    return ret_type
+
+
+@functools.lru_cache(maxsize=DOCSTRING_CACHE_SIZE)
+def scan_docstring(docstring):
+    """Walks through docstring once and returns dict of parsed fields. Keys param, keyword and ivar have list of
+    (name, type) of arguments as found in the field, key type has type of each variable from type fields and
+    key rtype has return type.
+    Returned dict is cached by docstring and it must not be modified.
+    """
+    found_args = dict((k, []) for k in docstring_arg_kinds)
+    found_args_without_type = dict((k, []) for k in docstring_arg_kinds)
+    type_positions = {}
+    ret_type = None
+    # End of last match for each regex. Matches don't overlap same as findall
+    last_match_end = {}
+
+    for field in find_docstring_field.finditer(docstring):
+        pos = field.start()
+        for kind in docstring_arg_kinds:
+            if not docstring.startswith(kind, pos + 1):
+                continue
+            for regex, args in [
+                (arg_and_type_regexes[kind], found_args[kind]),
+                (arg_regexes[kind], found_args_without_type[kind])
+            ]:
+                if pos < last_match_end.get(regex, 0):
+                    continue
+                arg = regex.match(docstring, pos)
+                if arg:
+                    args.append(arg.groups())
+                    last_match_end[regex] = arg.end()
+
+        type_field = find_var_type_field.match(docstring, pos)
+        if type_field:
+            type_positions.setdefault(type_field.group(2), []).append(type_field.end())
+
+        if ret_type is None and docstring.startswith("rtype", pos + 1):
+            ret_type = _find_return_type(docstring, pos)
+
+    var_types = dict((name, _find_var_type(docstring, positions)) for name, positions in type_positions.items())
+
+    fields = {"type": var_types, "rtype": ret_type}
+    for kind in docstring_arg_kinds:
+        fields[kind] = [
+            (x[1].strip(), x[0].strip()) if x[1].strip() else (x[0].strip(), None)
+            for x in found_args[kind]
+        ]
+        fields[kind].extend([(x[0].strip(), None) for x in found_args_without_type[kind]])
+    return fields
+
 
 class DocstringParser:
     """This represents a parsed doc string which has list of positional and keyword arguements and return type
@@ -63,36 +172,24 @@ class DocstringParser:
 
     def find_return_type(self):
         # Find return type from docstring
-        ret_type = re.search(find_docstring_return_type, self.docstring)
-        if ret_type:
-            return ret_type.groups()[-1]
-        return None
+        return scan_docstring(self.docstring)["rtype"]
 
     def find_args(self, arg_type="param"):
-        # This method will find positional or kw arguement
-        # find docstring that has both type and arg name in same docstring
-        arg_type_regex = re.compile(find_arg_and_type_regex.format(arg_type))
-        args = arg_type_regex.findall(self.docstring)
-        params = [
-            ArgType(x[1].strip(), x[0].strip())
-            if x[1].strip()
-            else ArgType(x[0].strip())
-            for x in args
-        ]
-
-        # fin param or keyword args that ddoesn't type in same docstring
-        arg_regex = re.compile(find_arg_regex.format(arg_type))
-        args = arg_regex.findall(self.docstring)
-        params.extend([ArgType(x.strip()) for x in args])
-
-        # Get type if it is missing
+        # This method will find positional, keyword or instance variable arguments
+        fields = scan_docstring(self.docstring)
+        params = [ArgType(name, argtype) for name, argtype in fields[arg_type]]
         for p in params:
             # Show kwarg is optional by setting default to "..."
             if arg_type == "keyword":
                 p.default = "..."
 
+            # Get type if it is missing
             if not p.argtype:
-                p.argtype = self.find_type("(type|keywordtype|paramtype|vartype)", p.argname)
+                if find_var_name.fullmatch(p.argname):
+                    p.argtype = fields["type"].get(p.argname)
+                else:
+                    # Type is used as argument name if name is missing in field
+                    p.argtype = self.find_type(arg_type_kinds, p.argname)
         return params
 
     def parse(self):
@@ -115,7 +212,10 @@ class TypeHintParser:
     def __init__(self, obj):
         self.obj = obj
         try:
-            self.code = inspect.getsource(obj)
+            if is_ast_node(obj):
+                self.code = get_node_source(obj)
+            else:
+                self.code = get_source_index().get_source(obj) or inspect.getsource(obj)
         except:
             self.code = None
             logging.error("Failed to get source of object {}".format(obj))
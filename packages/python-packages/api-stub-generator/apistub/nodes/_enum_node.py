@@ -2,7 +2,7 @@ import logging
 import inspect
 import astroid
 
-from ._base_node import NodeEntityBase
+from ._base_node import NodeEntityBase, is_ast_node
 
 
 class EnumNode(NodeEntityBase):
@@ -12,9 +12,30 @@ class EnumNode(NodeEntityBase):
     def __init__(self, namespace, parent_node, obj):
         super().__init__(namespace, parent_node, obj)
         self.name = obj.name
-        self.value = obj.value
+        # Value expression is shown as literal if enum value is not a constant
+        self.is_value_expression = False
+        if is_ast_node(obj):
+            # Enum value assigned in class body parsed from source
+            value_node = getattr(obj.statement(), "value", None)
+            if isinstance(value_node, astroid.nodes.Const):
+                self.value = value_node.value
+            else:
+                self.value = value_node.as_string() if value_node else ""
+                self.is_value_expression = True
+        else:
+            self.value = obj.value
         self.namespace_id = self.generate_id()
 
+    def get_signature(self):
+        # Value is compared as it's rendered since value of enum may not be hashable
+        return (
+            "enum",
+            self.name,
+            str(self.value),
+            isinstance(self.value, str) and not self.is_value_expression,
+            tuple(self.errors),
+        )
+
     def generate_tokens(self, apiview):
         """Generates token for the node and it's children recursively and add it to apiview
         :param ApiView: apiview
@@ -24,7 +45,7 @@ class EnumNode(NodeEntityBase):
         apiview.add_space()
         apiview.add_punctuation("=")
         apiview.add_space()
-        if isinstance(self.value, str):
+        if isinstance(self.value, str) and not self.is_value_expression:
             apiview.add_stringliteral(self.value)
         else:
             apiview.add_literal(str(self.value))
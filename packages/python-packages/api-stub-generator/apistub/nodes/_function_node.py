@@ -1,20 +1,27 @@
+import ast
 import logging
 import inspect
 import astroid
 import operator
-import re
 from inspect import Parameter
 from ._docstring_parser import DocstringParser, TypeHintParser
-from ._base_node import NodeEntityBase, get_qualified_name
+from ._base_node import (
+    NodeEntityBase,
+    get_docstring,
+    get_qualified_name,
+    get_static_qualified_name,
+    is_ast_node,
+)
 from ._argtype import ArgType
+from ._source_index import get_decorator_names, get_source_index
 
 
 KW_ARG_NAME = "**kwargs"
 VALIDATION_REQUIRED_DUNDER = ["__init__",]
 KWARG_NOT_REQUIRED_METHODS = ["close",]
 TYPEHINT_NOT_REQUIRED_METHODS = ["close", "__init__"]
-REGEX_ITEM_PAGED = "~[\w.]*\.([\w]*)\s?[\[\(][^\n]*[\]\)]"
-PAGED_TYPES = ["ItemPaged", "AsyncItemPaged",]
+# Decorators of async methods, for e.g. @distributed_trace_async
+ASYNC_DECORATOR_SUFFIX = "_async"
 # Methods that are implementation of known interface should be excluded from lint check
 # for e.g. get, update, keys
 LINT_EXCLUSION_METHODS = [
@@ -26,10 +33,6 @@ LINT_EXCLUSION_METHODS = [
     "values",
     "close",    
 ]
-# Find types like ~azure.core.paging.ItemPaged and group returns ItemPaged.
-# Regex is used to find shorten such instances in complex type
-# for e,g, ~azure.core.ItemPaged.ItemPaged[~azure.communication.chat.ChatThreadInfo] to ItemPaged[ChatThreadInfo]
-REGEX_FIND_LONG_TYPE = "((?:~?)[\w.]+\.+([\w]+))"
 
 
 def is_kwarg_mandatory(func_name):
@@ -40,6 +43,14 @@ def is_typehint_mandatory(func_name):
     return not func_name.startswith("_") and func_name not in TYPEHINT_NOT_REQUIRED_METHODS
 
 
+def is_lint_excluded(func_name):
+    # Methods that implement a known interface and dunder methods other than __init__ are well known protocol
+    # implementation so they are not validated
+    if func_name in LINT_EXCLUSION_METHODS:
+        return True
+    return func_name.startswith("_") and func_name not in VALIDATION_REQUIRED_DUNDER
+
+
 class FunctionNode(NodeEntityBase):
     """Function node class represents parsed function signature.
     Keyword args will be parsed and added to signature if docstring is available.
@@ -54,6 +65,10 @@ class FunctionNode(NodeEntityBase):
         self.annotations = []
         self.args = []
         self.return_type = None
+        # Return type found in type hint. Lint rules compare it with return type in docstring
+        self.typehint_return_type = None
+        # Diagnostics of lint rules as (rule name, target ID, message). These are set by Linter after inspection
+        self.diagnostics = []
         self.namespace_id = self.generate_id()
         # Set name space level ID as full name
         # Name space ID will be later updated for async methods
@@ -68,9 +83,18 @@ class FunctionNode(NodeEntityBase):
 
     def _inspect(self):
         logging.debug("Processing function {0}".format(self.name))
-        code = inspect.getsource(self.obj).strip()
-        # We cannot do "startswith" check here due to annotations or decorators present for functions
-        self.is_async = "async def" in code
+        if is_ast_node(self.obj):
+            self._inspect_static()
+            return
+
+        # Find async status and decorators from source file parsed once for all functions in the file
+        func_node = get_source_index().get_function_node(self.obj)
+        if func_node:
+            self.is_async = isinstance(func_node, ast.AsyncFunctionDef)
+        else:
+            code = inspect.getsource(self.obj).strip()
+            # We cannot do "startswith" check here due to annotations or decorators present for functions
+            self.is_async = "async def" in code
         self.def_key = "async def" if self.is_async else "def"
         # Update namespace ID to reflect async status. Otherwise ID will conflict between sync and async methods
         if self.is_async:
@@ -78,13 +102,16 @@ class FunctionNode(NodeEntityBase):
 
         # Find decorators and any annotations
         try:
-            node = astroid.extract_node(inspect.getsource(self.obj))
-            if node.decorators:
-                self.annotations = [
-                    "@{}".format(x.name)
-                    for x in node.decorators.nodes
-                    if hasattr(x, "name")
-                ]
+            if func_node:
+                self.annotations = ["@{}".format(x) for x in get_decorator_names(func_node)]
+            else:
+                node = astroid.extract_node(inspect.getsource(self.obj))
+                if node.decorators:
+                    self.annotations = [
+                        "@{}".format(x.name)
+                        for x in node.decorators.nodes
+                        if hasattr(x, "name")
+                    ]
         except:
             # todo Update exception details in error
             error_message = "Error in parsing decorators for function {}".format(
@@ -97,6 +124,25 @@ class FunctionNode(NodeEntityBase):
         self._parse_function()
 
 
+    def _inspect_static(self):
+        # Function is an astroid node parsed from source in static mode. Async status and
+        # decorators are available directly in parsed node
+        self.is_async = isinstance(self.obj, astroid.nodes.AsyncFunctionDef)
+        self.def_key = "async def" if self.is_async else "def"
+        if self.is_async:
+            self.namespace_id += ":async"
+
+        if self.obj.decorators:
+            self.annotations = [
+                "@{}".format(x.name)
+                for x in self.obj.decorators.nodes
+                if hasattr(x, "name")
+            ]
+
+        self.is_class_method = "@classmethod" in self.annotations
+        self._parse_function()
+
+
     def _parse_function(self):
         """
         Find positional and keyword arguements, type and default value and return type of method
@@ -110,12 +156,25 @@ class FunctionNode(NodeEntityBase):
         if "@classmethod" in self.annotations:
             self.args.append(ArgType("cls"))
 
-        # Find signature to find positional args and return type
-        sig = inspect.signature(self.obj)
-        params = sig.parameters
         # Add all keyword only args here temporarily until docstring is parsed
         # This is to handle the scenario is keyword arg typehint (py3 style is present in signature itself)
         self.kw_args = []
+        if is_ast_node(self.obj):
+            self._parse_static_signature()
+        else:
+            self._parse_signature()
+
+        # parse docstring
+        self._parse_docstring()
+        # parse type hints
+        self._parse_typehint()
+        self._copy_kw_args()
+
+
+    def _parse_signature(self):
+        # Find signature to find positional args and return type
+        sig = inspect.signature(self.obj)
+        params = sig.parameters
         for argname in params:
             arg = ArgType(argname, get_qualified_name(params[argname].annotation, self.namespace), "", self)
             # set default value if available
@@ -133,16 +192,38 @@ class FunctionNode(NodeEntityBase):
         if sig.return_annotation:
             self.return_type = get_qualified_name(sig.return_annotation, self.namespace)
 
-        # parse docstring
-        self._parse_docstring()
-        # parse type hints
-        self._parse_typehint()
-        self._copy_kw_args()
 
-        if not self.return_type and is_typehint_mandatory(self.name):
-            self.add_error("Return type is missing in both typehint and docstring")
-        # Validate return type
-        self._validate_pageable_api()
+    def _parse_static_signature(self):
+        # Find positional args, keyword only args and return type from arguments node parsed from source
+        arguments = self.obj.args
+        pos_args = list(arguments.posonlyargs) + list(arguments.args)
+        pos_annotations = list(arguments.posonlyargs_annotations) + list(arguments.annotations)
+        # Default values are aligned to the last positional args
+        pos_defaults = [None] * (len(pos_args) - len(arguments.defaults)) + list(arguments.defaults)
+        # Signature of a bound class method doesn't include cls. It is already added as first arg
+        if self.is_class_method:
+            pos_args, pos_annotations, pos_defaults = pos_args[1:], pos_annotations[1:], pos_defaults[1:]
+
+        for arg, annotation, default in zip(pos_args, pos_annotations, pos_defaults):
+            self.args.append(self._create_static_arg(arg.name, annotation, default))
+        if arguments.vararg:
+            self.args.append(self._create_static_arg(arguments.vararg, arguments.varargannotation))
+        for arg, annotation, default in zip(
+            arguments.kwonlyargs, arguments.kwonlyargs_annotations, arguments.kw_defaults
+        ):
+            self.kw_args.append(self._create_static_arg(arg.name, annotation, default))
+        if arguments.kwarg:
+            self.args.append(self._create_static_arg(KW_ARG_NAME, arguments.kwargannotation))
+
+        if self.obj.returns:
+            self.return_type = get_static_qualified_name(self.obj.returns, self.namespace)
+
+
+    def _create_static_arg(self, argname, annotation, default=None):
+        arg = ArgType(argname, get_static_qualified_name(annotation, self.namespace), "", self)
+        if default is not None:
+            arg.default = str(default.value) if isinstance(default, astroid.nodes.Const) else default.as_string()
+        return arg
 
 
     def _copy_kw_args(self):
@@ -164,24 +245,14 @@ class FunctionNode(NodeEntityBase):
                 self.args.remove(kw_arg)
                 self.args.append(kw_arg)
 
-        # API must have **kwargs for non async methods. Flag it as an error if it is missing for public API
-        if not kwargs and is_kwarg_mandatory(self.name):
-            self.errors.append("Keyword arg (**kwargs) is missing in method {}".format(self.name))
-
 
     def _parse_docstring(self):
         # Parse docstring to get list of keyword args, type and default value for both positional and
         # kw args and return type( if not already found in signature)
-        docstring = ""
-        if hasattr(self.obj, "__doc__"):
-            docstring = getattr(self.obj, "__doc__")
+        docstring = get_docstring(self.obj)
         # Refer docstring at class if this is constructor and docstring is missing for __init__
-        if (
-            not docstring
-            and self.name == "__init__"
-            and hasattr(self.parent_node.obj, "__doc__")
-        ):
-            docstring = getattr(self.parent_node.obj, "__doc__")
+        if not docstring and self.name == "__init__":
+            docstring = get_docstring(self.parent_node.obj)
 
         if docstring:
             #  Parse doc string to find missing types, kwargs and return type
@@ -206,13 +277,6 @@ class FunctionNode(NodeEntityBase):
             self.kw_args.extend(parsed_docstring.kw_args)            
 
 
-    def _generate_short_type(self, long_type):
-        short_type = long_type
-        groups = re.findall(REGEX_FIND_LONG_TYPE, short_type)
-        for g in groups:
-            short_type = short_type.replace(g[0], g[1])
-        return short_type
-
     def _parse_typehint(self):
 
         # Skip parsing typehint if typehint is not expected for e.g dunder or async methods
@@ -222,30 +286,47 @@ class FunctionNode(NodeEntityBase):
 
         # Parse type hint to get return type and types for positional args
         typehint_parser = TypeHintParser(self.obj)
-        # Find return type from type hint if return type is not already set
-        type_hint_ret_type = typehint_parser.find_return_type()
-        # Type hint must be present for all APIs. Flag it as an error if typehint is missing
-        if  not type_hint_ret_type:
-            if (is_typehint_mandatory(self.name)):
-                self.add_error("Typehint is missing for method {}".format(self.name))
-            return
-
+        # Find return type from type hint. It is verified against return type in docstring by lint rules
+        self.typehint_return_type = typehint_parser.find_return_type()
         if not self.return_type:
-            self.return_type = type_hint_ret_type
-        else:
-            # Verify return type is same in docstring and typehint if typehint is available
-            short_return_type = self._generate_short_type(self.return_type)
-            long_ret_type = self.return_type
-            if long_ret_type != type_hint_ret_type and short_return_type != type_hint_ret_type:
-                logging.info("Long type: {0}, Short type: {1}, Type hint return type: {2}".format(long_ret_type, short_return_type, type_hint_ret_type))
-                error_message = "Return type in type hint is not matching return type in docstring"
-                self.add_error(error_message)
+            self.return_type = self.typehint_return_type
+
+
+    def get_signature(self):
+        # async keyword and async variant of decorators, for e.g. @distributed_trace_async, are not part of signature
+        # so same method in sync and async class have same signature
+        return (
+            "def",
+            self.name,
+            tuple(
+                x[:-len(ASYNC_DECORATOR_SUFFIX)] if x.endswith(ASYNC_DECORATOR_SUFFIX) else x
+                for x in self.annotations
+            ),
+            tuple((x.argname, x.argtype, x.default) for x in self.args),
+            self.return_type,
+            self.hidden,
+            tuple(self.errors),
+        )
+
+
+    def use_multi_line(self):
+        """Args are listed in individual lines with their own line IDs if method has more than 2 args
+        """
+        return len(self.args) > 2
+
+
+    def get_return_type_id(self):
+        """Returns ID of the line where return type is listed
+        """
+        if self.use_multi_line():
+            return "{}.returntype".format(self.namespace_id)
+        return self.namespace_id
 
 
     def _generate_signature_token(self, apiview):
         apiview.add_punctuation("(")
         args_count = len(self.args)
-        use_multi_line = args_count > 2
+        use_multi_line = self.use_multi_line()
         # Show args in individual line if method has more than 4 args and use two tabs to properly aign them
         if use_multi_line:
             apiview.begin_group()
@@ -301,44 +382,21 @@ class FunctionNode(NodeEntityBase):
         if self.return_type:
             apiview.add_punctuation("->", True, True)
             # Add line marker id if signature is displayed in multi lines
-            if len(self.args) > 2:
-                line_id = "{}.returntype".format(self.namespace_id)
-                apiview.add_line_marker(line_id)
+            if self.use_multi_line():
+                apiview.add_line_marker(self.get_return_type_id())
             apiview.add_type(self.return_type)
 
-        if self.errors:
-            for e in self.errors:
-                apiview.add_diagnostic(e, self.namespace_id)
-
 
     def add_error(self, error_msg):
-        # Ignore errors for lint check excluded methods
-        if self.name in LINT_EXCLUSION_METHODS:
-            return
-
-        # Hide all diagnostics for now for dunder methods
-        # These are well known protocol implementation
-        if not self.name.startswith("_") or self.name in VALIDATION_REQUIRED_DUNDER:
+        # Ignore errors for lint check excluded methods and dunder methods
+        if not is_lint_excluded(self.name):
             self.errors.append(error_msg)
 
 
-    def _validate_pageable_api(self):
-        # If api name starts with "list" and if annotated with "@distributed_trace"
-        # then this method should return ItemPaged or AsyncItemPaged
-        if self.return_type and self.name.startswith("list") and  "@distributed_trace" in self.annotations:
-            tokens = re.search(REGEX_ITEM_PAGED, self.return_type)
-            if tokens:
-                ret_short_type = tokens.groups()[-1]
-                if ret_short_type in PAGED_TYPES:
-                    logging.debug("list API returns valid paged return type")
-                    return
-            error_msg = "list API {0} should return ItemPaged or AsyncItemPaged instead of {1} and page type must be included in docstring rtype".format(self.name, self.return_type)
-            logging.error(error_msg)
-            self.add_error(error_msg)                
-        
-
     def print_errors(self):
-        if self.errors:
+        if self.errors or self.diagnostics:
             print("  method: {}".format(self.name))
             for e in self.errors:
                 print("      {}".format(e))
+            for _, _, e in self.diagnostics:
+                print("      {}".format(e))
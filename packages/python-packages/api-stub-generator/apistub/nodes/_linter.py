@@ -0,0 +1,247 @@
+import logging
+import re
+import time
+
+from ._argtype import TYPE_NOT_REQUIRED
+from ._class_node import ClassNode
+from ._function_node import FunctionNode, KW_ARG_NAME, is_kwarg_mandatory, is_lint_excluded, is_typehint_mandatory
+from apistub._apiview import is_valid_type_name, tokenize_type_name
+from apistub._token_kind import TokenKind
+from apistub._version import VERSION
+
+# Lint warnings
+TYPE_NOT_AVAILABLE = "Type is not available for {0}"
+TYPEHINT_MISSING = "Typehint is missing for method {0}"
+RETURN_TYPE_MISMATCH = "Return type in type hint is not matching return type in docstring"
+KWARGS_MISSING = "Keyword arg (**kwargs) is missing in method {0}"
+RETURN_TYPE_MISSING = "Return type is missing in both typehint and docstring"
+PAGED_RETURN_TYPE_MISSING = "list API {0} should return ItemPaged or AsyncItemPaged instead of {1} and page type must be included in docstring rtype"
+SOURCE_LINK_NOT_AVAILABLE = "Source definition link is not available for [{0}]. Please check and ensure type is fully qualified name in docstring"
+
+REGEX_ITEM_PAGED = "~[\w.]*\.([\w]*)\s?[\[\(][^\n]*[\]\)]"
+PAGED_TYPES = ["ItemPaged", "AsyncItemPaged",]
+# Find types like ~azure.core.paging.ItemPaged and group returns ItemPaged.
+# Regex is used to find shorten such instances in complex type
+# for e,g, ~azure.core.ItemPaged.ItemPaged[~azure.communication.chat.ChatThreadInfo] to ItemPaged[ChatThreadInfo]
+REGEX_FIND_LONG_TYPE = "((?:~?)[\w.]+\.+([\w]+))"
+
+
+def get_short_type(long_type):
+    short_type = long_type
+    groups = re.findall(REGEX_FIND_LONG_TYPE, short_type)
+    for g in groups:
+        short_type = short_type.replace(g[0], g[1])
+    return short_type
+
+
+def check_arg_types(function_node, nodeindex):
+    # Type must be available for all args except self, cls and **kwargs
+    add_line_marker = function_node.use_multi_line()
+    return [
+        (x.get_id(function_node.namespace_id, add_line_marker), TYPE_NOT_AVAILABLE.format(x.argname))
+        for x in function_node.args
+        if not x.argtype and x.argname not in TYPE_NOT_REQUIRED
+    ]
+
+
+def check_typehint(function_node, nodeindex):
+    # Type hint must be present for all APIs. Type hint is not parsed for async methods
+    name = function_node.name
+    if function_node.is_async or function_node.typehint_return_type or is_lint_excluded(name):
+        return []
+    if not is_typehint_mandatory(name):
+        return []
+    return [(function_node.namespace_id, TYPEHINT_MISSING.format(name))]
+
+
+def check_return_type_mismatch(function_node, nodeindex):
+    # Return type in docstring must be same as type hint if both are available
+    typehint_return_type = function_node.typehint_return_type
+    if not typehint_return_type or is_lint_excluded(function_node.name):
+        return []
+    return_type = function_node.return_type
+    short_return_type = get_short_type(return_type)
+    if return_type == typehint_return_type or short_return_type == typehint_return_type:
+        return []
+    logging.info(
+        "Long type: {0}, Short type: {1}, Type hint return type: {2}".format(
+            return_type, short_return_type, typehint_return_type
+        )
+    )
+    return [(function_node.namespace_id, RETURN_TYPE_MISMATCH)]
+
+
+def check_kwargs(function_node, nodeindex):
+    # API must have **kwargs for non async methods
+    name = function_node.name
+    if not is_kwarg_mandatory(name) or any(x.argname == KW_ARG_NAME for x in function_node.args):
+        return []
+    return [(function_node.namespace_id, KWARGS_MISSING.format(name))]
+
+
+def check_return_type(function_node, nodeindex):
+    name = function_node.name
+    if function_node.return_type or not is_typehint_mandatory(name) or is_lint_excluded(name):
+        return []
+    return [(function_node.namespace_id, RETURN_TYPE_MISSING)]
+
+
+def check_paged_return_type(function_node, nodeindex):
+    # If api name starts with "list" and if annotated with "@distributed_trace"
+    # then this method should return ItemPaged or AsyncItemPaged
+    name = function_node.name
+    return_type = function_node.return_type
+    if not return_type or not name.startswith("list") or "@distributed_trace" not in function_node.annotations:
+        return []
+    if is_lint_excluded(name):
+        return []
+    tokens = re.search(REGEX_ITEM_PAGED, return_type)
+    if tokens and tokens.groups()[-1] in PAGED_TYPES:
+        logging.debug("list API returns valid paged return type")
+        return []
+    error_msg = PAGED_RETURN_TYPE_MISSING.format(name, return_type)
+    logging.error(error_msg)
+    return [(function_node.namespace_id, error_msg)]
+
+
+def check_source_link(function_node, nodeindex):
+    # Types in docstring with ~ prefix are expected to link to their definition
+    add_line_marker = function_node.use_multi_line()
+    diagnostics = []
+    for arg in function_node.args:
+        if arg.argtype:
+            target_id = arg.get_id(function_node.namespace_id, add_line_marker)
+            diagnostics.extend(_check_type_links(arg.argtype, target_id, nodeindex))
+    if function_node.return_type:
+        diagnostics.extend(
+            _check_type_links(function_node.return_type, function_node.get_return_type_id(), nodeindex)
+        )
+    return diagnostics
+
+
+def _check_type_links(type_name, target_id, nodeindex):
+    for kind, value in tokenize_type_name(type_name.replace(":class:", "")):
+        if kind != TokenKind.TypeName or not value.startswith("~"):
+            continue
+        type_full_name = value[1:]
+        # Check if type name is importable. If type name is incorrect in docstring then it wont be importable
+        # If type name is importable then it's a valid type name. Source link wont be available if type is from
+        # different package
+        if nodeindex.get_id(type_full_name) or is_valid_type_name(type_full_name):
+            continue
+        yield target_id, SOURCE_LINK_NOT_AVAILABLE.format(type_full_name.split(".")[-1])
+
+
+class LintRule:
+    """Lint rule that checks an inspected function node
+    :param str: name
+    :param function: check
+        Returns list of (target ID, message) for a function node and node index
+    :param bool: default
+        Rule is enabled unless it is disabled
+    :param bool: uses_index
+        Rule resolves type names using node index of all modules. It is run after all modules are inspected
+        instead of in the worker process that inspected the module
+    """
+
+    def __init__(self, name, check, default=True, uses_index=False):
+        self.name = name
+        self.check = check
+        self.default = default
+        self.uses_index = uses_index
+
+
+# Rules are run in this order
+LINT_RULES = [
+    LintRule("missing-arg-type", check_arg_types),
+    LintRule("missing-typehint", check_typehint),
+    LintRule("return-type-mismatch", check_return_type_mismatch),
+    LintRule("missing-kwargs", check_kwargs),
+    LintRule("missing-return-type", check_return_type),
+    LintRule("paged-return-type", check_paged_return_type),
+    LintRule("source-link", check_source_link, default=False, uses_index=True),
+]
+LINT_RULE_NAMES = [x.name for x in LINT_RULES]
+
+
+def get_lint_rule_names(enable=None, disable=None):
+    """Returns names of rules that are enabled by default or enabled explicitly and not disabled
+    """
+    enable = enable or []
+    disable = disable or []
+    return [x.name for x in LINT_RULES if (x.default or x.name in enable) and x.name not in disable]
+
+
+def get_function_nodes(module_node):
+    """Returns module level functions and methods of classes in a module
+    """
+    for c in module_node.child_nodes:
+        if isinstance(c, FunctionNode):
+            yield c
+        elif isinstance(c, ClassNode):
+            for x in c.child_nodes:
+                if isinstance(x, FunctionNode):
+                    yield x
+
+
+def get_module_diagnostics(module_node):
+    """Returns diagnostics of a module as (rule name, target ID, message) in the order functions are listed in API
+    view. Errors found while inspecting a function are returned with rule name None
+    """
+    functions = [x for x in module_node.child_nodes if isinstance(x, FunctionNode)]
+    for class_node in module_node.child_nodes:
+        if isinstance(class_node, ClassNode):
+            functions.extend(class_node.get_listed_members()[1])
+    for function_node in functions:
+        for error in function_node.errors:
+            yield None, function_node.namespace_id, error
+        for diagnostic in function_node.diagnostics:
+            yield diagnostic
+
+
+class Linter:
+    """Runs enabled lint rules on inspected modules. Diagnostics of each function are stored in the function node, so
+    a module can be linted in the worker process that inspected it and diagnostics are added to API view in the order
+    functions are listed. Time spent by each rule is recorded for lint report
+    :param list: rule_names
+    """
+
+    def __init__(self, rule_names):
+        self.rules = [x for x in LINT_RULES if x.name in rule_names]
+        self.seconds = dict((x.name, 0.0) for x in self.rules)
+
+    def lint(self, module_node, nodeindex=None, uses_index=None):
+        """Run rules on functions of a module. Each rule is run on all functions before next rule so it's time is
+        recorded once per module. Only rules that use node index or only rules that don't use it are run if
+        uses_index is given
+        """
+        function_nodes = list(get_function_nodes(module_node))
+        for rule in self.rules:
+            if uses_index is not None and rule.uses_index != uses_index:
+                continue
+            start = time.perf_counter()
+            for function_node in function_nodes:
+                function_node.diagnostics.extend(
+                    (rule.name, target_id, message) for target_id, message in rule.check(function_node, nodeindex)
+                )
+            self.seconds[rule.name] += time.perf_counter() - start
+
+    def add_seconds(self, seconds):
+        """Add time spent by rules in a worker process
+        """
+        for name, value in seconds.items():
+            self.seconds[name] = self.seconds.get(name, 0.0) + value
+
+    def get_report(self, package_name, module_nodes):
+        """Returns lint report with diagnostics of modules and number of diagnostics and time of each rule
+        """
+        diagnostics = [
+            {"Rule": rule_name, "TargetId": target_id, "Text": message}
+            for module_node in module_nodes
+            for rule_name, target_id, message in get_module_diagnostics(module_node)
+        ]
+        rules = {}
+        for rule in self.rules:
+            count = sum(1 for x in diagnostics if x["Rule"] == rule.name)
+            rules[rule.name] = {"Diagnostics": count, "Seconds": self.seconds[rule.name]}
+        return {"Version": VERSION, "Name": package_name, "Rules": rules, "Diagnostics": diagnostics}
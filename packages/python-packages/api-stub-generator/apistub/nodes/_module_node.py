@@ -5,15 +5,60 @@ import io
 import importlib
 import operator
 
-from ._base_node import NodeEntityBase
+import astroid
+
+from ._base_node import NodeEntityBase, is_ast_node
 from ._class_node import ClassNode
 from ._function_node import FunctionNode
 from apistub import Navigation, Kind, NavigationTag
+from apistub._profiler import get_profiler
 
 filter_function = lambda x: isinstance(x, FunctionNode)
 filter_class = lambda x: isinstance(x, ClassNode)
 
 
+def get_static_public_entities(module):
+    """Find names listed in __all__ of module parsed from source. This includes names added
+       conditionally using __all__.extend, __all__.append and __all__ +=
+    """
+    public_entities = []
+    names_node_types = (astroid.nodes.List, astroid.nodes.Tuple)
+    for node in module.nodes_of_class(
+        (astroid.nodes.Assign, astroid.nodes.AugAssign, astroid.nodes.Call),
+        skip_klass=(astroid.nodes.FunctionDef, astroid.nodes.ClassDef),
+    ):
+        values = []
+        if isinstance(node, astroid.nodes.Assign):
+            if any(getattr(t, "name", None) == "__all__" for t in node.targets):
+                values = [node.value]
+        elif isinstance(node, astroid.nodes.AugAssign):
+            if getattr(node.target, "name", None) == "__all__":
+                values = [node.value]
+        elif (
+            isinstance(node.func, astroid.nodes.Attribute)
+            and node.func.attrname in ("append", "extend")
+            and getattr(node.func.expr, "name", None) == "__all__"
+        ):
+            values = node.args
+
+        for value in values:
+            elements = value.elts if isinstance(value, names_node_types) else [value]
+            public_entities.extend(
+                x.value for x in elements if isinstance(x, astroid.nodes.Const) and isinstance(x.value, str)
+            )
+    return public_entities
+
+
+def get_definition_name(obj):
+    """Returns full name of a class or function using name of module where it is defined
+    """
+    module_name = getattr(obj, "__module__", None)
+    name = getattr(obj, "__qualname__", None) or getattr(obj, "__name__", None)
+    if not isinstance(module_name, str) or not isinstance(name, str):
+        return None
+    return "{0}.{1}".format(module_name, name)
+
+
 class ModuleNode(NodeEntityBase):
     """ModuleNode represents module level node and all it's children
     :param str: namespace
@@ -25,12 +70,18 @@ class ModuleNode(NodeEntityBase):
         super().__init__(namespace, None, module)
         self.namespace_id = self.generate_id()
         self.nodeindex = nodeindex
+        # Name of module where a public class or function is defined to it's key in node index
+        self.aliases = {}
         self.pkg_root_namespace = pkg_root_namespace
         self._inspect()
 
     def _inspect(self):
         """Imports module, identify public entities in module and inspect them recursively
         """
+        if is_ast_node(self.obj):
+            self._inspect_static()
+            return
+
         # Parse public entities only if __all is present. Otherwise all Classes and Functions not starting with "_" can be included.
         public_entities = []
         if hasattr(self.obj, "__all__"):
@@ -42,18 +93,59 @@ class ModuleNode(NodeEntityBase):
                 continue
 
             if inspect.isclass(member_obj):
-                class_node = ClassNode(self.namespace, self, member_obj)
+                with get_profiler().measure("inspect", "{0}.{1}".format(self.namespace, name), "class"):
+                    class_node = ClassNode(self.namespace, self, member_obj)
                 key = "{0}.{1}".format(self.namespace, class_node.name)
-                self.nodeindex.add(key, class_node)
+                self._add_to_index(key, class_node, get_definition_name(member_obj))
                 self.child_nodes.append(class_node)
             elif inspect.isroutine(member_obj):
                 func_node = FunctionNode(self.namespace, self, member_obj, True)
                 key = "{0}.{1}".format(self.namespace, func_node.name)
-                self.nodeindex.add(key, func_node)
+                self._add_to_index(key, func_node, get_definition_name(member_obj))
+                self.child_nodes.append(func_node)
+            else:
+                logging.debug("Skipping unknown type member in module: {}".format(name))
+
+    def _inspect_static(self):
+        """Identify public entities in module parsed from source and inspect them recursively
+        """
+        public_entities = get_static_public_entities(self.obj)
+
+        for name in sorted(self.obj.locals):
+            # Resolve imported names to the class or function node where it is defined.
+            # Last inferred value is the actual definition if name is overloaded
+            try:
+                member_obj = list(self.obj.igetattr(name))[-1]
+            except (astroid.InferenceError, IndexError):
+                member_obj = astroid.Uninferable
+            if member_obj is astroid.Uninferable:
+                logging.debug("Failed to resolve member in module: {}".format(name))
+                continue
+
+            if self._should_skip_parsing(name, member_obj, public_entities):
+                continue
+
+            if isinstance(member_obj, astroid.nodes.ClassDef):
+                with get_profiler().measure("inspect", "{0}.{1}".format(self.namespace, name), "class"):
+                    class_node = ClassNode(self.namespace, self, member_obj)
+                key = "{0}.{1}".format(self.namespace, class_node.name)
+                self._add_to_index(key, class_node, member_obj.qname())
+                self.child_nodes.append(class_node)
+            elif isinstance(member_obj, astroid.nodes.FunctionDef):
+                func_node = FunctionNode(self.namespace, self, member_obj, True)
+                key = "{0}.{1}".format(self.namespace, func_node.name)
+                self._add_to_index(key, func_node, member_obj.qname())
                 self.child_nodes.append(func_node)
             else:
                 logging.debug("Skipping unknown type member in module: {}".format(name))
 
+    def _add_to_index(self, key, node, definition_name):
+        self.nodeindex.add(key, node)
+        # Name of module where it's defined is added as an alias if class or function is re-exported
+        if definition_name and definition_name != key:
+            self.aliases[definition_name] = key
+            self.nodeindex.add_alias(definition_name, key)
+
     def _should_skip_parsing(self, name, member_obj, public_entities):
         # If module has list of published entities ( __all__) then include only those members
         if public_entities and name not in public_entities:
@@ -68,6 +160,8 @@ class ModuleNode(NodeEntityBase):
             return True
 
         # Skip any member in module level that is defined in external or built in package
+        if is_ast_node(member_obj):
+            return not member_obj.root().name.startswith(self.pkg_root_namespace)
         if hasattr(member_obj, "__module__"):
             return not getattr(member_obj, "__module__").startswith(self.pkg_root_namespace)
         # Don't skip member if module name is not available. This is just to be on safer side
@@ -1,7 +1,22 @@
-from ._base_node import NodeEntityBase
+import astroid
+
+from ._base_node import NodeEntityBase, get_docstring, is_ast_node
 from ._docstring_parser import DocstringParser, TypeHintParser
 
 
+def has_property_setter(getter_node, name):
+    """Returns True if class of a property getter parsed from source also defines a setter for it
+    """
+    for node in getter_node.parent.locals.get(name, []):
+        decorators = getattr(node, "decorators", None)
+        if decorators and any(
+            isinstance(x, astroid.nodes.Attribute) and x.attrname == "setter"
+            for x in decorators.nodes
+        ):
+            return True
+    return False
+
+
 class PropertyNode(NodeEntityBase):
     """Property node represents property defined in a class
     """
@@ -20,19 +35,25 @@ class PropertyNode(NodeEntityBase):
     def _inspect(self):
         """Identify property name, type and readonly property
         """
-        if getattr(self.obj, "fset"):
-            self.read_only = False
+        # In static mode property is represented by getter function node parsed from source
+        if is_ast_node(self.obj):
+            self.read_only = not has_property_setter(self.obj, self.name)
+            fget = self.obj
+        else:
+            if getattr(self.obj, "fset"):
+                self.read_only = False
+            fget = getattr(self.obj, "fget", None)
 
-        if hasattr(self.obj, "fget"):
+        if fget:
             # Get property type if type hint 
-            typehint_parser = TypeHintParser(getattr(self.obj, "fget"))
+            typehint_parser = TypeHintParser(fget)
             self.type = typehint_parser.find_return_type()
 
         # get type from docstring
-        if hasattr(self.obj, "__doc__") and not self.type:
-            docstring = getattr(self.obj, "__doc__")
+        if not self.type:
+            docstring = get_docstring(self.obj)
             if docstring:
-                docstring_parser = DocstringParser(getattr(self.obj, "__doc__"))
+                docstring_parser = DocstringParser(docstring)
                 try:
                     self.type = docstring_parser.find_type()
                     # Check for rtype docstring
@@ -46,6 +67,9 @@ class PropertyNode(NodeEntityBase):
             self.display_name += "   # Read-only"
 
 
+    def get_signature(self):
+        return ("property", self.name, self.type, self.read_only, tuple(self.errors))
+
     def generate_tokens(self, apiview):
         """Generates token for the node and it's children recursively and add it to apiview
         :param ApiView: apiview
@@ -0,0 +1,137 @@
+import ast
+import inspect
+import logging
+import os
+import tokenize
+
+
+class SourceIndex:
+    """Source index parses each source file only once and maps functions defined in the file to their parsed
+    node. Files are parsed using ast instead of astroid since only decorators, async status and lines of functions
+    are needed and astroid infers and imports modules while building a tree. Parsed files are reused until the file
+    is modified.
+    """
+
+    def __init__(self):
+        self._files = {}
+
+    def get_function_node(self, obj):
+        """Returns ast function node for a function or method object or None if source is not available
+        :param function: obj
+        """
+        _, node = self._find_function(obj)
+        return node
+
+    def get_source(self, obj):
+        """Returns source code of a function or method object or None if source is not available
+        :param function: obj
+        """
+        parsed_file, node = self._find_function(obj)
+        if not node:
+            return None
+        first_line = _get_first_line(node)
+        return "".join(parsed_file.lines[first_line - 1 : _get_last_line(node, parsed_file.lines, first_line)])
+
+    def _find_function(self, obj):
+        location = _get_code_location(obj)
+        if not location:
+            return None, None
+        filename, first_line, name = location
+        parsed_file = self._get_parsed_file(filename)
+        if not parsed_file:
+            return None, None
+        node = parsed_file.functions.get(first_line)
+        if node and node.name == name:
+            return parsed_file, node
+        return None, None
+
+    def clear(self, paths=None):
+        """Removes parsed files. Only files under given directories are removed if paths are given
+        :param list: paths
+        """
+        if paths is None:
+            self._files.clear()
+            return
+        paths = [os.path.join(os.path.abspath(p), "") for p in paths]
+        for filename in list(self._files):
+            if any(os.path.abspath(filename).startswith(p) for p in paths):
+                del self._files[filename]
+
+    def _get_parsed_file(self, filename):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        parsed_file = self._files.get(filename)
+        if parsed_file and parsed_file.mtime == stat.st_mtime and parsed_file.size == stat.st_size:
+            return parsed_file
+
+        logging.debug("Parsing source file {}".format(filename))
+        try:
+            # tokenize.open detects encoding of source file same as python interpreter
+            with tokenize.open(filename) as source_file:
+                lines = source_file.readlines()
+            module = ast.parse("".join(lines), filename)
+        except Exception as e:
+            logging.error("Failed to parse source file {0}: {1}".format(filename, e))
+            return None
+
+        functions = {}
+        for node in ast.walk(module):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions[_get_first_line(node)] = node
+        parsed_file = _ParsedFile(stat.st_mtime, stat.st_size, lines, functions)
+        self._files[filename] = parsed_file
+        return parsed_file
+
+
+class _ParsedFile:
+    def __init__(self, mtime, size, lines, functions):
+        self.mtime = mtime
+        self.size = size
+        self.lines = lines
+        self.functions = functions
+
+
+def _get_first_line(node):
+    # First line of a decorated function is the line of it's first decorator. This is same as co_firstlineno
+    if node.decorator_list:
+        return min(node.lineno, node.decorator_list[0].lineno)
+    return node.lineno
+
+
+def _get_last_line(node, lines, first_line):
+    # End line of nodes is not available before python 3.8. Block is found the same way as inspect.getsource
+    end_line = getattr(node, "end_lineno", None)
+    if end_line:
+        return end_line
+    return first_line - 1 + len(inspect.getblock(lines[first_line - 1 :]))
+
+
+def get_decorator_names(node):
+    """Returns names of decorators of a function node that are referenced by name, for e.g. trace for @trace
+    """
+    return [x.id for x in node.decorator_list if isinstance(x, ast.Name)]
+
+
+def _get_code_location(obj):
+    # Find code object of function the same way as inspect.getsource
+    try:
+        obj = inspect.unwrap(obj)
+    except ValueError:
+        return None
+    if inspect.ismethod(obj):
+        obj = obj.__func__
+    code = getattr(obj, "__code__", None)
+    if not inspect.iscode(code):
+        return None
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+_source_index = SourceIndex()
+
+
+def get_source_index():
+    """Returns source index shared by all nodes in current process
+    """
+    return _source_index
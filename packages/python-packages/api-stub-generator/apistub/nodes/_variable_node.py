@@ -15,6 +15,9 @@ class VariableNode(NodeEntityBase):
         )
         self.value = value
 
+    def get_signature(self):
+        return ("ivar" if self.is_ivar else "cvar", self.name, self.type, self.value, tuple(self.errors))
+
     def generate_tokens(self, apiview):
         """Generates token for the node
         :param ApiView: apiview
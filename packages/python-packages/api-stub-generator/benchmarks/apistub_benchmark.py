@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Measures time and memory of each phase of api stub generation using a synthetic package. Package has N modules
+with M classes each and K methods in each class. Methods have docstrings with params, keywords, types and return types.
+Generated package is same for same sizes so results of different runs can be compared.
+
+    python apistub_benchmark.py --modules 20 --classes 10 --methods 10
+    python apistub_benchmark.py --static --memory --json results.json
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import astroid
+
+from apistub import ApiView, Navigation, NavigationTag, Kind
+from apistub._stub_generator import NodeIndex, StubGenerator, inspect_module, parse_module
+
+PACKAGE_NAME = "azure-apistubbench"
+PACKAGE_VERSION = "1.0.0"
+NAMESPACE = "azure.apistubbench"
+
+SETUP_TEMPLATE = '''
+from setuptools import setup
+setup(name="{0}", version="{1}", packages=["{2}"])
+'''
+
+MODULE_HEADER = '''
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+__all__ = [{0}]
+
+
+class Color{1}(str, Enum):
+    """Color enum {1}"""
+
+    RED = "red"
+    GREEN = "green"
+    BLUE = "blue"
+'''
+
+CLASS_TEMPLATE = '''
+
+class Model{module}x{cls}(object):
+    """Sample model {cls} in module {module}.
+
+    :ivar str name: Name of the model.
+    :ivar int count: Number of items in the model.
+    :ivar parent: Parent model.
+    :vartype parent: ~{namespace}.module{module}.Model{module}x{cls}
+    """
+
+    LIMIT = 10
+
+    def __init__(self, name, **kwargs):
+        # type: (str, Any) -> None
+        self.name = name
+
+    @property
+    def color(self):
+        # type: () -> Color{module}
+        """Color of the model.
+
+        :rtype: ~{namespace}.module{module}.Color{module}
+        """
+        return Color{module}.RED
+'''
+
+METHOD_TEMPLATE = '''
+    def get_item{method}(self, name, value=None, **kwargs):
+        # type: (str, Optional[int], Any) -> List[Model{module}x{cls}]
+        """Gets items matching name.
+
+        :param str name: Name of the item.
+        :param value: Value of the item.
+        :type value: int or None
+        :keyword int timeout: Timeout in seconds.
+        :keyword bool logging_enable: Enable logging of request and response.
+        :keyword headers: Custom headers to send.
+        :paramtype headers: dict[str, str]
+        :keyword parent: Parent of the item.
+        :paramtype parent: ~{namespace}.module{module}.Model{module}x{cls}
+        :return: List of items.
+        :rtype: list[~{namespace}.module{module}.Model{module}x{cls}]
+        """
+        return []
+
+    async def get_item{method}_async(self, name, **kwargs) -> Dict[str, "Model{module}x{cls}"]:
+        """Gets items matching name asynchronously.
+
+        :param str name: Name of the item.
+        :keyword int timeout: Timeout in seconds.
+        :rtype: dict[str, ~{namespace}.module{module}.Model{module}x{cls}]
+        """
+        return {{}}
+'''
+
+# Type strings found in docstrings and type hints of azure packages
+TYPE_NAMES = [
+    "str",
+    "~azure.core.paging.ItemPaged[~azure.apistubbench.module0.Model0x0]",
+    "Optional[Dict[str, ~azure.apistubbench.module0.Color0]]",
+    "list[str] or list[~azure.apistubbench.module0.Model0x0] or None",
+    "~azure.core.polling.LROPoller[None]",
+]
+
+
+def generate_package(root, modules, classes, methods):
+    """Writes source of synthetic package into root directory and returns package root path
+    """
+    pkg_root_path = os.path.join(root, PACKAGE_NAME)
+    namespace_path = os.path.join(pkg_root_path, *NAMESPACE.split("."))
+    os.makedirs(namespace_path)
+    with io.open(os.path.join(pkg_root_path, "setup.py"), "w") as setup_file:
+        setup_file.write(SETUP_TEMPLATE.format(PACKAGE_NAME, PACKAGE_VERSION, NAMESPACE))
+    with io.open(os.path.join(pkg_root_path, "azure", "__init__.py"), "w") as init_file:
+        init_file.write("")
+
+    public_names = []
+    for module in range(modules):
+        class_names = ["Model{0}x{1}".format(module, cls) for cls in range(classes)]
+        names = ["Color{}".format(module)] + class_names
+        public_names.extend((module, name) for name in names)
+        content = [MODULE_HEADER.format(", ".join('"{}"'.format(x) for x in names), module)]
+        for cls in range(classes):
+            content.append(CLASS_TEMPLATE.format(module=module, cls=cls, namespace=NAMESPACE))
+            for method in range(methods):
+                content.append(METHOD_TEMPLATE.format(module=module, cls=cls, method=method, namespace=NAMESPACE))
+        with io.open(os.path.join(namespace_path, "module{}.py".format(module)), "w") as module_file:
+            module_file.write("".join(content))
+
+    # Package root module exports all classes as azure packages do
+    with io.open(os.path.join(namespace_path, "__init__.py"), "w") as init_file:
+        for module, name in public_names:
+            init_file.write("from .module{0} import {1}\n".format(module, name))
+        init_file.write("\n__all__ = [{}]\n".format(", ".join('"{}"'.format(x[1]) for x in public_names)))
+    return pkg_root_path
+
+
+class PhaseRecorder:
+    """Records wall time and optionally peak traced memory of each phase
+    """
+
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.results = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = None
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            self.results.append({"phase": name, "seconds": elapsed, "peak_memory": peak})
+
+    def print_report(self):
+        row_format = "{:<20}{:>12}{:>14}"
+        print(row_format.format("phase", "time (s)", "peak (MB)"))
+        for result in self.results:
+            peak = result["peak_memory"]
+            print(row_format.format(
+                result["phase"],
+                "{:.3f}".format(result["seconds"]),
+                "{:.1f}".format(peak / (1024 * 1024)) if peak is not None else "-",
+            ))
+
+
+def generate_tokens(module_nodes, nodeindex):
+    # Same as token generation in StubGenerator._generate_tokens
+    apiview = ApiView(nodeindex, PACKAGE_NAME, PACKAGE_VERSION, NAMESPACE)
+    navigation = Navigation(PACKAGE_NAME, None)
+    navigation.set_tag(NavigationTag(Kind.type_package))
+    apiview.add_navigation(navigation)
+    for module_node in module_nodes:
+        module_node.generate_tokens(apiview)
+        module_nav = module_node.get_navigation()
+        if module_nav:
+            navigation.add_child(module_nav)
+    return apiview
+
+
+def add_types(nodeindex, count):
+    apiview = ApiView(nodeindex, PACKAGE_NAME, PACKAGE_VERSION, NAMESPACE)
+    for _ in range(count):
+        for type_name in TYPE_NAMES:
+            apiview.add_type(type_name)
+    return apiview
+
+
+def run_benchmark(args, pkg_root_path):
+    recorder = PhaseRecorder(args.memory)
+    stub_generator = StubGenerator(
+        ["--pkg-path", pkg_root_path, "--hide-report"] + (["--static"] if args.static else [])
+    )
+    modules = [m for m in stub_generator._find_modules(pkg_root_path) if m.startswith(NAMESPACE)]
+
+    sys.path.insert(0, pkg_root_path)
+    try:
+        # Modules are imported or parsed once. Following phases use imported modules or cached astroid trees
+        with recorder.phase("import"):
+            for m in modules:
+                if args.static:
+                    parse_module(pkg_root_path, m)
+                else:
+                    importlib.import_module(m)
+
+        nodeindex = NodeIndex()
+        with recorder.phase("inspect"):
+            module_nodes = [inspect_module(pkg_root_path, m, NAMESPACE, args.static, nodeindex) for m in modules]
+
+        with recorder.phase("tokens"):
+            apiview = generate_tokens(module_nodes, nodeindex)
+
+        with recorder.phase("serialize"):
+            json_tokens = stub_generator.serialize(apiview)
+
+        with recorder.phase("add_type"):
+            add_types(nodeindex, args.types)
+
+        with recorder.phase("generate_tokens"):
+            stub_generator._generate_tokens(pkg_root_path, PACKAGE_NAME, PACKAGE_VERSION, NAMESPACE)
+    finally:
+        sys.path.remove(pkg_root_path)
+
+    print("Modules: {0}, classes: {1}, methods: {2}, tokens: {3}, token file size: {4:.1f} MB".format(
+        len(modules),
+        args.modules * args.classes,
+        args.modules * args.classes * args.methods * 2,
+        len(apiview.Tokens),
+        len(json_tokens) / (1024 * 1024),
+    ))
+    recorder.print_report()
+    return recorder.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark api stub generator phases using a synthetic package")
+    parser.add_argument("--modules", type=int, default=10, help="Number of modules in package")
+    parser.add_argument("--classes", type=int, default=10, help="Number of classes in each module")
+    parser.add_argument("--methods", type=int, default=10, help="Number of sync and async method pairs in each class")
+    parser.add_argument("--types", type=int, default=20000, help="Number of times type names are added in add_type phase")
+    parser.add_argument("--static", default=False, action="store_true", help="Parse package without importing it")
+    parser.add_argument(
+        "--memory", default=False, action="store_true", help="Trace peak memory of each phase. This slows down each phase"
+    )
+    parser.add_argument("--json", help="Write results into a json file to compare with other runs")
+    parser.add_argument("--keep", help="Generate package in this directory and keep it")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    root = args.keep or tempfile.mkdtemp()
+    try:
+        pkg_root_path = os.path.join(root, PACKAGE_NAME)
+        if os.path.exists(pkg_root_path):
+            shutil.rmtree(pkg_root_path)
+        pkg_root_path = generate_package(root, args.modules, args.classes, args.methods)
+        results = run_benchmark(args, pkg_root_path)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root)
+        astroid.MANAGER.clear_cache()
+
+    if args.json:
+        with io.open(args.json, "w") as json_file:
+            json.dump({"options": vars(args), "results": results}, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Measures inspection and token generation time of classes with increasing number of members. Time per member
+should stay about the same as class size grows, for e.g. for enum like classes with thousands of constants.
+
+    python class_node_benchmark.py --sizes 1000 2000 4000 8000
+    python class_node_benchmark.py --static
+"""
+
+import argparse
+import linecache
+import logging
+import time
+import types
+
+import astroid
+
+from apistub import ApiView
+from apistub._stub_generator import NodeIndex
+from apistub.nodes import ClassNode
+
+NAMESPACE = "azure.classbench"
+
+
+def create_class_source(size):
+    """Returns source of a class with size constants, one tenth of them documented as ivars, and size / 10 methods
+    """
+    lines = ["class LargeClass(object):", '    """Class with many members', ""]
+    lines.extend("    :ivar str VALUE_{0}: Value {0}".format(i) for i in range(0, size, 10))
+    lines.append('    """')
+    lines.extend('    VALUE_{0} = "value_{0}"'.format(i) for i in range(size))
+    for i in range(size // 10):
+        lines.append("    def get_value_{}(self, name, **kwargs):".format(i))
+        lines.append("        # type: (str, Any) -> str")
+        lines.append("        pass")
+    return "\n".join(lines) + "\n"
+
+
+def load_class(source, static):
+    if static:
+        module = astroid.parse(source, module_name=NAMESPACE)
+        return module.body[0]
+    # Source of functions is read using linecache
+    file_name = "<{}>".format(NAMESPACE)
+    linecache.cache[file_name] = (len(source), None, source.splitlines(True), file_name)
+    module = types.ModuleType(NAMESPACE)
+    exec(compile(source, file_name, "exec"), module.__dict__)
+    return module.LargeClass
+
+
+def run(size, static):
+    obj = load_class(create_class_source(size), static)
+    parent = types.SimpleNamespace(namespace_id=NAMESPACE, namespace=NAMESPACE)
+    start = time.perf_counter()
+    class_node = ClassNode(NAMESPACE, parent, obj)
+    inspect_time = time.perf_counter() - start
+
+    apiview = ApiView(NodeIndex(), "azure-classbench", "1.0.0", NAMESPACE)
+    start = time.perf_counter()
+    class_node.generate_tokens(apiview)
+    tokens_time = time.perf_counter() - start
+    return len(class_node.child_nodes), inspect_time, tokens_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inspection of classes with many members")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--static", default=False, action="store_true", help="Parse class without importing it")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.CRITICAL)
+    # Warm up caches of docstring and type parsers
+    run(min(args.sizes), args.static)
+
+    row_format = "{:>8}{:>10}{:>14}{:>14}{:>18}"
+    print(row_format.format("size", "members", "inspect (s)", "tokens (s)", "per member (us)"))
+    for size in args.sizes:
+        members, inspect_time, tokens_time = run(size, args.static)
+        print(row_format.format(
+            size,
+            members,
+            "{:.3f}".format(inspect_time),
+            "{:.3f}".format(tokens_time),
+            "{:.1f}".format((inspect_time + tokens_time) * 1000000 / members),
+        ))
+
+
+if __name__ == "__main__":
+    main()
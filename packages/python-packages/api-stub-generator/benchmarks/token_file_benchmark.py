@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Compares size, encode and decode time of token file formats. Encode time includes serializing API view into json
+since compact formats are created from json tokens. Decode time is the time to load a token file as dictionary.
+
+    python token_file_benchmark.py azure-core_python.json --repeat 5
+"""
+
+import argparse
+import os
+import time
+
+from apistub import load_apiview
+from apistub._apiview import APIViewEncoder
+from apistub._token_file import TOKEN_FILE_FORMATS, decode_token_file, encode_token_file
+
+
+def measure(function, repeat):
+    """Returns result of function and best time of repeated runs
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token file formats")
+    parser.add_argument("token_files", nargs="+", help="Token files in any format")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    row_format = "{:>30}{:>8}{:>12}{:>8}{:>14}{:>14}"
+    print(row_format.format("token file", "format", "size (KB)", "ratio", "encode (ms)", "decode (ms)"))
+    for token_file_path in args.token_files:
+        apiview = load_apiview(token_file_path)
+        json_size = None
+        for token_file_format in TOKEN_FILE_FORMATS:
+            content, encode_time = measure(
+                lambda: encode_token_file(APIViewEncoder().encode(apiview), token_file_format), args.repeat
+            )
+            _, decode_time = measure(lambda: decode_token_file(content), args.repeat)
+            json_size = json_size or len(content)
+            print(row_format.format(
+                os.path.basename(token_file_path)[-30:],
+                token_file_format,
+                "{:.1f}".format(len(content) / 1024),
+                "{:.3f}".format(len(content) / json_size),
+                "{:.1f}".format(encode_time * 1000),
+                "{:.1f}".format(decode_time * 1000),
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Compares memory usage and encode time of TokenStore with a list of token objects as it was stored
+before TokenStore. Tokens are replayed from an existing token file or generated synthetically.
+
+    python token_store_benchmark.py --token-file azure-mgmt-compute_python.json
+    python token_store_benchmark.py --tokens 2000000
+"""
+
+import argparse
+import gc
+import io
+import json
+import time
+import tracemalloc
+from json import JSONEncoder
+
+from apistub import Token, TokenKind
+from apistub._token import TokenStore
+
+
+class DictToken:
+    """Token object with instance dict. This is how tokens were stored before TokenStore"""
+
+    def __init__(self, value="", kind=TokenKind.Text):
+        self.Kind = kind
+        self.DefinitionId = None
+        self.NavigateToId = None
+        self.Value = value
+
+
+class DictTokenEncoder(JSONEncoder):
+    """Encoder that serializes tokens using instance dict of each token. Dict is copied so tokens can be
+    encoded more than once"""
+
+    def default(self, obj):
+        if isinstance(obj, DictToken):
+            obj_dict = dict(obj.__dict__)
+            if not obj.DefinitionId:
+                del obj_dict["DefinitionId"]
+            if not obj.NavigateToId:
+                del obj_dict["NavigateToId"]
+            return obj_dict
+        if isinstance(obj, TokenKind):
+            return obj.value
+        return JSONEncoder.default(self, obj)
+
+
+def load_token_fields(token_file):
+    with io.open(token_file, "r", encoding="utf-8") as json_file:
+        tokens = json.load(json_file)["Tokens"]
+    return [
+        (TokenKind(t["Kind"]), t["Value"], t.get("DefinitionId"), t.get("NavigateToId"))
+        for t in tokens
+    ]
+
+
+def generate_token_fields(count):
+    # Token pattern of a method signature line with one typed argument
+    fields = []
+    index = 0
+    while len(fields) < count:
+        method_id = "azure.sample.models.SampleModel{0}.method{1}".format(index // 20, index % 20)
+        type_id = "azure.sample.models.SampleType{}".format(index % 50)
+        fields.extend([
+            (TokenKind.Text, "        ", None, None),
+            (TokenKind.LineIdMarker, "", method_id, None),
+            (TokenKind.Keyword, "def", None, None),
+            (TokenKind.Whitespace, " ", None, None),
+            (TokenKind.Text, "method{}".format(index % 20), method_id, None),
+            (TokenKind.Punctuation, "(", None, None),
+            (TokenKind.Text, "value", method_id, None),
+            (TokenKind.Punctuation, ":", None, None),
+            (TokenKind.Whitespace, " ", None, None),
+            (TokenKind.TypeName, "SampleType{}".format(index % 50), None, type_id),
+            (TokenKind.Punctuation, ")", None, None),
+            (TokenKind.Newline, "", None, None),
+        ])
+        index += 1
+    return fields[:count]
+
+
+def build_token_list(fields):
+    tokens = []
+    for kind, value, definition_id, navigate_id in fields:
+        token = DictToken(value, kind)
+        token.DefinitionId = definition_id
+        token.NavigateToId = navigate_id
+        tokens.append(token)
+    return tokens
+
+
+def build_token_store(fields):
+    tokens = TokenStore()
+    for kind, value, definition_id, navigate_id in fields:
+        token = Token(value, kind)
+        token.DefinitionId = definition_id
+        token.NavigateToId = navigate_id
+        tokens.append(token)
+    return tokens
+
+
+def measure(func, *args):
+    # Time and memory are measured in separate runs since tracing memory allocations slows down execution
+    gc.collect()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token storage and serialization")
+    parser.add_argument("--token-file", help="Replay tokens from an existing token file")
+    parser.add_argument("--tokens", type=int, default=1000000, help="Number of synthetic tokens")
+    args = parser.parse_args()
+
+    if args.token_file:
+        fields = load_token_fields(args.token_file)
+    else:
+        fields = generate_token_fields(args.tokens)
+    # Make sure strings are not shared with replayed fields to measure interning
+    fields = [(k, "".join(v), d and "".join(d), n and "".join(n)) for k, v, d, n in fields]
+    print("Tokens: {}".format(len(fields)))
+
+    token_list, list_time, list_memory = measure(build_token_list, fields)
+    token_store, store_time, store_memory = measure(build_token_store, fields)
+    list_json, list_encode_time, list_encode_memory = measure(DictTokenEncoder().encode, token_list)
+    store_json, store_encode_time, store_encode_memory = measure(token_store.encode)
+    assert list_json == store_json, "TokenStore output is different from token object output"
+
+    row_format = "{:<16}{:>14}{:>16}{:>14}{:>16}"
+    print(row_format.format("", "build (s)", "memory (MB)", "encode (s)", "peak (MB)"))
+    for name, build, memory, encode, encode_memory in [
+        ("Token objects", list_time, list_memory, list_encode_time, list_encode_memory),
+        ("TokenStore", store_time, store_memory, store_encode_time, store_encode_memory),
+    ]:
+        print(row_format.format(
+            name,
+            "{:.3f}".format(build),
+            "{:.1f}".format(memory / (1024 * 1024)),
+            "{:.3f}".format(encode),
+            "{:.1f}".format(encode_memory / (1024 * 1024)),
+        ))
+
+
+if __name__ == "__main__":
+    main()
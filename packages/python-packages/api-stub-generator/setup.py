@@ -31,7 +31,13 @@ setup(
     packages=find_packages(),
     install_requires=["astroid"],
     python_requires=">=3.4.0",
-    entry_points={"console_scripts": ["apistubgen=apistub:console_entry_point",]},
+    entry_points={
+        "console_scripts": [
+            "apistubgen=apistub:console_entry_point",
+            "apistub-worker=apistub:worker_entry_point",
+            "apistub-diff=apistub:diff_entry_point",
+        ]
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Programming Language :: Python",
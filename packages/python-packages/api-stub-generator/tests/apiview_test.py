@@ -0,0 +1,83 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import io
+import json
+
+from apistub import ApiView, Navigation, NavigationTag, Kind, TokenKind
+from apistub._apiview import (
+    APIViewEncoder, TokenStreamWriter, get_module_members, is_valid_type_name, tokenize_type_name
+)
+from apistub._stub_generator import NodeIndex
+
+
+def _add_sample_tokens(apiview):
+    navigation = Navigation("azure-sample", None)
+    navigation.set_tag(NavigationTag(Kind.type_package))
+    apiview.add_navigation(navigation)
+    apiview.add_line_marker("azure.sample.SampleClient")
+    apiview.add_keyword("class", False, True)
+    apiview.add_text("azure.sample.SampleClient", "azure.sample.SampleClient")
+    apiview.add_punctuation(":")
+    apiview.add_new_line()
+    apiview.begin_group()
+    apiview.add_whitespace()
+    apiview.add_keyword("def", False, True)
+    apiview.add_text("azure.sample.SampleClient.get_item", "get_item")
+    apiview.add_punctuation("(")
+    apiview.add_type("~azure.sample.Item or None", "azure.sample.SampleClient.get_item")
+    apiview.add_punctuation(")")
+    apiview.add_diagnostic("Dummy diagnostic", "azure.sample.SampleClient.get_item")
+    apiview.end_group()
+
+
+class TestApiView:
+
+    def test_stream_writer_generates_same_json(self):
+        apiview = ApiView(NodeIndex(), "azure-sample", "1.0.0", "azure.sample")
+        _add_sample_tokens(apiview)
+        expected = json.loads(APIViewEncoder().encode(apiview))
+
+        stream = io.StringIO()
+        token_writer = TokenStreamWriter(stream)
+        streamed_apiview = ApiView(NodeIndex(), "azure-sample", "1.0.0", "azure.sample", token_writer)
+        _add_sample_tokens(streamed_apiview)
+        token_writer.end(streamed_apiview)
+
+        assert len(token_writer) == len(apiview.Tokens)
+        actual = json.loads(stream.getvalue())
+        # Diagnostic IDs are generated from a global counter
+        for diagnostic in expected["Diagnostics"] + actual["Diagnostics"]:
+            del diagnostic["DiagnosticId"]
+        assert actual == expected
+
+    def test_token_store_encode(self):
+        apiview = ApiView(NodeIndex(), "azure-sample", "1.0.0", "azure.sample")
+        _add_sample_tokens(apiview)
+        expected = json.dumps([token.to_dict() for token in apiview.Tokens], cls=APIViewEncoder)
+        assert apiview.Tokens.encode() == expected
+        assert [t["Value"] for t in json.loads(expected)] == [t.Value for t in apiview.Tokens]
+
+    def test_tokenize_type_name(self):
+        tokens = tokenize_type_name("Union[~azure.core.paging.ItemPaged[int], None]")
+        assert tokens == (
+            (TokenKind.TypeName, "Union"),
+            (TokenKind.Punctuation, "["),
+            (TokenKind.TypeName, "~azure.core.paging.ItemPaged"),
+            (TokenKind.Punctuation, "["),
+            (TokenKind.TypeName, "int"),
+            (TokenKind.Punctuation, "], "),
+            (TokenKind.TypeName, "None"),
+            (TokenKind.Punctuation, "]"),
+        )
+        assert tokenize_type_name("str") == ((TokenKind.TypeName, "str"), (TokenKind.Punctuation, ""))
+
+    def test_is_valid_type_name(self):
+        assert is_valid_type_name("json.JSONEncoder")
+        assert not is_valid_type_name("json.InvalidEncoder")
+        assert get_module_members("json") is get_module_members("json")
+        assert not is_valid_type_name("azure.invalid_module.SampleClient")
+        assert get_module_members("azure.invalid_module") is None
@@ -0,0 +1,58 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+import zipfile
+
+from apistub import StubGenerator
+from apistub._batch import BATCH_SUMMARY_FILE, generate_token_files
+
+client_source = '''
+__all__ = ["{0}Client"]
+
+
+class {0}Client(object):
+
+    def get_item(self, name):
+        pass
+'''
+
+
+class TestBatch:
+
+    def _create_wheel(self, pkg_dir, name):
+        wheel_path = pkg_dir / "azure_{0}-1.0.0-py2.py3-none-any.whl".format(name)
+        with zipfile.ZipFile(str(wheel_path), "w") as wheel:
+            wheel.writestr("azure/__init__.py", "")
+            wheel.writestr("azure/{}/__init__.py".format(name), client_source.format(name.capitalize()))
+            wheel.writestr("azure_{0}-1.0.0.dist-info/top_level.txt".format(name), "azure\n")
+        return wheel_path
+
+    def test_token_file_is_generated_for_each_package(self, tmp_path):
+        pkg_dir = tmp_path / "packages"
+        pkg_dir.mkdir()
+        self._create_wheel(pkg_dir, "first")
+        self._create_wheel(pkg_dir, "second")
+        out_path = tmp_path / "out"
+
+        stub_generator = StubGenerator(
+            ["--pkg-path", str(pkg_dir), "--out-path", str(out_path), "--static", "--hide-report"]
+        )
+        assert stub_generator.batch
+        summary = generate_token_files(stub_generator)
+
+        assert summary["Succeeded"] == 2
+        assert summary["Failed"] == 0
+        assert json.loads((out_path / BATCH_SUMMARY_FILE).read_text())["Succeeded"] == 2
+        assert "FirstClient" in (out_path / "azure-first_python.json").read_text()
+        assert "SecondClient" in (out_path / "azure-second_python.json").read_text()
+        assert "FirstClient" not in (out_path / "azure-second_python.json").read_text()
+
+    def test_single_package_is_not_batch(self, tmp_path):
+        wheel_path = self._create_wheel(tmp_path, "first")
+        stub_generator = StubGenerator(["--pkg-path", str(wheel_path), "--static"])
+        assert not stub_generator.batch
+        assert stub_generator.pkg_path == str(wheel_path)
@@ -0,0 +1,54 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+from apistub import ResultCache
+
+
+class TestResultCache:
+
+    def _create_package(self, tmp_path, name, content):
+        pkg_path = tmp_path / name
+        pkg_path.write_bytes(content)
+        return str(pkg_path)
+
+    def test_key_changes_with_content_and_options(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"), 1024)
+        pkg1 = self._create_package(tmp_path, "pkg1.whl", b"package content")
+        pkg2 = self._create_package(tmp_path, "pkg2.whl", b"package content")
+        pkg3 = self._create_package(tmp_path, "pkg3.whl", b"updated content")
+        assert cache.get_key(pkg1) == cache.get_key(pkg2)
+        assert cache.get_key(pkg1) != cache.get_key(pkg3)
+        assert cache.get_key(pkg1) != cache.get_key(pkg1, {"static": True})
+
+    def test_get_and_put(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"), 1024)
+        assert cache.get("key1") is None
+        cache.put("key1", '{"Name": "azure-core"}')
+        assert cache.get("key1") == '{"Name": "azure-core"}'
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"), 25)
+        cache.put("key1", "a" * 10)
+        cache.put("key2", "b" * 10)
+        # Make key1 the recently used entry
+        os.utime(os.path.join(cache.cache_dir, "key2.json"), (1, 1))
+        assert cache.get("key1") == "a" * 10
+        cache.put("key3", "c" * 10)
+        assert cache.get("key2") is None
+        assert cache.get("key1") == "a" * 10
+        assert cache.get("key3") == "c" * 10
+
+    def test_entry_evicted_after_read_is_returned(self, tmp_path, monkeypatch):
+        cache = ResultCache(str(tmp_path / "cache"), 1024)
+        cache.put("key1", '{"Name": "azure-core"}')
+
+        def utime(path, times):
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(os, "utime", utime)
+        assert cache.get("key1") == '{"Name": "azure-core"}'
@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import inspect
+import types
+
+from apistub import ApiView
+from apistub._stub_generator import NodeIndex
+from apistub.nodes import ClassNode
+from apistub.nodes._class_node import get_class_members, get_sync_twin_keys, is_included_member, _class_members
+
+
+class SampleMixin(object):
+    LIMIT = 10
+
+    def close(self):
+        pass
+
+    def _reset(self):
+        pass
+
+
+class SampleBase(SampleMixin):
+
+    def as_dict(self):
+        pass
+
+    @classmethod
+    def from_dict(cls, data):
+        pass
+
+    @property
+    def kind(self):
+        pass
+
+
+class SampleModel(SampleBase):
+    LIMIT = 20
+    # Attribute in subclass hides property of base class
+    kind = None
+
+    def close(self):
+        pass
+
+
+class SampleClient(object):
+    api_version = "2020-10-02"
+
+    def get_item(self, name: str, **kwargs) -> dict:
+        pass
+
+    def list_items(self, **kwargs) -> list:
+        pass
+
+    def close(self):
+        pass
+
+
+class AsyncSampleClient(object):
+    api_version = "2020-10-02"
+
+    async def get_item(self, name: str, **kwargs) -> dict:
+        pass
+
+    async def list_items(self, prefix: str, **kwargs) -> list:
+        pass
+
+    async def close(self):
+        pass
+
+
+class TestClassNode:
+
+    def _create_class_node(self, obj):
+        parent = types.SimpleNamespace(namespace_id=__name__, namespace=__name__)
+        return ClassNode(__name__, parent, obj)
+
+    def test_members_are_same_as_inspected_members(self):
+        for obj in [SampleMixin, SampleBase, SampleModel]:
+            class_node = self._create_class_node(obj)
+            expected = [
+                (name, value) for name, value in inspect.getmembers(obj) if is_included_member(name, value, __name__)
+            ]
+            assert class_node._get_members() == expected
+
+    def test_members_of_base_class_are_cached(self):
+        self._create_class_node(SampleModel)
+        assert get_class_members(SampleBase, __name__) is _class_members[SampleBase][__name__]
+        assert get_class_members(SampleBase, __name__)["as_dict"]
+        assert not get_class_members(SampleMixin, __name__)["_reset"]
+
+    def test_class_method_is_bound_to_class(self):
+        class_node = self._create_class_node(SampleModel)
+        from_dict = [x for x in class_node.child_nodes if x.name == "from_dict"][0]
+        assert from_dict.obj.__self__ is SampleModel
+        assert [x.name for x in class_node.child_nodes] == ["LIMIT", "from_dict", "as_dict", "close"]
+
+    def test_sync_twin_keys(self):
+        assert get_sync_twin_keys("azure.storage.blob.aio.BlobClient") == ["azure.storage.blob.BlobClient"]
+        assert get_sync_twin_keys("azure.core.AsyncPipelineClient") == ["azure.core.PipelineClient"]
+        assert get_sync_twin_keys("azure.core.aio.AsyncLROPoller") == [
+            "azure.core.AsyncLROPoller", "azure.core.LROPoller"
+        ]
+        assert get_sync_twin_keys("azure.core.Asynchronous") == []
+        assert get_sync_twin_keys("azure.core.PipelineClient") == []
+
+    def test_async_delta(self):
+        class_node = self._create_class_node(AsyncSampleClient)
+        class_node.set_sync_twin(self._create_class_node(SampleClient))
+        apiview = ApiView(NodeIndex())
+        class_node.generate_tokens(apiview)
+        text = "".join(x.Value for x in apiview.Tokens)
+        assert "# 3 members are same as SampleClient" in text
+        assert "list_items" in text
+        assert "get_item" not in text
+        assert "close" not in text
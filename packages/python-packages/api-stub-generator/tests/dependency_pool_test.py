@@ -0,0 +1,44 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+from apistub._dependency_pool import DependencyPool, get_wheel_requirements
+
+sample_metadata = '''Metadata-Version: 2.1
+Name: azure-sample
+Version: 1.0.0
+Requires-Dist: requests (>=2.18.4)
+Requires-Dist: six (>=1.6)
+Requires-Dist: typing ; python_version<'3.5'
+
+Description of azure-sample
+Requires-Dist: not-a-requirement
+'''
+
+
+class TestDependencyPool:
+
+    def test_wheel_requirements(self, tmp_path):
+        dist_info_path = tmp_path / "azure_sample-1.0.0.dist-info"
+        dist_info_path.mkdir()
+        (dist_info_path / "METADATA").write_text(sample_metadata)
+        assert get_wheel_requirements(str(tmp_path)) == [
+            "requests (>=2.18.4)", "six (>=1.6)", "typing ; python_version<'3.5'"
+        ]
+        assert get_wheel_requirements(str(tmp_path / "missing")) == []
+
+    def test_requirement_order_does_not_change_key(self, tmp_path):
+        pool = DependencyPool(str(tmp_path))
+        assert pool.get_key(["six", "requests"]) == pool.get_key(["requests", "six"])
+        assert pool.get_key(["six"]) != pool.get_key(["six", "requests"])
+
+    def test_dependency_path_is_reused(self, tmp_path):
+        pool = DependencyPool(str(tmp_path / "pool"))
+        dependency_path = pool.get_dependency_path([])
+        assert os.path.isdir(dependency_path)
+        assert pool.get_dependency_path([]) == dependency_path
+        assert os.listdir(str(tmp_path / "pool")) == [os.path.basename(dependency_path)]
@@ -0,0 +1,89 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+
+from apistub import TokenKind
+from apistub._diff import diff_apiviews, get_definition_spans, main
+
+
+def _create_apiview(lines):
+    """Creates token file with a line for each item. Item is a tuple of definition ID and text or text of a line
+    without line marker
+    """
+    tokens = []
+    for line in lines:
+        definition_id, text = line if isinstance(line, tuple) else (None, line)
+        if definition_id:
+            tokens.append({"Kind": TokenKind.LineIdMarker.value, "DefinitionId": definition_id, "Value": ""})
+        tokens.append({"Kind": TokenKind.Text.value, "Value": text})
+        tokens.append({"Kind": TokenKind.Newline.value, "Value": ""})
+    return {"Name": "azure-sample", "Tokens": tokens}
+
+
+old_lines = [
+    "# Package is parsed using api-stub-generator",
+    ("azure.sample.SampleClient", "class azure.sample.SampleClient:"),
+    ("azure.sample.SampleClient.get_item", "    def get_item(self, name)"),
+    ("azure.sample.SampleClient.list_items", "    def list_items(self)"),
+    "",
+    ("azure.sample.Item", "class azure.sample.Item:"),
+    "    name: str",
+]
+
+
+class TestDiff:
+
+    def test_definition_spans(self):
+        spans = get_definition_spans(_create_apiview(old_lines)["Tokens"])
+        assert list(spans.keys()) == [
+            None,
+            "azure.sample.SampleClient",
+            "azure.sample.SampleClient.get_item",
+            "azure.sample.SampleClient.list_items",
+            "azure.sample.Item",
+        ]
+        assert spans["azure.sample.SampleClient.list_items"] == ["    def list_items(self)", ""]
+        assert spans["azure.sample.Item"] == ["class azure.sample.Item:", "    name: str"]
+
+    def test_no_changes(self):
+        change_set = diff_apiviews(_create_apiview(old_lines), _create_apiview(old_lines))
+        assert change_set["Changes"] == []
+
+    def test_changes(self):
+        new_lines = list(old_lines)
+        new_lines[2] = ("azure.sample.SampleClient.get_item", "    def get_item(self, name, **kwargs)")
+        new_lines[3] = ("azure.sample.SampleClient.close", "    def close(self)")
+        new_lines.append("    value: int")
+
+        change_set = diff_apiviews(_create_apiview(old_lines), _create_apiview(new_lines))
+        assert (change_set["Added"], change_set["Removed"], change_set["Changed"]) == (1, 1, 2)
+        assert change_set["Changes"] == [
+            {
+                "DefinitionId": "azure.sample.SampleClient.get_item",
+                "Change": "Changed",
+                "Lines": ["-    def get_item(self, name)", "+    def get_item(self, name, **kwargs)"],
+            },
+            {"DefinitionId": "azure.sample.SampleClient.close", "Change": "Added", "Lines": ["+    def close(self)", "+"]},
+            {"DefinitionId": "azure.sample.Item", "Change": "Changed", "Lines": ["+    value: int"]},
+            {
+                "DefinitionId": "azure.sample.SampleClient.list_items",
+                "Change": "Removed",
+                "Lines": ["-    def list_items(self)", "-"],
+            },
+        ]
+
+    def test_main(self, tmp_path):
+        old_path = tmp_path / "old.json"
+        new_path = tmp_path / "new.json"
+        out_path = tmp_path / "diff.json"
+        old_path.write_text(json.dumps(_create_apiview(old_lines)))
+        new_path.write_text(json.dumps(_create_apiview(old_lines[:-1])))
+        main([str(old_path), str(new_path), "--out-path", str(out_path)])
+        change_set = json.loads(out_path.read_text())
+        assert change_set["Changes"] == [
+            {"DefinitionId": "azure.sample.Item", "Change": "Changed", "Lines": ["-    name: str"]}
+        ]
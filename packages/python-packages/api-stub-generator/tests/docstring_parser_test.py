@@ -5,6 +5,7 @@
 # --------------------------------------------------------------------------
 
 from apistub.nodes import DocstringParser
+from apistub.nodes._docstring_parser import scan_docstring
 from apistub.nodes import ArgType
 
 docstring_standard_return_type = """
@@ -165,4 +166,19 @@ class TestDocStringParser:
         self._test_variable_type(docstring_param_nested_union, "dummyarg", "typing.Union[~azure.eventhub.EventDataBatch, List[~azure.eventhub.EventData]]")
 
     def test_multi_text_analytics_type(self):
-        self._test_variable_type(docstring_multi_complex_type, "documents", "list[str] or list[~azure.ai.textanalytics.DetectLanguageInput] or list[dict[str, str]]")
\ No newline at end of file
+        self._test_variable_type(docstring_multi_complex_type, "documents", "list[str] or list[~azure.ai.textanalytics.DetectLanguageInput] or list[dict[str, str]]")
+
+    def test_scan_docstring(self):
+        fields = scan_docstring(docstring_multi_complex_type)
+        assert [x[0] for x in fields["param"]] == ["documents"]
+        assert [x[0] for x in fields["keyword"]] == ["country_hint", "model_version", "show_stats"]
+        assert fields["type"]["documents"] == "list[str] or list[~azure.ai.textanalytics.DetectLanguageInput] or list[dict[str, str]]"
+        assert fields["rtype"] == (
+            "list[~azure.ai.textanalytics.DetectLanguageResult, ~azure.ai.textanalytics.DocumentError]"
+        )
+
+    def test_parsed_args_are_not_shared(self):
+        # Scanned docstrings are cached so each parser must return new arg objects
+        args = DocstringParser(docstring_param_type1).find_args("param")
+        args[0].argtype = "int"
+        assert DocstringParser(docstring_param_type1).find_args("param")[0].argtype == "str"
@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import zipfile
+
+from apistub import StubGenerator
+from apistub._stub_generator import get_wheel_members
+
+wheel_files = {
+    "azure/__init__.py": "",
+    "azure/sample/__init__.py": "",
+    "azure/sample/_client.py": "",
+    "azure/sample/py.typed": "",
+    "tests/test_client.py": "",
+    "azure_sample-1.0.0.data/data/samples/sample.txt": "",
+    "azure_sample-1.0.0.dist-info/METADATA": "Name: azure-sample\n",
+    "azure_sample-1.0.0.dist-info/top_level.txt": "azure\n",
+}
+
+
+class TestExtractWheel:
+
+    def _create_wheel(self, tmp_path, files):
+        wheel_path = tmp_path / "azure_sample-1.0.0-py2.py3-none-any.whl"
+        with zipfile.ZipFile(str(wheel_path), "w") as wheel:
+            for name, content in files.items():
+                wheel.writestr(name, content)
+        return wheel_path
+
+    def _extract(self, tmp_path, files, *args):
+        wheel_path = self._create_wheel(tmp_path, files)
+        temp_path = tmp_path / "temp"
+        temp_path.mkdir()
+        stub_generator = StubGenerator(["--pkg-path", str(wheel_path), "--temp-path", str(temp_path)] + list(args))
+        pkg_root_path, namespace = stub_generator._extract_wheel()
+        extracted = []
+        for root, _, names in os.walk(pkg_root_path):
+            extracted.extend(os.path.relpath(os.path.join(root, x), pkg_root_path).replace(os.sep, "/") for x in names)
+        return namespace, sorted(extracted)
+
+    def test_only_root_module_is_extracted(self, tmp_path):
+        namespace, extracted = self._extract(tmp_path, wheel_files)
+        assert namespace == "azure"
+        assert extracted == [
+            "azure/__init__.py",
+            "azure/sample/__init__.py",
+            "azure/sample/_client.py",
+            "azure/sample/py.typed",
+            "azure_sample-1.0.0.dist-info/METADATA",
+            "azure_sample-1.0.0.dist-info/top_level.txt",
+        ]
+
+    def test_only_source_files_are_extracted_in_static_mode(self, tmp_path):
+        _, extracted = self._extract(tmp_path, wheel_files, "--static")
+        assert "azure/sample/py.typed" not in extracted
+        assert "azure/sample/_client.py" in extracted
+
+    def test_all_files_are_extracted_without_top_level(self, tmp_path):
+        files = dict(wheel_files)
+        del files["azure_sample-1.0.0.dist-info/top_level.txt"]
+        namespace, extracted = self._extract(tmp_path, files)
+        assert namespace == ""
+        assert len(extracted) == len(files)
+
+    def test_single_module_wheel(self):
+        names = ["six.py", "six-1.0.dist-info/METADATA", "sixty/__init__.py"]
+        assert get_wheel_members(names, "six", False) == ["six.py", "six-1.0.dist-info/METADATA"]
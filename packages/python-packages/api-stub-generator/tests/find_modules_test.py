@@ -0,0 +1,79 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from apistub import StubGenerator
+from apistub._stub_generator import can_match_sub_module, is_module_selected
+
+PACKAGE_FILES = [
+    "setup.py",
+    "azure/__init__.py",
+    "azure/mgmt/__init__.py",
+    "azure/mgmt/sample/__init__.py",
+    "azure/mgmt/sample/models.py",
+    "azure/mgmt/sample/_client.py",
+    "azure/mgmt/sample/aio/__init__.py",
+    "azure/mgmt/sample/v2019_01_01/__init__.py",
+    "azure/mgmt/sample/v2019_01_01/models.py",
+    "azure/mgmt/sample/v2019_01_01/aio/__init__.py",
+    "azure/mgmt/sample/v2020_01_01/__init__.py",
+    "azure/mgmt/sample/v2020_01_01/models.py",
+    "azure/mgmt/sample/v2020_01_01/aio/__init__.py",
+    "tests/__init__.py",
+    "tests/conftest.py",
+]
+
+
+class TestFindModules:
+
+    def _find_modules(self, tmp_path, namespace="", *args):
+        for file_path in PACKAGE_FILES:
+            (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / file_path).write_text("")
+        stub_generator = StubGenerator(["--pkg-path", str(tmp_path)] + list(args))
+        walked = []
+        stub_generator._should_walk = lambda m, n, walk=stub_generator._should_walk: walked.append(m) or walk(m, n)
+        return sorted(stub_generator._find_modules(str(tmp_path), namespace)), walked
+
+    def test_all_modules(self, tmp_path):
+        modules, _ = self._find_modules(tmp_path)
+        assert "tests.conftest" in modules
+        assert "azure.mgmt.sample.v2019_01_01.aio" in modules
+
+    def test_namespace(self, tmp_path):
+        modules, walked = self._find_modules(tmp_path, "azure.mgmt.sample")
+        assert "tests" in walked
+        assert "tests.conftest" not in modules
+
+    def test_exclude(self, tmp_path):
+        modules, walked = self._find_modules(tmp_path, "azure", "--exclude", "*.v20*", "*.aio")
+        assert modules == ["azure", "azure.mgmt", "azure.mgmt.sample", "azure.mgmt.sample.models"]
+        # Excluded directories are not walked
+        assert "azure.mgmt.sample.v2019_01_01.aio" not in walked
+
+    def test_include(self, tmp_path):
+        modules, walked = self._find_modules(tmp_path, "azure", "--include", "azure.mgmt.sample.v2019_01_01")
+        assert modules == [
+            "azure.mgmt.sample.v2019_01_01",
+            "azure.mgmt.sample.v2019_01_01.aio",
+            "azure.mgmt.sample.v2019_01_01.models",
+        ]
+        # Directories where no module can match include pattern are not walked
+        assert "azure.mgmt.sample.v2020_01_01" in walked
+        assert "azure.mgmt.sample.v2020_01_01.aio" not in walked
+
+    def test_is_module_selected(self):
+        assert is_module_selected("azure.sample.aio.operations", [], [])
+        assert not is_module_selected("azure.sample.aio.operations", [], ["*.aio"])
+        assert is_module_selected("azure.sample.aio.operations", ["azure.sample.aio"], [])
+        assert not is_module_selected("azure.sample.models", ["azure.sample.aio"], [])
+        assert not is_module_selected("azure.sample.v2019_01_01", ["azure.sample.*"], ["*.v2019_*"])
+
+    def test_can_match_sub_module(self):
+        assert can_match_sub_module("azure", "azure.mgmt.sample.v2019_*")
+        assert can_match_sub_module("azure.mgmt.sample.v2019_01_01", "azure.mgmt.sample.v2019_*")
+        assert can_match_sub_module("azure.mgmt.sample.v2019_01_01.aio", "azure.mgmt.sample.v2019_*")
+        assert not can_match_sub_module("azure.mgmt.sample.v2020_01_01", "azure.mgmt.sample.v2019_*")
+        assert can_match_sub_module("tests", "*.aio")
@@ -0,0 +1,88 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import types
+
+from apistub import ApiView
+from apistub._stub_generator import NodeIndex
+from apistub.nodes import ClassNode
+from apistub.nodes._linter import LINT_RULE_NAMES, Linter, get_lint_rule_names, get_module_diagnostics
+
+
+class SampleLintClient(object):
+
+    def get_item(self, name, **kwargs) -> str:
+        pass
+
+    def delete_item(self, name: str) -> None:
+        pass
+
+    def list_items(self, **kwargs):
+        """List items
+
+        :rtype: list[str]
+        """
+        pass
+
+    def keys(self):
+        pass
+
+
+class TestLinter:
+
+    def _create_module_node(self, *classes):
+        module_node = types.SimpleNamespace(namespace_id=__name__, namespace=__name__, child_nodes=[])
+        module_node.child_nodes = [ClassNode(__name__, module_node, x) for x in classes]
+        return module_node
+
+    def _get_diagnostics(self, module_node, rule_names=None):
+        Linter(rule_names or get_lint_rule_names()).lint(module_node, NodeIndex())
+        return [(r, t.split(".")[-1], m) for r, t, m in get_module_diagnostics(module_node)]
+
+    def test_rule_names(self):
+        assert "source-link" not in get_lint_rule_names()
+        assert "source-link" in get_lint_rule_names(enable=["source-link"])
+        assert "missing-kwargs" not in get_lint_rule_names(disable=["missing-kwargs"])
+        assert get_lint_rule_names(enable=LINT_RULE_NAMES) == LINT_RULE_NAMES
+
+    def test_diagnostics(self):
+        diagnostics = self._get_diagnostics(self._create_module_node(SampleLintClient))
+        assert ("missing-arg-type", "delete_item", "Type is not available for name") not in diagnostics
+        # Args are listed in individual lines if method has more than 2 args
+        assert ("missing-arg-type", "param(name", "Type is not available for name") in diagnostics
+        assert ("missing-kwargs", "delete_item", "Keyword arg (**kwargs) is missing in method delete_item") in diagnostics
+        assert ("missing-typehint", "list_items", "Typehint is missing for method list_items") in diagnostics
+        assert ("missing-kwargs", "keys", "Keyword arg (**kwargs) is missing in method keys") in diagnostics
+        # Methods of known interfaces are not validated for type hint
+        assert not [x for x in diagnostics if x[1] == "keys" and x[0] != "missing-kwargs"]
+
+    def test_arg_type_is_reported_once(self):
+        diagnostics = self._get_diagnostics(self._create_module_node(SampleLintClient))
+        assert [x for x in diagnostics if x[2] == "Type is not available for name"] == [
+            ("missing-arg-type", "param(name", "Type is not available for name")
+        ]
+
+    def test_disabled_rule(self):
+        rule_names = get_lint_rule_names(disable=["missing-kwargs"])
+        diagnostics = self._get_diagnostics(self._create_module_node(SampleLintClient), rule_names)
+        assert diagnostics
+        assert not [x for x in diagnostics if x[0] == "missing-kwargs"]
+
+    def test_tokens_do_not_add_diagnostics(self):
+        module_node = self._create_module_node(SampleLintClient)
+        apiview = ApiView(NodeIndex())
+        module_node.child_nodes[0].generate_tokens(apiview)
+        assert not apiview.Diagnostics
+        assert not [x for x in module_node.child_nodes[0].child_nodes if x.errors]
+
+    def test_report(self):
+        module_node = self._create_module_node(SampleLintClient)
+        linter = Linter(get_lint_rule_names())
+        linter.lint(module_node, NodeIndex())
+        report = linter.get_report("sample", [module_node])
+        assert list(report["Rules"].keys()) == get_lint_rule_names()
+        assert sum(x["Diagnostics"] for x in report["Rules"].values()) == len(report["Diagnostics"])
+        assert report["Rules"]["missing-kwargs"]["Seconds"] >= 0
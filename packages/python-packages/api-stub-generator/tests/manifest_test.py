@@ -0,0 +1,120 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+import sys
+
+from apistub import StubGenerator
+
+setup_source = '''
+from setuptools import setup
+setup(name="azure-sample", version="1.0.0", packages=["azure.sample"])
+'''
+
+init_source = '''
+from ._client import SampleClient
+__all__ = ["SampleClient"]
+'''
+
+client_source = '''
+class SampleClient(object):
+
+    def get_item(self, name, **kwargs):
+        # type: (str, Any) -> str
+        pass
+'''
+
+models_source = '''
+__all__ = ["Item"]
+
+
+class Item(object):
+    """Dummy item
+
+    :ivar str name: Dummy name
+    """
+'''
+
+
+class TestManifest:
+
+    def _create_package(self, tmp_path):
+        pkg_path = tmp_path / "azure-sample"
+        (pkg_path / "azure" / "sample").mkdir(parents=True)
+        (pkg_path / "setup.py").write_text(setup_source)
+        (pkg_path / "azure" / "__init__.py").write_text("")
+        (pkg_path / "azure" / "sample" / "__init__.py").write_text(init_source)
+        (pkg_path / "azure" / "sample" / "_client.py").write_text(client_source)
+        (pkg_path / "azure" / "sample" / "models.py").write_text(models_source)
+        return pkg_path
+
+    def _generate(self, monkeypatch, pkg_path, out_path, *args):
+        monkeypatch.setattr(sys, "argv", [
+            "apistubgen", "--pkg-path", str(pkg_path), "--out-path", str(out_path), "--static", "--hide-report"
+        ] + list(args))
+        stub_generator = StubGenerator()
+        apiview = stub_generator.generate_tokens()
+        out_path.write_text(stub_generator.serialize(apiview))
+        stub_generator.save_manifest(str(out_path))
+        return stub_generator
+
+    def _load_tokens(self, out_path):
+        apiview = json.loads(out_path.read_text())
+        # Diagnostic IDs are generated from a global counter
+        for diagnostic in apiview["Diagnostics"]:
+            del diagnostic["DiagnosticId"]
+        return apiview
+
+    def test_unchanged_modules_are_not_inspected(self, tmp_path, monkeypatch):
+        pkg_path = self._create_package(tmp_path)
+        baseline_path = tmp_path / "baseline.json"
+        self._generate(monkeypatch, pkg_path, baseline_path, "--manifest")
+        assert (tmp_path / "baseline.manifest.json").exists()
+
+        (pkg_path / "azure" / "sample" / "_client.py").write_text(client_source.replace("get_item", "get_value"))
+        out_path = tmp_path / "out.json"
+        stub_generator = self._generate(monkeypatch, pkg_path, out_path, "--baseline", str(baseline_path))
+        assert list(stub_generator.module_dict.keys()) == ["azure.sample"]
+
+        full_out_path = tmp_path / "full.json"
+        self._generate(monkeypatch, pkg_path, full_out_path)
+        assert self._load_tokens(out_path) == self._load_tokens(full_out_path)
+        assert "get_value" in out_path.read_text()
+
+    def test_all_modules_are_inspected_if_public_entities_change(self, tmp_path, monkeypatch):
+        pkg_path = self._create_package(tmp_path)
+        baseline_path = tmp_path / "baseline.json"
+        self._generate(monkeypatch, pkg_path, baseline_path, "--manifest")
+
+        (pkg_path / "azure" / "sample" / "__init__.py").write_text(
+            init_source.replace('"SampleClient"]', '"SampleClient", "SampleItem"]') + "\nclass SampleItem(object):\n    pass\n"
+        )
+        out_path = tmp_path / "out.json"
+        stub_generator = self._generate(monkeypatch, pkg_path, out_path, "--baseline", str(baseline_path))
+        assert list(stub_generator.module_dict.keys()) == ["azure.sample", "azure.sample.models"]
+
+    def test_aliases_of_unchanged_modules_are_reused(self, tmp_path, monkeypatch):
+        pkg_path = self._create_package(tmp_path)
+        baseline_path = tmp_path / "baseline.json"
+        self._generate(monkeypatch, pkg_path, baseline_path, "--manifest")
+        manifest = json.loads((tmp_path / "baseline.manifest.json").read_text())
+        assert manifest["Modules"]["azure.sample"]["Aliases"] == {
+            "azure.sample._client.SampleClient": "azure.sample.SampleClient"
+        }
+
+        # Changed module refers to a class of unchanged module using name of module where class is defined
+        (pkg_path / "azure" / "sample" / "models.py").write_text(
+            models_source.replace(":ivar str name:", ":ivar ~azure.sample._client.SampleClient name:")
+        )
+        out_path = tmp_path / "out.json"
+        stub_generator = self._generate(monkeypatch, pkg_path, out_path, "--baseline", str(baseline_path))
+        assert list(stub_generator.module_dict.keys()) == ["azure.sample.models"]
+
+        full_out_path = tmp_path / "full.json"
+        self._generate(monkeypatch, pkg_path, full_out_path)
+        assert self._load_tokens(out_path) == self._load_tokens(full_out_path)
+        tokens = self._load_tokens(out_path)["Tokens"]
+        assert any(t["Value"] == "SampleClient" and t.get("NavigateToId") == "azure.sample.SampleClient" for t in tokens)
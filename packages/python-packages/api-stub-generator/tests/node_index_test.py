@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from apistub._manifest import IndexEntry
+from apistub._stub_generator import NodeIndex
+
+
+class TestNodeIndex:
+
+    def _create_index(self):
+        nodeindex = NodeIndex()
+        nodeindex.add("azure.storage.blob.BlobClient", IndexEntry("blob-client"))
+        nodeindex.add_alias("azure.storage.blob._blob_client.BlobClient", "azure.storage.blob.BlobClient")
+        nodeindex.add("azure.storage.blob.aio.BlobClient", IndexEntry("aio-blob-client"))
+        nodeindex.add_alias("azure.storage.blob.aio._blob_client_async.BlobClient", "azure.storage.blob.aio.BlobClient")
+        nodeindex.add("azure.storage.blob.ContainerClient", IndexEntry("container-client"))
+        nodeindex.add("azure.storage.blob.Exception", IndexEntry("exception"))
+        return nodeindex
+
+    def test_full_name_and_alias(self):
+        nodeindex = self._create_index()
+        assert nodeindex.get_id("azure.storage.blob.BlobClient") == "blob-client"
+        assert nodeindex.get_id("azure.storage.blob._blob_client.BlobClient") == "blob-client"
+        assert nodeindex.get_id("azure.storage.blob.aio._blob_client_async.BlobClient") == "aio-blob-client"
+
+    def test_suffix(self):
+        nodeindex = self._create_index()
+        assert nodeindex.get_id("ContainerClient") == "container-client"
+        assert nodeindex.get_id("blob.ContainerClient") == "container-client"
+        assert nodeindex.get_id("_blob_client.BlobClient") == "blob-client"
+        assert nodeindex.get_id("aio.BlobClient") == "aio-blob-client"
+        assert nodeindex.get_id("torage.blob.ContainerClient") is None
+        assert nodeindex.get_id("azure.storage.queue.ContainerClient") is None
+
+    def test_ambiguous_suffix(self):
+        nodeindex = self._create_index()
+        assert nodeindex.get_id("BlobClient") is None
+        assert nodeindex.resolve("BlobClient") is None
+
+    def test_builtin_short_name(self):
+        nodeindex = self._create_index()
+        assert nodeindex.get_id("Exception") is None
+        assert nodeindex.get_id("blob.Exception") == "exception"
+
+    def test_first_alias_is_kept(self):
+        nodeindex = self._create_index()
+        nodeindex.add("azure.storage.blob.models.ContainerClient", IndexEntry("models-container-client"))
+        nodeindex.add_alias("azure.storage.blob._container_client.ContainerClient", "azure.storage.blob.ContainerClient")
+        nodeindex.add_alias(
+            "azure.storage.blob._container_client.ContainerClient", "azure.storage.blob.models.ContainerClient"
+        )
+        assert nodeindex.get_id("azure.storage.blob._container_client.ContainerClient") == "container-client"
+        assert nodeindex.get_id("ContainerClient") is None
@@ -0,0 +1,36 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+
+from apistub._profiler import Profiler
+
+
+class TestProfiler:
+
+    def test_disabled_profiler(self):
+        profiler = Profiler()
+        with profiler.measure("inspect"):
+            pass
+        assert profiler.records == []
+
+    def test_report(self, tmp_path):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.measure("inspect"):
+            with profiler.measure("inspect", "azure.sample", "module"):
+                with profiler.measure("inspect", "azure.sample.SampleClient", "class"):
+                    pass
+        with profiler.measure("serialize"):
+            pass
+
+        report_path = tmp_path / "profile.json"
+        profiler.save(str(report_path))
+        report = json.loads(report_path.read_text())
+        assert sorted(report["Phases"].keys()) == ["inspect", "serialize"]
+        assert [x["Target"] for x in report["Modules"]] == ["azure.sample"]
+        assert [x["Target"] for x in report["Classes"]] == ["azure.sample.SampleClient"]
+        assert report["Phases"]["inspect"]["Wall"] >= report["Modules"][0]["Wall"]
@@ -0,0 +1,121 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+import pytest
+
+from apistub._setup_parser import SetupPyEvaluator, parse_setup_py, _Unresolved
+
+setup_source = '''
+import re
+import os.path
+from io import open
+from setuptools import find_packages, setup
+
+PACKAGE_NAME = "azure-sample"
+package_folder_path = PACKAGE_NAME.replace('-', '/')
+
+try:
+    import azure
+    try:
+        ver = azure.__version__
+        raise Exception("This package is incompatible with azure=={}".format(ver))
+    except AttributeError:
+        pass
+except ImportError:
+    pass
+
+with open(os.path.join(package_folder_path, '_version.py'), 'r') as fd:
+    version = re.search(r'^VERSION\\s*=\\s*[\\'"]([^\\'"]*)[\\'"]', fd.read(), re.MULTILINE).group(1)
+
+if not version:
+    raise RuntimeError('Cannot find version information')
+
+setup(
+    name=PACKAGE_NAME,
+    version=version,
+    long_description=undefined_name,
+    packages=find_packages(exclude=["tests", "azure"]),
+)
+'''
+
+dynamic_setup_source = '''
+from setuptools import setup
+
+def get_version():
+    return "2.0.0"
+
+print("Running setup.py")
+setup(name="azure-sample", version=get_version(), packages=["azure.sample"])
+'''
+
+
+class TestSetupParser:
+
+    def _create_package(self, tmp_path, source):
+        (tmp_path / "azure" / "sample").mkdir(parents=True)
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "__init__.py").write_text("")
+        (tmp_path / "azure" / "__init__.py").write_text("")
+        (tmp_path / "azure" / "sample" / "__init__.py").write_text("")
+        (tmp_path / "azure" / "sample" / "_version.py").write_text('VERSION = "1.2.0"\n')
+        (tmp_path / "setup.py").write_text(source)
+
+    def test_setup_py_is_evaluated_statically(self, tmp_path):
+        self._create_package(tmp_path, setup_source)
+        current_dir = os.getcwd()
+        kwargs = SetupPyEvaluator(str(tmp_path / "setup.py")).evaluate()
+        assert kwargs == {"name": "azure-sample", "version": "1.2.0", "packages": ["azure.sample"]}
+        assert parse_setup_py(str(tmp_path)) == ("azure-sample", "1.2.0", "azure.sample")
+        assert os.getcwd() == current_dir
+
+    def test_literals_are_evaluated_without_running_setup_py(self, tmp_path, monkeypatch):
+        self._create_package(tmp_path, setup_source.replace(
+            'version=version', 'version="{0}.{1}.0".format(1, 2) if version is not None else None'
+        ))
+
+        def run_setup_py(setup_filename):
+            raise AssertionError("setup.py must not be run")
+
+        monkeypatch.setattr("apistub._setup_parser.run_setup_py", run_setup_py)
+        assert parse_setup_py(str(tmp_path)) == ("azure-sample", "1.2.0", "azure.sample")
+
+    def test_setup_py_is_run_if_it_can_not_be_evaluated(self, tmp_path):
+        self._create_package(tmp_path, dynamic_setup_source)
+        with pytest.raises(_Unresolved):
+            SetupPyEvaluator(str(tmp_path / "setup.py")).evaluate()
+        assert parse_setup_py(str(tmp_path)) == ("azure-sample", "2.0.0", "azure.sample")
+
+    def test_conditional_setup_call_is_not_evaluated(self, tmp_path):
+        self._create_package(tmp_path, dynamic_setup_source.replace(
+            'setup(name', 'if get_version():\n    setup(name'
+        ))
+        with pytest.raises(_Unresolved):
+            SetupPyEvaluator(str(tmp_path / "setup.py")).evaluate()
+
+    def test_augmented_assignment_extends_list(self, tmp_path):
+        self._create_package(tmp_path, '''
+from setuptools import setup
+
+packages = ["azure.sample"]
+packages += ("azure.sample.aio",)
+packages += ["azure.sample.models"]
+setup(name="azure-sample", version="1.0.0", packages=packages)
+''')
+        kwargs = SetupPyEvaluator(str(tmp_path / "setup.py")).evaluate()
+        assert kwargs["packages"] == ["azure.sample", "azure.sample.aio", "azure.sample.models"]
+
+    def test_invalid_values_are_not_evaluated(self, tmp_path):
+        self._create_package(tmp_path, '''
+from setuptools import setup
+
+name, version = 10
+packages = [*10]
+setup(name="azure-sample", version="1.0.0", packages=packages, **{**"sample"})
+''')
+        with pytest.raises(_Unresolved):
+            SetupPyEvaluator(str(tmp_path / "setup.py")).evaluate()
@@ -0,0 +1,77 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import ast
+import importlib.util
+import inspect
+
+from apistub.nodes import SourceIndex
+from apistub.nodes._source_index import get_decorator_names
+
+sample_source = '''
+import functools
+
+
+def trace(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class SampleClient(object):
+
+    @trace
+    def get_item(self, name):
+        # type: (str) -> str
+        pass
+
+    async def close(self):
+        pass
+
+
+def sync_function_with_async_wrapper():
+    async def wrapper():
+        pass
+    return wrapper
+'''
+
+
+class TestSourceIndex:
+
+    def _import_sample(self, tmp_path):
+        module_path = tmp_path / "sample_source_index.py"
+        module_path.write_text(sample_source)
+        spec = importlib.util.spec_from_file_location("sample_source_index", str(module_path))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_decorated_function(self, tmp_path):
+        module = self._import_sample(tmp_path)
+        source_index = SourceIndex()
+        node = source_index.get_function_node(module.SampleClient.get_item)
+        assert node.name == "get_item"
+        assert get_decorator_names(node) == ["trace"]
+        assert source_index.get_source(module.SampleClient.get_item) == inspect.getsource(module.SampleClient.get_item)
+
+    def test_async_function(self, tmp_path):
+        module = self._import_sample(tmp_path)
+        source_index = SourceIndex()
+        assert isinstance(source_index.get_function_node(module.SampleClient.close), ast.AsyncFunctionDef)
+        node = source_index.get_function_node(module.sync_function_with_async_wrapper)
+        assert not isinstance(node, ast.AsyncFunctionDef)
+
+    def test_source_file_is_parsed_once(self, tmp_path):
+        module = self._import_sample(tmp_path)
+        source_index = SourceIndex()
+        source_index.get_function_node(module.SampleClient.get_item)
+        parsed_file = source_index._get_parsed_file(module.__file__)
+        source_index.get_function_node(module.SampleClient.close)
+        assert source_index._get_parsed_file(module.__file__) is parsed_file
+
+    def test_builtin_function(self):
+        assert SourceIndex().get_function_node(len) is None
@@ -0,0 +1,129 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import astroid
+import pickle
+
+from apistub import ApiView
+from apistub._apiview import APIViewEncoder
+from apistub._stub_generator import NodeIndex
+from apistub.nodes import ClassNode, EnumNode, FunctionNode, ModuleNode, PropertyNode, VariableNode
+
+sample_module_source = '''
+from enum import Enum
+
+__all__ = ["SampleClient", "Color", "create_client"]
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class SampleClient(object):
+    """Dummy client
+
+    :ivar str name: Dummy name
+    """
+
+    LIMIT = 10
+
+    def __init__(self, endpoint, **kwargs):
+        # type: (str, Any) -> None
+        pass
+
+    @property
+    def endpoint(self):
+        # type: () -> str
+        pass
+
+    async def get_item(self, name: str, *, timeout: int = 5, **kwargs) -> "Item":
+        pass
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        # type: (str, Any) -> SampleClient
+        pass
+
+
+def create_client(endpoint, **kwargs):
+    # type: (str, Any) -> SampleClient
+    pass
+
+
+class _PrivateClient(object):
+    pass
+'''
+
+
+class TestStaticParser:
+
+    def _parse_module(self, tmp_path):
+        module_path = tmp_path / "sample.py"
+        module_path.write_text(sample_module_source)
+        module = astroid.MANAGER.ast_from_file(str(module_path), "azure.sample", source=True)
+        return ModuleNode("azure.sample", module, NodeIndex(), "azure")
+
+    def _find_child(self, node, name):
+        return [x for x in node.child_nodes if x.name == name][0]
+
+    def test_module_members(self, tmp_path):
+        module_node = self._parse_module(tmp_path)
+        assert sorted(x.name for x in module_node.child_nodes) == ["Color", "SampleClient", "create_client"]
+        assert module_node.nodeindex.get_id("azure.sample.SampleClient") == "azure.sample.SampleClient"
+        assert isinstance(self._find_child(module_node, "create_client"), FunctionNode)
+
+    def test_enum_values(self, tmp_path):
+        enum_class = self._find_child(self._parse_module(tmp_path), "Color")
+        assert enum_class.is_enum
+        assert [(x.name, x.value) for x in enum_class.child_nodes] == [("BLUE", "blue"), ("RED", "red")]
+        assert all(isinstance(x, EnumNode) for x in enum_class.child_nodes)
+
+    def test_class_members(self, tmp_path):
+        class_node = self._find_child(self._parse_module(tmp_path), "SampleClient")
+        assert isinstance(class_node, ClassNode)
+        prop = self._find_child(class_node, "endpoint")
+        assert isinstance(prop, PropertyNode) and prop.read_only and prop.type == "str"
+        assert isinstance(self._find_child(class_node, "LIMIT"), VariableNode)
+        assert self._find_child(class_node, "name").is_ivar
+
+    def test_member_order(self, tmp_path):
+        class_node = self._find_child(self._parse_module(tmp_path), "SampleClient")
+        assert [x.name for x in class_node.child_nodes] == ["endpoint", "LIMIT", "name", "__init__", "from_url", "get_item"]
+        # Properties and variables are listed before functions
+        assert class_node.member_count == 3
+
+    def test_function_signature(self, tmp_path):
+        class_node = self._find_child(self._parse_module(tmp_path), "SampleClient")
+        get_item = self._find_child(class_node, "get_item")
+        assert get_item.is_async and get_item.namespace_id.endswith(":async")
+        assert [(x.argname, x.argtype, x.default) for x in get_item.args] == [
+            ("self", None, ""),
+            ("name", "str", ""),
+            ("*", None, None),
+            ("timeout", "int", "5"),
+            ("**kwargs", None, ""),
+        ]
+        assert get_item.return_type == "Item"
+
+    def test_class_method(self, tmp_path):
+        class_node = self._find_child(self._parse_module(tmp_path), "SampleClient")
+        from_url = self._find_child(class_node, "from_url")
+        assert from_url.is_class_method
+        assert [x.argname for x in from_url.args] == ["cls", "url", "**kwargs"]
+        assert from_url.return_type == "SampleClient"
+
+    def test_pickled_module_generates_same_tokens(self, tmp_path):
+        # Module nodes are returned from worker processes when modules are inspected in parallel
+        module_node = self._parse_module(tmp_path)
+        pickled_node = pickle.loads(pickle.dumps(module_node))
+        assert pickled_node.obj is None
+        tokens = []
+        for node in [module_node, pickled_node]:
+            apiview = ApiView(node.nodeindex, "azure-sample", "1.0.0", "azure.sample")
+            node.generate_tokens(apiview)
+            tokens.append(APIViewEncoder().encode(apiview.Tokens))
+        assert tokens[0] == tokens[1]
@@ -0,0 +1,82 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+
+import pytest
+
+from apistub import ApiView, Diagnostic, Kind, Navigation, NavigationTag, StubGenerator, load_apiview
+from apistub._apiview import APIViewEncoder
+from apistub._manifest import get_manifest_path
+from apistub._stub_generator import NodeIndex
+from apistub._token_file import TOKEN_FILE_FORMATS, TOKEN_FILE_EXTENSIONS, read_token_file, write_token_file
+
+
+def _create_apiview():
+    apiview = ApiView(NodeIndex(), "azure-sample", "1.0.0", "azure.sample")
+    apiview.add_line_marker("azure.sample.SampleClient")
+    apiview.add_keyword("class", False, True)
+    apiview.add_text("azure.sample.SampleClient", "azure.sample.SampleClient")
+    apiview.add_punctuation(":")
+    apiview.add_new_line()
+    apiview.begin_group()
+    apiview.add_whitespace()
+    apiview.add_line_marker("azure.sample.SampleClient.get_item")
+    apiview.add_keyword("def", False, True)
+    apiview.add_text("azure.sample.SampleClient.get_item", "get_item")
+    apiview.add_punctuation("(")
+    apiview.add_text(None, "name: ")
+    apiview.add_type("azure.sample.Item")
+    apiview.add_punctuation(")")
+    apiview.add_text(None, " # ünicode")
+    apiview.end_group()
+    apiview.add_new_line()
+    apiview.Diagnostics.append(Diagnostic("azure.sample.SampleClient.get_item", "Sample diagnostic"))
+
+    navigation = Navigation("azure-sample", None)
+    navigation.set_tag(NavigationTag(Kind.type_package))
+    module_navigation = Navigation("azure.sample", "azure.sample")
+    module_navigation.set_tag(NavigationTag(Kind.type_module))
+    module_navigation.add_child(Navigation("SampleClient", "azure.sample.SampleClient"))
+    navigation.add_child(module_navigation)
+    apiview.add_navigation(navigation)
+    return apiview
+
+
+class TestTokenFile:
+
+    @pytest.mark.parametrize("token_file_format", TOKEN_FILE_FORMATS)
+    def test_round_trip(self, tmp_path, token_file_format):
+        json_tokens = APIViewEncoder().encode(_create_apiview())
+        token_file_path = str(tmp_path / ("azure-sample_python" + TOKEN_FILE_EXTENSIONS[token_file_format]))
+        write_token_file(token_file_path, json_tokens, token_file_format)
+
+        assert read_token_file(token_file_path) == json.loads(json_tokens)
+        assert APIViewEncoder().encode(load_apiview(token_file_path)) == json_tokens
+
+    def test_compact_formats_are_smaller(self, tmp_path):
+        json_tokens = APIViewEncoder().encode(_create_apiview())
+        sizes = {}
+        for token_file_format in TOKEN_FILE_FORMATS:
+            token_file_path = tmp_path / ("azure-sample_python" + TOKEN_FILE_EXTENSIONS[token_file_format])
+            write_token_file(str(token_file_path), json_tokens, token_file_format)
+            sizes[token_file_format] = token_file_path.stat().st_size
+        assert sizes["gzip"] < sizes["json"]
+        assert sizes["binary"] < sizes["json"]
+
+    def test_out_file_path(self, tmp_path):
+        (tmp_path / "setup.py").write_text("")
+        stub_generator = StubGenerator(["--pkg-path", str(tmp_path), "--out-path", str(tmp_path), "--out-format", "binary"])
+        out_file_path = stub_generator.get_out_file_path("azure-sample")
+        assert out_file_path == str(tmp_path / "azure-sample_python.apistub")
+        assert get_manifest_path(out_file_path) == str(tmp_path / "azure-sample_python.manifest.json")
+        assert get_manifest_path(str(tmp_path / "out.json.gz")) == str(tmp_path / "out.manifest.json")
+
+    def test_stream_requires_json(self, tmp_path, caplog):
+        (tmp_path / "setup.py").write_text("")
+        with pytest.raises(SystemExit):
+            StubGenerator(["--pkg-path", str(tmp_path), "--stream", "--out-format", "gzip"])
+        assert "streamed only into a json token file" in caplog.text
@@ -0,0 +1,113 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import io
+import json
+import sys
+import types
+
+from apistub._stub_generator import unload_modules
+from apistub._worker import StubWorker, JOB_STATUS_FAILED, JOB_STATUS_SUCCEEDED
+from apistub.nodes import get_source_index
+
+setup_source = '''
+from setuptools import setup
+setup(name="azure-sample", version="1.0.0", packages=["azure.sample"])
+'''
+
+init_source = '''
+__all__ = ["SampleClient"]
+
+
+class SampleClient(object):
+
+    def get_item(self, name):
+        pass
+'''
+
+
+class TestStubWorker:
+
+    def _create_package(self, tmp_path):
+        pkg_path = tmp_path / "azure-sample"
+        (pkg_path / "azure" / "sample").mkdir(parents=True)
+        (pkg_path / "setup.py").write_text(setup_source)
+        (pkg_path / "azure" / "__init__.py").write_text("")
+        (pkg_path / "azure" / "sample" / "__init__.py").write_text(init_source)
+        return pkg_path
+
+    def _job(self, job_id, pkg_path, out_path, **kwargs):
+        job = {
+            "Id": job_id,
+            "Args": ["--pkg-path", str(pkg_path), "--out-path", str(out_path), "--static", "--hide-report"],
+        }
+        job.update(kwargs)
+        return json.dumps(job)
+
+    def test_jobs_are_run_in_same_process(self, tmp_path):
+        pkg_path = self._create_package(tmp_path)
+        sys_path = list(sys.path)
+        jobs = "\n".join([
+            self._job(1, pkg_path, tmp_path / "first.json", ReturnTokens=True),
+            "invalid job",
+            json.dumps({"Id": 2, "Args": ["--pkg-path", str(tmp_path / "missing")]}),
+            self._job(3, pkg_path, tmp_path / "second.json", ReturnTokens=True),
+        ])
+        output_file = io.StringIO()
+        StubWorker().serve_lines(io.StringIO(jobs), output_file)
+
+        responses = [json.loads(line) for line in output_file.getvalue().splitlines()]
+        assert [r["Status"] for r in responses] == [
+            JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED, JOB_STATUS_FAILED, JOB_STATUS_SUCCEEDED
+        ]
+        assert responses[0]["OutPath"] == str(tmp_path / "first.json")
+        # Diagnostic IDs of each job start from same value
+        assert responses[0]["Tokens"] == responses[3]["Tokens"]
+        assert responses[3]["Tokens"] == json.loads((tmp_path / "second.json").read_text())
+        assert sys.path == sys_path
+
+    def test_tokens_are_not_returned_unless_requested(self, tmp_path):
+        pkg_path = self._create_package(tmp_path)
+        response = json.loads(StubWorker().run_job(json.loads(self._job(1, pkg_path, tmp_path / "out.json"))))
+        assert response["Status"] == JOB_STATUS_SUCCEEDED
+        assert "Tokens" not in response
+
+    def test_source_files_of_job_are_removed_from_source_index(self, tmp_path):
+        (tmp_path / "job").mkdir()
+        (tmp_path / "temp").mkdir()
+        job_file = tmp_path / "job" / "sample.py"
+        temp_file = tmp_path / "temp" / "sample.py"
+        for source_file in (job_file, temp_file):
+            source_file.write_text("def get_item():\n    pass\n")
+            assert get_source_index()._get_parsed_file(str(source_file))
+        sys_path = list(sys.path)
+        sys.path.insert(0, str(tmp_path / "job"))
+        StubWorker()._restore_path(sys_path, [str(tmp_path / "temp")])
+        assert sys.path == sys_path
+        assert str(job_file) not in get_source_index()._files
+        assert str(temp_file) not in get_source_index()._files
+
+    def test_only_modules_of_package_are_unloaded(self, tmp_path, monkeypatch):
+        (tmp_path / "azure" / "core").mkdir(parents=True)
+        (tmp_path / "azure" / "core" / "__init__.py").write_text("")
+        modules = {}
+        for name in ["azure.sample", "azure.sample._generated.models", "azure.other", "azure.core"]:
+            modules[name] = types.ModuleType(name)
+            monkeypatch.setitem(sys.modules, name, modules[name])
+        modules["azure.core"].__file__ = str(tmp_path / "site-packages" / "azure" / "core" / "__init__.py")
+        modules["azure.core"].__path__ = [str(tmp_path / "site-packages" / "azure" / "core")]
+
+        unload_modules(["azure.sample"])
+        assert "azure.sample" not in sys.modules
+        assert "azure.sample._generated.models" not in sys.modules
+        # Dependencies imported before the job are reused
+        assert sys.modules["azure.other"] is modules["azure.other"]
+        assert sys.modules["azure.core"] is modules["azure.core"]
+
+        # Dependency is imported again if dependency directory of package has it's own copy
+        unload_modules(["azure.sample"], [str(tmp_path)])
+        assert "azure.core" not in sys.modules
+        assert sys.modules["azure.other"] is modules["azure.other"]